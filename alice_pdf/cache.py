@@ -0,0 +1,142 @@
+"""
+Content-addressed on-disk cache for OCR API responses.
+
+Entries are the parsed ``{"tables": [...]}`` results of an API call, stored
+as JSON files named by the SHA-256 of everything that can change the answer
+(engine, model, prompt, DPI and the exact page bytes sent). Reruns with
+unchanged inputs are served from disk, whatever the output directory or
+resume state. The cache is bounded in size with least-recently-used
+eviction (file mtime is refreshed on every hit).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+# Eviction trims the cache to this share of its budget, so the directory
+# scan is paid once per ~10% of budget written instead of on every put
+LOW_WATER = 0.9
+
+
+def default_cache_dir():
+    """Return the default cache directory ($XDG_CACHE_HOME/alice-pdf or ~/.cache/alice-pdf)."""
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "alice-pdf"
+
+
+def cache_key(*parts):
+    """
+    Build a cache key from request inputs.
+
+    Args:
+        parts: str, bytes or number values; order matters
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = repr(part).encode("utf-8")
+        # Length prefix keeps ("ab", "c") and ("a", "bc") distinct
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of parsed API responses (thread-safe).
+
+    Args:
+        cache_dir: Directory holding the cache files (created if missing)
+        max_bytes: Total size above which least recently used entries are evicted
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.json")
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached result for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store `value` (JSON-serialisable) under `key`, then evict if over budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+        # Atomic write: concurrent readers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries down to the low-water mark (lock held)."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * LOW_WATER
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        self._total_bytes = total
+        if evicted:
+            logger.debug(f"Response cache: evicted {evicted} entries ({total} bytes kept)")
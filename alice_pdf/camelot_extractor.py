@@ -5,10 +5,18 @@ Camelot works best with native PDFs (not scanned) with clear table structure.
 """
 
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import fitz  # PyMuPDF
 
+from .manifest import ResumeManifest
+from .merge import MergeWriter, positional_columns
+from .output import OUTPUT_EXTENSIONS, write_table
+from .utils import non_empty_mask, selected_pages
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,21 +28,7 @@ def _pages_have_text(pdf_path: Path, pages_str: str) -> bool:
     """
     doc = fitz.open(pdf_path)
 
-    # Normalize pages_str to a list of 1-based page numbers
-    if pages_str == "all":
-        page_numbers = range(1, doc.page_count + 1)
-    else:
-        # Camelot accepts "1,3,5" or "1-3"; mirror that
-        page_numbers = []
-        for part in pages_str.split(","):
-            part = part.strip()
-            if "-" in part:
-                start, end = part.split("-")
-                page_numbers.extend(range(int(start), int(end) + 1))
-            else:
-                page_numbers.append(int(part))
-
-    for pno in page_numbers:
+    for pno in selected_pages(pages_str, doc.page_count):
         if pno < 1 or pno > doc.page_count:
             continue
         page = doc.load_page(pno - 1)
@@ -74,6 +68,10 @@ def merge_wrapped_rows(df, max_non_null=2):
     - Find rows with very few non-null values (likely wrapped text)
     - Merge them into the following row by concatenating non-null values
 
+    Rows are scanned top to bottom and a merged row is never merged again, so
+    in a run of consecutive wrapped rows the 1st, 3rd, 5th... absorb the row
+    after them. All of this is computed on a NumPy "non-empty" mask.
+
     Args:
         df: DataFrame with potential wrapped rows
         max_non_null: Maximum non-null columns for a row to be considered wrapped (default 2)
@@ -84,48 +82,150 @@ def merge_wrapped_rows(df, max_non_null=2):
     if df.empty or len(df) < 2:
         return df
 
-    merged_rows = []
-    skip_next = False
+    values = df.to_numpy(dtype=object)
+    non_empty = non_empty_mask(values)
+    n = len(values)
+    positions = np.arange(n)
 
-    for i in range(len(df)):
-        if skip_next:
-            skip_next = False
-            continue
+    # Count only non-null AND non-empty string values; the last row has no next row
+    wrapped = non_empty.sum(axis=1) <= max_non_null
+    wrapped[-1] = False
 
-        row = df.iloc[i]
-
-        # Check if this is a wrapped row (very few non-empty values)
-        # Count only non-null AND non-empty string values
-        non_empty_count = sum(1 for val in row if pd.notna(val) and str(val).strip())
-
-        if non_empty_count <= max_non_null and i < len(df) - 1:
-            # Get next row
-            next_row = df.iloc[i + 1].copy()
-
-            # Find which column(s) have data in wrapped row
-            # Merge those values into next row
-            for col_idx in range(len(row)):
-                if pd.notna(row.iloc[col_idx]) and str(row.iloc[col_idx]).strip():
-                    # If next row has data in same column, concatenate
-                    if pd.notna(next_row.iloc[col_idx]):
-                        next_row.iloc[col_idx] = f"{row.iloc[col_idx]} {next_row.iloc[col_idx]}"
-                    else:
-                        # Otherwise just use wrapped row's value
-                        next_row.iloc[col_idx] = row.iloc[col_idx]
-
-            merged_rows.append(next_row)
-            skip_next = True
-            continue
+    # Position of each row inside its run of consecutive wrapped rows: even
+    # positions absorb the next row, odd ones were absorbed by the previous
+    run_start = np.maximum.accumulate(np.where(wrapped, -1, positions)) + 1
+    heads = np.flatnonzero(wrapped & ((positions - run_start) % 2 == 0))
+    absorbed = np.zeros(n, dtype=bool)
+    absorbed[heads + 1] = True
 
-        merged_rows.append(row)
+    if len(heads):
+        merged = values[heads + 1].copy()
+        wrapped_values = values[heads]
+        carried = non_empty[heads]
 
-    # Convert to DataFrame using values (not Series) to avoid duplicate index issues
-    # Use .values to get raw numpy array without column name information
-    if merged_rows:
-        result_df = pd.DataFrame([row.values for row in merged_rows], columns=df.columns)
-        return result_df.reset_index(drop=True)
-    else:
-        return df.iloc[:0].copy()  # Return empty DataFrame with same columns
+        # If next row has data in same column, concatenate; otherwise take the wrapped value
+        next_present = pd.notna(merged)
+        rows, cols = np.nonzero(carried & next_present)
+        merged[rows, cols] = [f"{a} {b}" for a, b in zip(wrapped_values[rows, cols], merged[rows, cols])]
+        rows, cols = np.nonzero(carried & ~next_present)
+        merged[rows, cols] = wrapped_values[rows, cols]
+
+        values = values.copy()
+        values[heads] = merged
+
+    # infer_objects() gives the same column dtypes as rebuilding the frame from rows
+    result_df = pd.DataFrame(values[~absorbed], columns=df.columns).infer_objects()
+    return result_df.reset_index(drop=True)
+
+
+def _table_to_dataframe(table, page_num, idx):
+    """
+    Clean one Camelot table: header detection, unique columns, wrapped rows, page column.
+    Returns: DataFrame, or None if the table is empty
+    """
+    # Convert to DataFrame
+    df = table.df
+
+    if df.empty:
+        logger.info(f"Page {page_num} table {idx}: empty, skipping")
+        return None
+
+    # Use first row as header only if it is mostly populated
+    header_non_empty = sum(1 for v in df.iloc[0] if pd.notna(v) and str(v).strip())
+    if header_non_empty / len(df.columns) >= 0.6:
+        df.columns = df.iloc[0]
+        df = df[1:].reset_index(drop=True)
+
+    # Ensure columns are unique before row-level operations
+    # This must be done BEFORE merge_wrapped_rows since that function
+    # relies on df.columns when reconstructing the DataFrame
+    df.columns = make_unique_columns(df.columns)
+
+    # Merge wrapped rows AFTER removing header and ensuring unique columns
+    df = merge_wrapped_rows(df)
+
+    # Add page column
+    df.insert(0, "page", page_num)
+
+    logger.info(f"Page {page_num} table {idx}: {df.shape}")
+    return df
+
+
+def _parse_chunk(pdf_path, page_nums, flavor="lattice", split_text=False):
+    """
+    Run Camelot on a chunk of pages and clean its tables.
+
+    Args:
+        pdf_path: Path to PDF file
+        page_nums: 1-based page numbers of the chunk
+        flavor: Camelot flavor
+        split_text: Split text that spans multiple cells
+
+    Returns:
+        Dict page number -> list of DataFrames, for every page of the chunk
+    """
+    import camelot
+
+    tables = camelot.read_pdf(
+        str(pdf_path),
+        pages=",".join(str(page_num) for page_num in page_nums),
+        flavor=flavor,
+        split_text=split_text,
+    )
+
+    frames = {page_num: [] for page_num in page_nums}
+    for idx, table in enumerate(tables):
+        page_num = int(table.page)
+        df = _table_to_dataframe(table, page_num, idx)
+        if df is not None:
+            frames.setdefault(page_num, []).append(df)
+    return frames
+
+
+def _parse_chunk_timed(pdf_path, page_nums, flavor, split_text):
+    """`_parse_chunk` plus its duration in seconds (runs in a worker process)."""
+    started = time.monotonic()
+    frames = _parse_chunk(pdf_path, page_nums, flavor=flavor, split_text=split_text)
+    return frames, time.monotonic() - started
+
+
+def _iter_chunks(pdf_path, chunks, flavor, split_text, workers=1):
+    """
+    Parse chunks serially or in a process pool.
+
+    Yields:
+        Tuples (chunk, frames_by_page, seconds); with several workers, in
+        completion order, with at most 2 x workers chunks submitted ahead
+    """
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield (chunk, *_parse_chunk_timed(pdf_path, chunk, flavor, split_text))
+        return
+
+    remaining = iter(chunks)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        in_flight = {}
+
+        def submit_next():
+            chunk = next(remaining, None)
+            if chunk is not None:
+                future = executor.submit(_parse_chunk_timed, pdf_path, chunk, flavor, split_text)
+                in_flight[future] = chunk
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        try:
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    frames_by_page, seconds = future.result()
+                    submit_next()
+                    yield chunk, frames_by_page, seconds
+        finally:
+            for future in in_flight:
+                future.cancel()
 
 
 def extract_tables_with_camelot(
@@ -136,18 +236,32 @@ def extract_tables_with_camelot(
     merge_output=False,
     resume=True,
     split_text=False,
+    output_format="csv",
+    chunk_pages=50,
+    workers=1,
 ):
     """
     Extract tables from PDF using Camelot.
 
+    Pages are parsed in chunks of `chunk_pages`; each chunk's tables are
+    written and recorded in the resume manifest before the next chunk is
+    parsed, so memory is bounded by the chunk size and an interrupted run
+    resumes from the last finished chunk. With `workers` > 1, chunks are
+    parsed in a process pool; file numbering and merged output are the same
+    as in the serial path.
+
     Args:
         pdf_path: Path to PDF file
         output_dir: Output directory for CSV files
         pages: Pages to process ('all', '1', '1-3', '1,3,5')
         flavor: Camelot flavor ('lattice' for bordered tables, 'stream' for non-bordered)
         merge_output: If True, merge all tables into single CSV
-        resume: If True, skip pages that already have output files
+        resume: If True, skip pages recorded as done in the resume manifest
         split_text: If True, split text that spans multiple cells
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
+        chunk_pages: Pages passed to each camelot.read_pdf call
+        workers: Number of processes parsing chunks in parallel
 
     Returns:
         Number of tables extracted
@@ -160,14 +274,18 @@ def extract_tables_with_camelot(
             "Camelot support requires camelot-py. Install with: pip install camelot-py[cv]"
         )
 
+    if chunk_pages < 1:
+        raise ValueError(f"chunk_pages must be >= 1, got {chunk_pages}")
+
     pdf_path = Path(pdf_path)
     output_dir = Path(output_dir)
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
 
     # Delete merged file if exists
     if merge_output:
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
         if merged_file.exists():
             merged_file.unlink()
             logger.info(f"Deleted previous merged file: {merged_file.name}")
@@ -190,129 +308,106 @@ def extract_tables_with_camelot(
             "Use --engine textract or mistral instead."
         )
 
-    all_dataframes = []
-    table_count = 0
-    failed_pages = []
+    doc = fitz.open(pdf_path)
+    page_count = doc.page_count
+    doc.close()
 
-    try:
-        # Extract tables from all specified pages
-        tables = camelot.read_pdf(
-            str(pdf_path),
-            pages=pages_str,
-            flavor=flavor,
-            split_text=split_text,
-        )
+    page_list = []
+    for page_num in selected_pages(pages_str, page_count):
+        if not 1 <= page_num <= page_count:
+            logger.warning(f"Page {page_num} out of range, skipping")
+        elif page_num not in page_list:
+            page_list.append(page_num)
 
-        logger.info(f"Found {len(tables)} tables across pages")
-
-        if len(tables) == 0:
-            logger.warning("No tables found in PDF")
-            return 0
-
-        # Process each table
-        for idx, table in enumerate(tables):
-            page_num = table.page
-
-            # Check if page already processed (resume mode)
-            if resume:
-                existing_files = list(
-                    output_dir.glob(f"{pdf_path.stem}_page{page_num}_table*.csv")
-                )
-                if existing_files:
-                    logger.info(
-                        f"Page {page_num} table {idx} - already processed, skipping"
-                    )
-                    if merge_output:
-                        df = pd.read_csv(existing_files[0], encoding="utf-8-sig")
-                        all_dataframes.append(df)
-                    table_count += 1
-                    continue
+    table_count = 0
+    parsed_pages = 0
+    merger = None
 
-            # Convert to DataFrame
-            df = table.df
+    # Per-page resume state; partial pages of an interrupted run are discarded
+    manifest = ResumeManifest(output_dir, pdf_path.stem, resume=resume, pages=page_list)
 
-            if df.empty:
-                logger.info(f"Page {page_num} table {idx}: empty, skipping")
-                continue
+    # Headless merge using positional columns (col_0, col_1, ...), not
+    # headers, streamed in page order
+    if merge_output:
+        merger = MergeWriter(
+            output_dir / f"{pdf_path.stem}_merged{ext}",
+            sorted(page_list),
+            column_names=positional_columns,
+            output_format=output_format,
+        )
 
-            # Use first row as header only if it is mostly populated
-            header_non_empty = sum(1 for v in df.iloc[0] if pd.notna(v) and str(v).strip())
-            if header_non_empty / len(df.columns) >= 0.6:
-                df.columns = df.iloc[0]
-                df = df[1:].reset_index(drop=True)
+    # Resolve resume state up front so finished pages are never parsed again
+    pending = []
+    for page_num in page_list:
+        if manifest.is_done(page_num):
+            logger.info(f"Page {page_num} - already processed, skipping")
+            if merger is not None:
+                merger.add_page(page_num, manifest.page_files(page_num))
+            table_count += manifest.table_count(page_num)
+        else:
+            pending.append(page_num)
+
+    if workers > 1 and pending:
+        # Small selections: shrink chunks so every worker gets a shard
+        chunk_pages = min(chunk_pages, -(-len(pending) // workers))
+    chunks = [pending[i : i + chunk_pages] for i in range(0, len(pending), chunk_pages)]
+    logger.info(
+        f"Parsing {len(pending)} pages in {len(chunks)} chunks of up to {chunk_pages} pages "
+        f"with {workers} worker{'s' if workers != 1 else ''} ({len(page_list) - len(pending)} already done)"
+    )
 
-            # Ensure columns are unique before row-level operations
-            # This must be done BEFORE merge_wrapped_rows since that function
-            # relies on df.columns when reconstructing the DataFrame
-            df.columns = make_unique_columns(df.columns)
+    try:
+        chunk_results = _iter_chunks(pdf_path, chunks, flavor, split_text, workers=workers)
+        for chunk_index, (chunk, frames_by_page, seconds) in enumerate(chunk_results, start=1):
+            seconds_per_page = seconds / len(chunk)
+            logger.info(
+                f"Chunk {chunk_index}/{len(chunks)}: pages {chunk[0]}-{chunk[-1]}, "
+                f"{sum(len(frames) for frames in frames_by_page.values())} tables"
+            )
 
-            # Merge wrapped rows AFTER removing header and ensuring unique columns
-            df = merge_wrapped_rows(df)
+            for page_num in sorted(frames_by_page):
+                page_frames = frames_by_page[page_num]
 
-            # Add page column
-            df.insert(0, "page", page_num)
+                # Tables are numbered per page in order of appearance
+                output_files = [
+                    output_dir / f"{pdf_path.stem}_page{page_num}_table{k}{ext}"
+                    for k in range(len(page_frames))
+                ]
+                manifest.begin_page(page_num, output_files)
 
-            logger.info(f"Page {page_num} table {idx}: {df.shape}")
+                for df, output_file in zip(page_frames, output_files):
+                    # Save individual table file
+                    write_table(df, output_file, output_format)
+                    logger.info(f"  Saved: {output_file}")
 
-            # Save individual CSV
-            # Count existing tables for this page to determine table index
-            existing_count = len(
-                list(output_dir.glob(f"{pdf_path.stem}_page{page_num}_table*.csv"))
-            )
-            output_file = (
-                output_dir / f"{pdf_path.stem}_page{page_num}_table{existing_count}.csv"
-            )
-            df.to_csv(output_file, index=False, encoding="utf-8-sig")
-            logger.info(f"  Saved: {output_file}")
+                    table_count += 1
 
-            if merge_output:
-                all_dataframes.append(df)
+                if merger is not None:
+                    merger.add_page(page_num, page_frames)
 
-            table_count += 1
+                # Camelot parses a whole chunk in one call: record its average per page
+                manifest.finish_page(page_num, output_files, seconds=seconds_per_page)
+                parsed_pages += 1
 
     except Exception as e:
         logger.error(f"Camelot extraction failed: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        if merger is not None:
+            merger.abort()
         raise
+    finally:
+        manifest.close()
+
+    logger.info(
+        f"Pages: {len(page_list) - len(pending)} skipped (already done), {parsed_pages} parsed"
+    )
+
+    if table_count == 0:
+        logger.warning("No tables found in PDF")
 
-    # Merge all tables if requested
-    if merge_output and all_dataframes:
-        # Headless merge using positional columns (col_0, col_1, ...), not headers
-        max_cols = max(len(df.columns) for df in all_dataframes)
-        # Keep first column as page marker, rest are positional
-        col_names = ["page"] + [f"col_{i}" for i in range(max_cols - 1)]
-
-        normalized_frames = []
-        for df in all_dataframes:
-            df = df.copy()
-
-            # Ensure unique columns first to avoid reindex issues
-            df.columns = make_unique_columns(df.columns)
-
-            # Pad or truncate to match max_cols
-            if len(df.columns) < max_cols:
-                # Add missing columns with NaN values
-                for i in range(len(df.columns), max_cols):
-                    df[f"_pad_{i}"] = pd.NA
-            elif len(df.columns) > max_cols:
-                logger.warning(
-                    f"Column count mismatch: expected {max_cols}, got {len(df.columns)}; truncating extra columns"
-                )
-                df = df.iloc[:, :max_cols]
-
-            # Now assign standardized column names
-            df.columns = col_names
-            normalized_frames.append(df)
-
-        merged_df = pd.concat(normalized_frames, ignore_index=True)
-
-        # Sort by page if page column exists
-        if "page" in merged_df.columns:
-            merged_df = merged_df.sort_values("page").reset_index(drop=True)
-
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
-        merged_df.to_csv(merged_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Merged all tables into: {merged_file} ({merged_df.shape})")
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
 
     return table_count
@@ -10,7 +10,9 @@ import logging
 from pathlib import Path
 
 from . import __version__
+from .cache import default_cache_dir
 from .extractor import extract_tables
+from .output import OUTPUT_FORMATS, check_output_format
 from .prompt_generator import generate_prompt_from_schema
 
 # Setup logging with unbuffered output
@@ -23,6 +25,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
 def main():
     # Clear log files at startup
     for log_file in ["alice_debug.log", "alice_run.log"]:
@@ -32,7 +42,7 @@ def main():
 
     parser = argparse.ArgumentParser(
         prog="alice-pdf",
-        description="Extract tables from PDFs using Camelot (default), Mistral OCR, AWS Textract, or pdfplumber",
+        description="Extract tables from PDFs using Camelot (default), Mistral OCR, AWS Textract, pdfplumber, PyMuPDF, or word clustering",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -45,20 +55,56 @@ Examples:
   # Merge all tables into one CSV
   alice-pdf input.pdf output/ --merge
 
+  # Write Parquet files (merged file has one row group per page)
+  alice-pdf input.pdf output/ --merge --format parquet
+
   # Use Mistral for scanned PDFs (requires MISTRAL_API_KEY env var)
   alice-pdf input.pdf output/ --engine mistral
 
+  # Use Mistral with 4 pages in flight, capped at 2 requests/second
+  alice-pdf input.pdf output/ --engine mistral --workers 4 --rps 2
+
+  # Use Mistral with 3 pages packed into each request
+  alice-pdf input.pdf output/ --engine mistral --pages-per-request 3
+
+  # Use Mistral with small grayscale JPEG uploads (at most 500 KB per page)
+  alice-pdf input.pdf output/ --engine mistral --image-format jpeg --image-color gray --max-image-bytes 500000
+
   # Use Mistral with table schema for better accuracy
   alice-pdf input.pdf output/ --engine mistral --schema table_schema.yaml
 
+  # Use Textract with up to 20 requests in flight, at most 10 requests/second
+  alice-pdf input.pdf output/ --engine textract --max-workers 20 --target-rps 10
+
+  # Use Textract with single-page PDFs instead of rendered images (native PDFs)
+  alice-pdf input.pdf output/ --engine textract --textract-input pdf
+
+  # Rebuild Textract tables with another confidence threshold, without API calls
+  alice-pdf input.pdf output/ --engine textract --reparse-from-raw --min-confidence 10
+
+  # Use Textract async jobs for a large PDF (chunks staged in an S3 bucket)
+  alice-pdf input.pdf output/ --engine textract --textract-async --s3-bucket my-bucket
+
+  # Use Camelot with 8 processes parsing page shards in parallel
+  alice-pdf input.pdf output/ --workers 8
+
   # Use Camelot stream mode for tables without borders
   alice-pdf input.pdf output/ --camelot-flavor stream
 
   # Use pdfplumber for robust free extraction (works on native and scanned PDFs)
   alice-pdf input.pdf output/ --engine pdfplumber
 
+  # Use pdfplumber with 8 processes extracting pages in parallel
+  alice-pdf input.pdf output/ --engine pdfplumber --workers 8
+
   # Use pdfplumber with minimum table size constraints
   alice-pdf input.pdf output/ --engine pdfplumber --pdfplumber-min-rows 2 --pdfplumber-min-cols 3
+
+  # Use PyMuPDF's table finder (native PDFs, no extra dependencies)
+  alice-pdf input.pdf output/ --engine pymupdf
+
+  # Cluster word coordinates into borderless tables (fastest, native PDFs)
+  alice-pdf input.pdf output/ --engine words --words-col-gap 0.8
         """,
     )
 
@@ -68,7 +114,7 @@ Examples:
     # Engine selection
     parser.add_argument(
         "--engine",
-        choices=["mistral", "textract", "camelot", "pdfplumber"],
+        choices=["mistral", "textract", "camelot", "pdfplumber", "pymupdf", "words"],
         default="camelot",
         help="Extraction engine to use (default: camelot - free, no API required)",
     )
@@ -85,10 +131,57 @@ Examples:
     parser.add_argument(
         "-m", "--merge", action="store_true", help="Merge all tables into single CSV"
     )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Format of per-page and merged table files (default: csv; parquet/arrow need pyarrow)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel workers: pages sent to Mistral concurrently, or processes parsing "
+        "Camelot page shards / pdfplumber pages (default: 1)",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="Pages rendered ahead while API requests are in flight (mistral/textract, default: 2)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the persistent API response cache (mistral/textract, default: ~/.cache/alice-pdf)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=1024,
+        help="Maximum size of the response cache in MB, least recently used entries are evicted (default: 1024)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the API response cache (always call the API)",
+    )
+    parser.add_argument(
+        "--prefilter",
+        choices=["skip", "defer"],
+        help="Score pages locally for table likelihood and skip (or process last) "
+        "low-scoring pages before calling the API (mistral/textract)",
+    )
+    parser.add_argument(
+        "--prefilter-threshold",
+        type=float,
+        default=0.3,
+        help="Minimum table score (0-1) for --prefilter (default: 0.3)",
+    )
     parser.add_argument(
         "--no-resume",
         action="store_true",
-        help="Clear output directory and reprocess all pages (default: resume from existing files)",
+        help="Reprocess all pages, ignoring the resume manifest (default: resume from finished pages)",
     )
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Enable debug logging"
@@ -122,6 +215,41 @@ Examples:
         default=60_000,
         help="HTTP read timeout for Mistral API in milliseconds (default: 60000)",
     )
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "jpeg", "webp"],
+        default="png",
+        help="Page image encoding sent to Mistral (default: png)",
+    )
+    parser.add_argument(
+        "--image-color",
+        choices=["rgb", "gray", "bilevel"],
+        default="rgb",
+        help="Page image colour mode sent to Mistral (default: rgb)",
+    )
+    parser.add_argument(
+        "--image-quality",
+        type=int,
+        default=85,
+        help="Quality for jpeg/webp page images, 1-100 (default: 85)",
+    )
+    parser.add_argument(
+        "--max-image-bytes",
+        type=int,
+        help="Byte budget per page image; images are recompressed/downscaled until they fit (Mistral only)",
+    )
+    parser.add_argument(
+        "--pages-per-request",
+        type=int,
+        default=1,
+        help="Pack N page images into each Mistral request (default: 1)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=1.0,
+        help="Maximum Mistral requests per second across all workers (default: 1.0)",
+    )
 
     # AWS Textract-specific options
     parser.add_argument(
@@ -136,6 +264,63 @@ Examples:
         "--aws-secret-access-key",
         help="AWS secret access key (or set AWS_SECRET_ACCESS_KEY env var)",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=5,
+        help="Upper bound of Textract requests in flight; concurrency adapts between 1 and this value, "
+        "backing off on throttling (also max concurrent async jobs, default: 5)",
+    )
+    parser.add_argument(
+        "--target-rps",
+        type=float,
+        help="Cap on Textract requests per second (default: no cap, rely on throttling feedback)",
+    )
+    parser.add_argument(
+        "--textract-input",
+        choices=["png", "pdf"],
+        default="png",
+        help="Page payload for sync Textract requests: rendered PNG, or a single-page PDF copied "
+        "without rasterising (PNG fallback for oversized/rejected pages) (default: png)",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        help="Processes rendering pages for Textract sync requests (default: CPU count - 1; "
+        "0 renders in one background thread)",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=30,
+        help="Textract cells at or below this confidence (0-100) are left empty (default: 30)",
+    )
+    parser.add_argument(
+        "--reparse-from-raw",
+        action="store_true",
+        help="Rebuild Textract tables from the raw blocks stored by earlier runs, without API calls "
+        "(use with the same --dpi/--textract-input/--textract-async)",
+    )
+    parser.add_argument(
+        "--textract-async",
+        action="store_true",
+        help="Use async Textract document-analysis jobs instead of one request per page (requires --s3-bucket)",
+    )
+    parser.add_argument(
+        "--s3-bucket",
+        help="S3 bucket where page chunks are staged for --textract-async (same region as Textract)",
+    )
+    parser.add_argument(
+        "--s3-prefix",
+        default="alice-pdf",
+        help="Key prefix of the staged chunks; they are deleted after each job (default: alice-pdf)",
+    )
+    parser.add_argument(
+        "--async-chunk-pages",
+        type=int,
+        default=100,
+        help="Maximum pages per async Textract job (default: 100)",
+    )
 
     # Camelot-specific options
     parser.add_argument(
@@ -149,6 +334,12 @@ Examples:
         action="store_true",
         help="Split text that spans multiple cells (useful for complex tables with merged cells)",
     )
+    parser.add_argument(
+        "--camelot-chunk-pages",
+        type=int,
+        default=50,
+        help="Pages parsed per Camelot call; each chunk is written and checkpointed before the next (default: 50)",
+    )
 
     # pdfplumber-specific options
     parser.add_argument(
@@ -176,6 +367,34 @@ Examples:
         action="store_false",
         help="Disable whitespace stripping in pdfplumber output",
     )
+
+    # PyMuPDF-specific options
+    parser.add_argument(
+        "--pymupdf-strategy",
+        choices=["lines", "text"],
+        default="lines",
+        help="PyMuPDF find_tables strategy: lines (ruled tables) or text (whitespace-aligned) (default: lines)",
+    )
+
+    # Word clustering options
+    parser.add_argument(
+        "--words-col-gap",
+        type=float,
+        default=0.5,
+        help="Smallest gap between two columns, as a fraction of the median word height (words only, default: 0.5)",
+    )
+    parser.add_argument(
+        "--words-min-rows",
+        type=_positive_int,
+        default=2,
+        help="Minimum table rows for a table (words only, default: 2)",
+    )
+    parser.add_argument(
+        "--words-min-cols",
+        type=_positive_int,
+        default=2,
+        help="Minimum cells for a line to count as a table row (words only, default: 2)",
+    )
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
 
     args = parser.parse_args()
@@ -204,40 +423,82 @@ Examples:
     # Shared validation to avoid diverging logic per engine
     def used_options():
         """Return per-engine lists of options actually used (non-default)."""
+        # Common flags honoured by several engines are listed under each of them
+        workers = ("--workers", args.workers != 1)
+        api_pipeline = [
+            ("--prefetch", args.prefetch != 2),
+            ("--cache-dir", bool(args.cache_dir)),
+            ("--cache-max-mb", args.cache_max_mb != 1024),
+            ("--no-cache", args.no_cache),
+            ("--prefilter", bool(args.prefilter)),
+            ("--prefilter-threshold", args.prefilter_threshold != 0.3),
+        ]
         return {
             "mistral": [
+                workers,
+                *api_pipeline,
                 ("--schema", bool(args.schema)),
                 ("--prompt", bool(args.prompt)),
                 ("--model", args.model != "pixtral-12b-2409"),
                 ("--api-key", bool(args.api_key or os.getenv("MISTRAL_API_KEY"))),
+                ("--rps", args.rps != 1.0),
+                ("--pages-per-request", args.pages_per_request != 1),
+                ("--image-format", args.image_format != "png"),
+                ("--image-color", args.image_color != "rgb"),
+                ("--image-quality", args.image_quality != 85),
+                ("--max-image-bytes", args.max_image_bytes is not None),
             ],
             "textract": [
                 ("--aws-region", bool(args.aws_region)),
                 ("--aws-access-key-id", bool(args.aws_access_key_id)),
                 ("--aws-secret-access-key", bool(args.aws_secret_access_key)),
+                ("--max-workers", args.max_workers != 5),
+                ("--target-rps", args.target_rps is not None),
+                ("--textract-input", args.textract_input != "png"),
+                ("--render-workers", args.render_workers is not None),
+                ("--min-confidence", args.min_confidence != 30),
+                ("--reparse-from-raw", args.reparse_from_raw),
+                ("--textract-async", args.textract_async),
+                ("--s3-bucket", bool(args.s3_bucket)),
+                ("--s3-prefix", args.s3_prefix != "alice-pdf"),
+                ("--async-chunk-pages", args.async_chunk_pages != 100),
+                *api_pipeline,
             ],
             "camelot": [
+                workers,
                 ("--camelot-flavor", args.camelot_flavor != "lattice"),
                 ("--camelot-split-text", args.camelot_split_text),
+                ("--camelot-chunk-pages", args.camelot_chunk_pages != 50),
             ],
             "pdfplumber": [
+                workers,
                 ("--pdfplumber-min-rows", args.pdfplumber_min_rows != 1),
                 ("--pdfplumber-min-cols", args.pdfplumber_min_cols != 1),
                 ("--no-pdfplumber-strip-text", args.pdfplumber_strip_text is False),
             ],
+            "pymupdf": [
+                ("--pymupdf-strategy", args.pymupdf_strategy != "lines"),
+            ],
+            "words": [
+                ("--words-col-gap", args.words_col_gap != 0.5),
+                ("--words-min-rows", args.words_min_rows != 2),
+                ("--words-min-cols", args.words_min_cols != 2),
+            ],
         }
 
     def first_invalid_for(engine):
         """Return first offending flag list for engines that don't match the selected one."""
         options_map = used_options()
-        order = ["mistral", "textract", "camelot", "pdfplumber"]
+        supported = {flag for flag, _ in options_map[engine]}
+        order = ["mistral", "textract", "camelot", "pdfplumber", "pymupdf", "words"]
         for other in order:
             if other == engine:
                 continue
-            invalid = [flag for flag, used in options_map[other] if used]
+            invalid = [flag for flag, used in options_map[other] if used and flag not in supported]
             if invalid:
+                engines = [e for e in order if {flag for flag, _ in options_map[e]} & set(invalid)]
                 logger.error(
-                    f"Options {', '.join(invalid)} are only compatible with --engine {other}"
+                    f"Options {', '.join(invalid)} are only compatible with --engine {' or '.join(engines)}"
                 )
                 return False
         return True
@@ -245,6 +506,17 @@ Examples:
     if not first_invalid_for(args.engine):
         return 1
 
+    # Check before any page is processed (or paid for), not at the first table written
+    try:
+        check_output_format(args.output_format)
+    except ImportError as e:
+        logger.error(str(e))
+        return 1
+
+    # Response cache shared by the API engines (keyed by page bytes, model, prompt, DPI)
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+    cache_max_bytes = args.cache_max_mb * 1024 * 1024
+
     # Route to appropriate engine
     if args.engine == "mistral":
         # Get API key
@@ -291,6 +563,19 @@ Examples:
                 custom_prompt=custom_prompt,
                 timeout_ms=args.timeout_ms,
                 resume=not args.no_resume,
+                workers=args.workers,
+                rps=args.rps,
+                prefetch=args.prefetch,
+                image_format=args.image_format,
+                image_color=args.image_color,
+                image_quality=args.image_quality,
+                max_image_bytes=args.max_image_bytes,
+                cache_dir=cache_dir,
+                cache_max_bytes=cache_max_bytes,
+                pages_per_request=args.pages_per_request,
+                prefilter=args.prefilter,
+                prefilter_threshold=args.prefilter_threshold,
+                output_format=args.output_format,
             )
 
             logger.info(f"Extraction complete: {num_tables} tables processed")
@@ -328,6 +613,22 @@ Examples:
                 dpi=args.dpi,
                 merge_output=args.merge,
                 resume=not args.no_resume,
+                prefetch=args.prefetch,
+                cache_dir=cache_dir,
+                cache_max_bytes=cache_max_bytes,
+                prefilter=args.prefilter,
+                prefilter_threshold=args.prefilter_threshold,
+                output_format=args.output_format,
+                use_async=args.textract_async,
+                s3_bucket=args.s3_bucket,
+                s3_prefix=args.s3_prefix,
+                async_chunk_pages=args.async_chunk_pages,
+                max_workers=args.max_workers,
+                target_rps=args.target_rps,
+                textract_input=args.textract_input,
+                min_confidence=args.min_confidence,
+                reparse_from_raw=args.reparse_from_raw,
+                render_workers=args.render_workers,
             )
 
             logger.info(f"Extraction complete: {num_tables} tables processed")
@@ -358,6 +659,9 @@ Examples:
                 merge_output=args.merge,
                 resume=not args.no_resume,
                 split_text=args.camelot_split_text,
+                chunk_pages=args.camelot_chunk_pages,
+                workers=args.workers,
+                output_format=args.output_format,
             )
 
             logger.info(f"Extraction complete: {num_tables} tables processed")
@@ -389,6 +693,56 @@ Examples:
                 min_rows=args.pdfplumber_min_rows,
                 min_cols=args.pdfplumber_min_cols,
                 strip_text=args.pdfplumber_strip_text,
+                output_format=args.output_format,
+                workers=args.workers,
+            )
+
+            logger.info(f"Extraction complete: {num_tables} tables processed")
+            return 0
+
+        except Exception as e:
+            logger.error(f"Extraction failed: {e}")
+            if args.debug:
+                raise
+            return 1
+
+    elif args.engine == "pymupdf":
+        from .pymupdf_extractor import extract_tables_with_pymupdf
+
+        try:
+            num_tables = extract_tables_with_pymupdf(
+                pdf_path=args.pdf_path,
+                output_dir=args.output_dir,
+                pages=args.pages,
+                merge_output=args.merge,
+                resume=not args.no_resume,
+                strategy=args.pymupdf_strategy,
+                output_format=args.output_format,
+            )
+
+            logger.info(f"Extraction complete: {num_tables} tables processed")
+            return 0
+
+        except Exception as e:
+            logger.error(f"Extraction failed: {e}")
+            if args.debug:
+                raise
+            return 1
+
+    elif args.engine == "words":
+        from .words_extractor import extract_tables_with_words
+
+        try:
+            num_tables = extract_tables_with_words(
+                pdf_path=args.pdf_path,
+                output_dir=args.output_dir,
+                pages=args.pages,
+                merge_output=args.merge,
+                resume=not args.no_resume,
+                col_gap=args.words_col_gap,
+                min_rows=args.words_min_rows,
+                min_cols=args.words_min_cols,
+                output_format=args.output_format,
             )
 
             logger.info(f"Extraction complete: {num_tables} tables processed")
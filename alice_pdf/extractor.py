@@ -7,34 +7,98 @@ Converts PDF pages to images and uses Mistral API for table extraction.
 import logging
 import base64
 from pathlib import Path
-from io import BytesIO
 import json
 import time
-import shutil
-import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import fitz  # PyMuPDF
+import httpx  # HTTP transport of the mistralai SDK
 from PIL import Image
 from mistralai import Mistral
 from mistralai.utils.retries import BackoffStrategy, RetryConfig
 import pandas as pd
 
+from .cache import DEFAULT_MAX_BYTES, ResponseCache, cache_key
+from .manifest import ResumeManifest
+from .merge import MergeWriter
+from .output import OUTPUT_EXTENSIONS, write_table
+from .rate_limit import TokenBucket
+from .prefilter import apply_prefilter
+from .rendering import RenderAhead, convert_image_color, encode_image
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_PROMPT = """Extract all tables from this image.
+For each table, return structured data in JSON format with:
+- headers: list of column headers
+- rows: list of rows, each row is a list of cell values
+
+Return ONLY valid JSON in this format:
+{
+  "tables": [
+    {
+      "headers": ["col1", "col2", ...],
+      "rows": [
+        ["val1", "val2", ...],
+        ["val1", "val2", ...]
+      ]
+    }
+  ]
+}
 
-def natural_sort_key(path):
+If no tables found, return: {"tables": []}
+"""
+
+
+def _render_page_base64(
+    doc,
+    page_num,
+    dpi=150,
+    image_format="png",
+    image_color="rgb",
+    image_quality=85,
+    max_image_bytes=None,
+):
     """
-    Generate a key for natural sorting of file paths.
-    Extracts page number from filename for proper numeric sorting.
+    Render a page of an already open document to a base64 image.
+
+    Returns:
+        Tuple (base64 string, MIME type)
     """
-    # Extract page number from filename like "..._page12_table0.csv"
-    match = re.search(r'_page(\d+)_', path.name)
-    if match:
-        return int(match.group(1))
-    return 0
+    page = doc[page_num]
+
+    # Render page to pixmap (grayscale directly when colour is not needed)
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    if image_color == "rgb":
+        pix = page.get_pixmap(matrix=mat)
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    else:
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY)
+        img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
 
+    img = convert_image_color(img, image_color)
+    data, mime_type, size = encode_image(
+        img, image_format=image_format, quality=image_quality, max_bytes=max_image_bytes
+    )
+    logger.info(
+        f"  Page {page_num + 1}: encoded {image_format}/{image_color} "
+        f"{size[0]}x{size[1]}, {len(data) / 1024:.0f} KB"
+    )
+
+    # Convert to base64
+    return base64.b64encode(data).decode(), mime_type
 
-def pdf_page_to_base64(pdf_path, page_num, dpi=150):
+
+def pdf_page_to_base64(
+    pdf_path,
+    page_num,
+    dpi=150,
+    image_format="png",
+    image_color="rgb",
+    image_quality=85,
+    max_image_bytes=None,
+):
     """
     Convert PDF page to base64-encoded image.
 
@@ -42,99 +106,104 @@ def pdf_page_to_base64(pdf_path, page_num, dpi=150):
         pdf_path: Path to PDF file
         page_num: Page number (0-based)
         dpi: Resolution for rendering
+        image_format: Encoding format ('png', 'jpeg', 'webp')
+        image_color: Colour mode ('rgb', 'gray', 'bilevel')
+        image_quality: Quality for lossy formats (1-100)
+        max_image_bytes: Optional byte budget for the encoded image
 
     Returns:
         Base64-encoded image string
     """
     doc = fitz.open(pdf_path)
-    page = doc[page_num]
+    img_base64, _ = _render_page_base64(
+        doc,
+        page_num,
+        dpi=dpi,
+        image_format=image_format,
+        image_color=image_color,
+        image_quality=image_quality,
+        max_image_bytes=max_image_bytes,
+    )
+    doc.close()
+    return img_base64
 
-    # Render page to pixmap
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
-    pix = page.get_pixmap(matrix=mat)
 
-    # Convert to PIL Image
-    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+PACKED_PROMPT_TEMPLATE = """You will receive {count} page images. Each image is preceded by a label
+with its page number ({page_list}).
 
-    # Convert to base64
-    buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    img_base64 = base64.b64encode(buffered.getvalue()).decode()
+Apply the instructions below to EACH page separately, then return ONLY valid
+JSON in this format, with one entry per page in the order received:
+{{
+  "pages": [
+    {{"page": <page number>, "tables": [ ...tables of that page... ]}}
+  ]
+}}
 
-    doc.close()
-    return img_base64
+Instructions for each page:
+{prompt}"""
 
 
-def extract_tables_with_mistral(
-    client, image_base64, page_num, model="pixtral-12b-2409", custom_prompt=None
+def _chat_complete(
+    client,
+    content,
+    label,
+    model,
+    rate_limiter=None,
+    timeout_ms=None,
+    retries=None,
 ):
     """
-    Extract tables from image using Mistral OCR.
+    Send one chat request to Mistral and return the raw reply text.
 
     Args:
         client: Mistral client
-        image_base64: Base64-encoded image
-        page_num: Page number for reference
+        content: Message content list (text and image_url parts)
+        label: Human-readable target for log messages (e.g. "page 3")
         model: Mistral model to use
-        custom_prompt: Optional custom prompt describing table structure
+        rate_limiter: Optional TokenBucket shared by all workers
+        timeout_ms: Optional per-request timeout overriding the client default
+        retries: Optional per-request RetryConfig overriding the client default
 
     Returns:
-        Extracted table data as dict
+        Reply text
     """
-    if custom_prompt:
-        prompt = custom_prompt
-    else:
-        prompt = """Extract all tables from this image.
-For each table, return structured data in JSON format with:
-- headers: list of column headers
-- rows: list of rows, each row is a list of cell values
+    messages = [{"role": "user", "content": content}]
 
-Return ONLY valid JSON in this format:
-{
-  "tables": [
-    {
-      "headers": ["col1", "col2", ...],
-      "rows": [
-        ["val1", "val2", ...],
-        ["val1", "val2", ...]
-      ]
-    }
-  ]
-}
-
-If no tables found, return: {"tables": []}
-"""
-
-    messages = [
-        {
-            "role": "user",
-            "content": [
-                {"type": "text", "text": prompt},
-                {
-                    "type": "image_url",
-                    "image_url": f"data:image/png;base64,{image_base64}",
-                },
-            ],
-        }
-    ]
+    logger.info(f"  Sending {label} to Mistral API...")
 
-    logger.info(f"  Sending page {page_num + 1} to Mistral API...")
+    # Rate limiting: shared token bucket so concurrent workers respect the account quota
+    if rate_limiter is not None:
+        waited = rate_limiter.acquire()
+        if waited:
+            logger.debug(f"  Rate limiter delayed {label} by {waited:.2f}s")
 
-    # Rate limiting: 1 request per second + extra buffer
-    time.sleep(1.2)
+    # Per-call overrides let one pooled client serve every retry attempt
+    request_options = {}
+    if timeout_ms is not None:
+        request_options["timeout_ms"] = timeout_ms
+    if retries is not None:
+        request_options["retries"] = retries
 
     try:
-        response = client.chat.complete(model=model, messages=messages)
+        response = client.chat.complete(model=model, messages=messages, **request_options)
     except Exception as e:
-        logger.error(f"  API request failed for page {page_num + 1}: {e}")
+        logger.error(f"  API request failed for {label}: {e}")
         if "timeout" in str(e).lower() or "timed out" in str(e).lower():
             logger.error(f"  Request timed out - consider increasing --timeout-ms")
         raise  # Re-raise to stop processing instead of silently continuing
 
     result = response.choices[0].message.content
     logger.debug(f"  Raw response: {result}")
+    return result
 
-    # Try to parse JSON from response
+
+def _parse_json_reply(result):
+    """
+    Parse a JSON reply, tolerating markdown code fences.
+
+    Returns:
+        Parsed data, or None if the reply is not valid JSON
+    """
     try:
         # Remove markdown code blocks if present
         if "```json" in result:
@@ -142,13 +211,455 @@ If no tables found, return: {"tables": []}
         elif "```" in result:
             result = result.split("```")[1].split("```")[0].strip()
 
-        data = json.loads(result)
-        return data
+        return json.loads(result)
     except json.JSONDecodeError as e:
         logger.error(f"  Failed to parse JSON: {e}")
         logger.error(f"  Response (truncated): {result[:500]}")
-        # Return empty result instead of raising to align with caller expectations/tests
-        return {"tables": []}
+        return None
+
+
+def extract_tables_with_mistral(
+    client,
+    image_base64,
+    page_num,
+    model="pixtral-12b-2409",
+    custom_prompt=None,
+    rate_limiter=None,
+    mime_type="image/png",
+    cache=None,
+    cache_key=None,
+    timeout_ms=None,
+    retries=None,
+):
+    """
+    Extract tables from image using Mistral OCR.
+
+    Args:
+        client: Mistral client
+        image_base64: Base64-encoded image
+        page_num: Page number for reference
+        model: Mistral model to use
+        custom_prompt: Optional custom prompt describing table structure
+        rate_limiter: Optional TokenBucket shared by all workers; a token is
+            taken before the request is sent
+        mime_type: MIME type of the encoded image
+        cache: Optional ResponseCache; successfully parsed results are stored
+        cache_key: Key identifying this request in `cache`
+        timeout_ms: Optional per-request timeout overriding the client default
+        retries: Optional per-request RetryConfig overriding the client default
+
+    Returns:
+        Extracted table data as dict, or None if the reply is not valid JSON
+        (the page then counts as failed)
+    """
+    prompt = custom_prompt or DEFAULT_PROMPT
+
+    # Serve unchanged requests from the response cache (no API call, no rate limit token)
+    if cache is not None and cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"  Page {page_num + 1}: response cache hit")
+            return cached
+
+    content = [
+        {"type": "text", "text": prompt},
+        {
+            "type": "image_url",
+            "image_url": f"data:{mime_type};base64,{image_base64}",
+        },
+    ]
+    result = _chat_complete(
+        client,
+        content,
+        f"page {page_num + 1}",
+        model,
+        rate_limiter=rate_limiter,
+        timeout_ms=timeout_ms,
+        retries=retries,
+    )
+
+    data = _parse_json_reply(result)
+    if data is None:
+        # Not recorded as done nor cached, so a garbled reply is retried next run
+        return None
+
+    # Only well-formed responses are cached
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, data)
+    return data
+
+
+def extract_tables_with_mistral_packed(
+    client,
+    images,
+    page_nums,
+    model="pixtral-12b-2409",
+    custom_prompt=None,
+    rate_limiter=None,
+    cache=None,
+    cache_key=None,
+    timeout_ms=None,
+    retries=None,
+):
+    """
+    Extract tables from several page images in a single Mistral request.
+
+    Each image is preceded by a "Page N" label and the model is asked for
+    page-tagged output (``{"pages": [{"page": N, "tables": [...]}]}``), which
+    is fanned back out per page. The prompt is sent once for all pages.
+
+    Args:
+        client: Mistral client
+        images: List of (base64 string, MIME type) tuples
+        page_nums: Page numbers (0-based) matching `images`
+        model: Mistral model to use
+        custom_prompt: Optional custom prompt describing table structure
+        rate_limiter: Optional TokenBucket shared by all workers
+        cache: Optional ResponseCache; parsed replies covering every page are stored
+        cache_key: Key identifying this request in `cache`
+        timeout_ms: Optional per-request timeout overriding the client default
+        retries: Optional per-request RetryConfig overriding the client default
+
+    Returns:
+        Dict mapping page number (0-based) to ``{"tables": [...]}``; pages
+        missing from the reply (or all pages, if it is not valid JSON) are
+        left out
+    """
+    label = f"pages {', '.join(str(p + 1) for p in page_nums)}"
+
+    data = None
+    from_cache = False
+    if cache is not None and cache_key is not None:
+        data = cache.get(cache_key)
+        if data is not None:
+            from_cache = True
+            logger.info(f"  {label[0].upper()}{label[1:]}: response cache hit")
+
+    if data is None:
+        prompt = PACKED_PROMPT_TEMPLATE.format(
+            count=len(page_nums),
+            page_list=", ".join(str(p + 1) for p in page_nums),
+            prompt=custom_prompt or DEFAULT_PROMPT,
+        )
+        content = [{"type": "text", "text": prompt}]
+        for page_num, (image_base64, mime_type) in zip(page_nums, images):
+            content.append({"type": "text", "text": f"Page {page_num + 1}:"})
+            content.append(
+                {"type": "image_url", "image_url": f"data:{mime_type};base64,{image_base64}"}
+            )
+
+        result = _chat_complete(
+            client,
+            content,
+            label,
+            model,
+            rate_limiter=rate_limiter,
+            timeout_ms=timeout_ms,
+            retries=retries,
+        )
+        data = _parse_json_reply(result)
+        if data is None:
+            data = {"pages": []}
+
+    # Fan the page-tagged reply back out (page labels are 1-based)
+    by_page = {}
+    for entry in data.get("pages", []):
+        try:
+            page_num = int(entry.get("page")) - 1
+        except (TypeError, ValueError):
+            logger.warning(f"  Ignoring reply entry without a valid page number: {str(entry)[:100]}")
+            continue
+        if page_num not in page_nums:
+            logger.warning(f"  Reply contains unexpected page {page_num + 1}, ignoring")
+            continue
+        by_page[page_num] = {"tables": entry.get("tables", [])}
+
+    missing = [p + 1 for p in page_nums if p not in by_page]
+    if missing:
+        logger.warning(f"  Reply has no entry for page(s) {', '.join(map(str, missing))}")
+    elif not from_cache and cache is not None and cache_key is not None:
+        # Only complete replies are cached, so missing pages are asked again
+        cache.put(cache_key, data)
+
+    return by_page
+
+
+def _attempt_timeouts(timeout_ms):
+    """Progressive timeouts for the retry loop (doubling strategy)."""
+    return [timeout_ms, timeout_ms * 2, timeout_ms * 4]
+
+
+def _retry_config(timeout_ms):
+    """SDK-level retry policy whose total backoff is bounded by the request timeout."""
+    backoff = BackoffStrategy(
+        initial_interval=2, max_interval=10, exponent=2, max_elapsed_time=timeout_ms // 1000
+    )
+    return RetryConfig(
+        strategy="exponential",
+        backoff=backoff,
+        retry_connection_errors=True,
+    )
+
+
+def _create_mistral_client(api_key, timeout_ms, max_connections=1):
+    """
+    Create one Mistral client for a whole run, shared by all pages, workers
+    and retry attempts.
+
+    The client sits on an explicit httpx connection pool with keep-alive, so
+    only the first request per connection pays the TLS handshake. Per-attempt
+    timeouts and retry policies are passed at call time instead of building a
+    new client.
+
+    Args:
+        api_key: Mistral API key
+        timeout_ms: Default HTTP timeout in milliseconds
+        max_connections: Pool size (number of concurrent workers)
+
+    Returns:
+        Tuple (Mistral client, httpx client to close when done)
+    """
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+    )
+    client = Mistral(
+        api_key=api_key,
+        client=http_client,
+        timeout_ms=timeout_ms,
+        retry_config=_retry_config(timeout_ms),
+    )
+    return client, http_client
+
+
+def _call_with_retry(request, label, timeout_ms):
+    """
+    Run a Mistral request with progressive timeout retry.
+
+    Args:
+        request: Callable ``(timeout_ms, retries) -> result`` sending one attempt
+        label: Human-readable target for log messages (e.g. "page 3")
+        timeout_ms: Timeout of the first attempt; doubled on each retry
+
+    Returns:
+        Request result, or None if every attempt failed
+    """
+    max_attempts = 3
+    timeout_increments = _attempt_timeouts(timeout_ms)  # 60s, 120s, 240s
+
+    for attempt in range(max_attempts):
+        current_timeout = timeout_increments[attempt]
+
+        try:
+            if attempt > 0:
+                logger.info(f"  Retry attempt {attempt}/{max_attempts - 1} with timeout {current_timeout}ms")
+
+            return request(current_timeout, _retry_config(current_timeout))
+
+        except Exception as e:
+            error_str = str(e).lower()
+            is_timeout = "timeout" in error_str or "timed out" in error_str
+            # Transient errors that should be retried: 500, 503, 429
+            is_transient = "status 500" in error_str or "status 503" in error_str or "status 429" in error_str
+            # JSON parsing errors may indicate incomplete API response - retry
+            is_json_error = "json parsing failed" in error_str
+            is_retryable = is_timeout or is_transient or is_json_error
+
+            if is_retryable and attempt < max_attempts - 1:
+                # Retryable error and we have more attempts - continue to retry
+                if is_timeout:
+                    logger.warning(f"  Request timed out after {current_timeout}ms")
+                elif is_json_error:
+                    logger.warning(f"  Malformed JSON response (will retry with longer timeout)")
+                else:
+                    logger.warning(f"  Transient API error (will retry): {e}")
+                continue
+            elif is_retryable:
+                # Retryable error on final attempt
+                logger.error(f"  All retry attempts failed after {current_timeout}ms")
+                logger.error(f"  Failed to extract tables from {label}: {e}")
+                return None
+            else:
+                # Non-retryable error - skip retry
+                logger.error(f"  Failed to extract tables from {label}: {e}")
+                return None
+
+    return None
+
+
+def _process_single_page(
+    page_num,
+    image,
+    client,
+    model,
+    custom_prompt,
+    timeout_ms,
+    rate_limiter,
+    dpi=150,
+    cache=None,
+):
+    """
+    Extract tables from one pre-rendered page (thread-safe).
+    `image` is the (base64 string, MIME type) tuple from _render_page_base64.
+    Returns: (page_num, result, failed)
+    """
+    image_base64, mime_type = image
+
+    key = None
+    if cache is not None:
+        key = cache_key(
+            "mistral", model, custom_prompt or DEFAULT_PROMPT, dpi, mime_type, image_base64
+        )
+
+    result = _call_with_retry(
+        lambda current_timeout, retries: extract_tables_with_mistral(
+            client,
+            image_base64,
+            page_num,
+            model=model,
+            custom_prompt=custom_prompt,
+            rate_limiter=rate_limiter,
+            mime_type=mime_type,
+            cache=cache,
+            cache_key=key,
+            timeout_ms=current_timeout,
+            retries=retries,
+        ),
+        f"page {page_num + 1}",
+        timeout_ms,
+    )
+    return (page_num, result, result is None)
+
+
+def _process_page_batch(
+    batch,
+    client,
+    model,
+    custom_prompt,
+    timeout_ms,
+    rate_limiter,
+    dpi=150,
+    cache=None,
+):
+    """
+    Extract tables from a batch of pre-rendered pages (thread-safe).
+
+    A single page goes through the regular one-image request; larger batches
+    are packed into one request with page-tagged output.
+
+    Args:
+        batch: List of (page_num, image) tuples, image as from _render_page_base64
+
+    Returns:
+        List of (page_num, result, failed) in batch order
+    """
+    if len(batch) == 1:
+        page_num, image = batch[0]
+        return [
+            _process_single_page(
+                page_num, image, client, model, custom_prompt, timeout_ms, rate_limiter, dpi, cache
+            )
+        ]
+
+    page_nums = [page_num for page_num, _ in batch]
+    images = [image for _, image in batch]
+
+    key = None
+    if cache is not None:
+        parts = [img_part for image in images for img_part in image]
+        key = cache_key(
+            "mistral-packed", model, custom_prompt or DEFAULT_PROMPT, dpi, page_nums, *parts
+        )
+
+    by_page = _call_with_retry(
+        lambda current_timeout, retries: extract_tables_with_mistral_packed(
+            client,
+            images,
+            page_nums,
+            model=model,
+            custom_prompt=custom_prompt,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            cache_key=key,
+            timeout_ms=current_timeout,
+            retries=retries,
+        ),
+        f"pages {', '.join(str(p + 1) for p in page_nums)}",
+        timeout_ms,
+    )
+
+    if by_page is None:
+        return [(page_num, None, True) for page_num in page_nums]
+
+    # Pages the packed reply left out are sent again on their own
+    results = []
+    for page_num, image in batch:
+        if page_num in by_page:
+            results.append((page_num, by_page[page_num], False))
+        else:
+            results.append(
+                _process_single_page(
+                    page_num, image, client, model, custom_prompt, timeout_ms, rate_limiter, dpi, cache
+                )
+            )
+    return results
+
+
+def _result_to_dataframes(result, page_num):
+    """
+    Convert a parsed Mistral result into DataFrames with a leading page column.
+
+    Returns:
+        List of (table_index, DataFrame) for non-empty tables
+    """
+    dataframes = []
+
+    for i, table_data in enumerate(result.get("tables", [])):
+        headers = table_data.get("headers", [])
+        rows = table_data.get("rows", [])
+
+        if not rows:
+            logger.info(f"  Table {i}: empty, skipping")
+            continue
+
+        # Create DataFrame with headers if available
+        if headers:
+            # Pad or trim rows to match header count
+            num_cols = len(headers)
+            padded_rows = []
+            rows_padded = 0
+            rows_trimmed = 0
+            for row_idx, row in enumerate(rows):
+                if len(row) < num_cols:
+                    # Pad with empty strings
+                    padded_row = row + [""] * (num_cols - len(row))
+                    padded_rows.append(padded_row)
+                    rows_padded += 1
+                elif len(row) > num_cols:
+                    # Trim extra columns
+                    padded_rows.append(row[:num_cols])
+                    rows_trimmed += 1
+                else:
+                    padded_rows.append(row)
+
+            if rows_padded > 0:
+                logger.warning(f"  Table {i}: {rows_padded} rows had fewer columns than headers (padded with empty strings)")
+            if rows_trimmed > 0:
+                logger.warning(f"  Table {i}: {rows_trimmed} rows had more columns than headers (extra columns discarded)")
+
+            df = pd.DataFrame(padded_rows, columns=headers)
+        else:
+            df = pd.DataFrame(rows)
+
+        # Add page column
+        df.insert(0, "page", page_num + 1)
+
+        logger.info(f"  Table {i}: {df.shape}")
+        dataframes.append((i, df))
+
+    return dataframes
 
 
 def extract_tables(
@@ -162,6 +673,19 @@ def extract_tables(
     custom_prompt=None,
     timeout_ms=30_000,
     resume=True,
+    workers=1,
+    rps=1.0,
+    prefetch=2,
+    image_format="png",
+    image_color="rgb",
+    image_quality=85,
+    max_image_bytes=None,
+    cache_dir=None,
+    cache_max_bytes=DEFAULT_MAX_BYTES,
+    pages_per_request=1,
+    prefilter=None,
+    prefilter_threshold=0.3,
+    output_format="csv",
 ):
     """
     Extract tables from PDF using Mistral OCR.
@@ -175,7 +699,24 @@ def extract_tables(
         dpi: Image resolution
         merge_output: If True, merge all tables into single CSV
         custom_prompt: Optional custom prompt describing table structure
-        resume: If True, skip pages that already have output files
+        resume: If True, skip pages recorded as done in the resume manifest
+        workers: Number of pages in flight at once
+        rps: Maximum Mistral requests per second shared by all workers
+        prefetch: Number of pages rendered ahead while requests are in flight
+        image_format: Page image encoding ('png', 'jpeg', 'webp')
+        image_color: Page image colour mode ('rgb', 'gray', 'bilevel')
+        image_quality: Quality for lossy formats (1-100)
+        max_image_bytes: Optional byte budget per page image; images are
+            recompressed/downscaled until they fit
+        cache_dir: Optional directory of the persistent response cache
+            (None disables caching)
+        cache_max_bytes: Size bound of the response cache (LRU eviction)
+        pages_per_request: Number of page images packed into one request;
+            the reply is page-tagged and fanned back out per page
+        prefilter: None, 'skip' or 'defer' pages with a low local table score
+        prefilter_threshold: Minimum table score (0-1) for the pre-filter
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
 
     Returns:
         Number of tables extracted
@@ -183,37 +724,36 @@ def extract_tables(
     pdf_path = Path(pdf_path)
     output_dir = Path(output_dir)
 
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if pages_per_request < 1:
+        raise ValueError(f"pages_per_request must be >= 1, got {pages_per_request}")
+
     output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
 
     # Delete merged file if exists
     if merge_output:
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
         if merged_file.exists():
             merged_file.unlink()
             logger.info(f"Deleted previous merged file: {merged_file.name}")
 
-    # Always delete the most recently created page CSV
-    existing_csvs = list(output_dir.glob(f"{pdf_path.stem}_page*.csv"))
-    if existing_csvs:
-        most_recent = max(existing_csvs, key=lambda p: p.stat().st_mtime)
-        most_recent.unlink()
-        logger.info(f"Deleted last created file: {most_recent.name}")
-
-    # Initialize Mistral client with timeout - no retries on timeout to fail fast
+    # Initialize one pooled Mistral client for all pages and workers
     # Timeout is for HTTP read - if API doesn't respond in timeout_ms, skip page
-    backoff = BackoffStrategy(
-        initial_interval=2, max_interval=10, exponent=2, max_elapsed_time=timeout_ms // 1000
-    )
-    retry_config = RetryConfig(
-        strategy="exponential",
-        backoff=backoff,
-        retry_connection_errors=True,
-    )
-    client = Mistral(api_key=api_key, timeout_ms=timeout_ms, retry_config=retry_config)
+    client, http_client = _create_mistral_client(api_key, timeout_ms, max_connections=workers)
+
+    cache = ResponseCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+    if cache is not None:
+        logger.info(f"Response cache: {cache.cache_dir}")
+
+    # One limiter for all workers: the quota is per account, not per thread
+    rate_limiter = TokenBucket(rps)
 
     # Open PDF
     doc = fitz.open(pdf_path)
     total_pages = len(doc)
+    doc.close()
 
     # Parse page range
     if pages == "all":
@@ -229,190 +769,169 @@ def extract_tables(
 
     logger.info(f"Processing {len(page_list)} pages from: {pdf_path}")
     logger.info(f"Model: {model}, DPI: {dpi}")
+    logger.info(
+        f"Image encoding: {image_format}/{image_color}"
+        + (f", quality {image_quality}" if image_format != "png" else "")
+        + (f", max {max_image_bytes} bytes" if max_image_bytes else "")
+    )
+    logger.info(f"Workers: {workers}, rate limit: {rps} req/s, pages per request: {pages_per_request}")
+
+    # Per-page resume state; partial pages of an interrupted run are discarded
+    manifest = ResumeManifest(
+        output_dir, pdf_path.stem, resume=resume, pages=[page_num + 1 for page_num in page_list]
+    )
 
-    all_dataframes = []
     table_count = 0
     failed_pages = []
 
-    # Process each page
+    # Merged output is streamed in page order while pages complete
+    merger = None
+    if merge_output:
+        merger = MergeWriter(
+            output_dir / f"{pdf_path.stem}_merged{ext}",
+            sorted({page_num + 1 for page_num in page_list if page_num < total_pages}),
+            output_format=output_format,
+        )
+
+    # Resolve resume state up front so only missing pages are submitted
+    pending = []
     for idx, page_num in enumerate(page_list, start=1):
         if page_num >= total_pages:
             logger.warning(f"Page {page_num + 1} out of range, skipping")
             continue
 
-        # Check if page already processed - always skip to avoid duplicate API calls
-        existing_files = sorted(
-            list(output_dir.glob(f"{pdf_path.stem}_page{page_num + 1}_table*.csv")),
-            key=natural_sort_key
-        )
-        if existing_files:
+        # Completed pages are never sent again (pages with no table included)
+        if manifest.is_done(page_num + 1):
             logger.info(f"Page {page_num + 1} ({idx}/{len(page_list)}) - already processed, skipping")
-            # Count existing tables for this page
-            table_count += len(existing_files)
-            # Load existing dataframes for merge if needed
-            if merge_output:
-                for csv_file in existing_files:
-                    df = pd.read_csv(csv_file, encoding="utf-8-sig")
-                    all_dataframes.append(df)
+            table_count += manifest.table_count(page_num + 1)
+            # Existing CSVs are read only when the merge reaches this page
+            if merger is not None:
+                merger.add_page(page_num + 1, manifest.page_files(page_num + 1))
             continue
 
-        logger.info(f"Processing page {page_num + 1} ({idx}/{len(page_list)})")
+        pending.append((idx, page_num))
 
-        # Convert page to image
-        try:
-            image_base64 = pdf_page_to_base64(pdf_path, page_num, dpi=dpi)
-        except Exception as e:
-            logger.error(f"  Failed to render page {page_num + 1}: {e}")
-            continue
+    started = {}
 
-        # Extract tables using Mistral with progressive timeout retry
-        result = None
-        max_attempts = 3
-        timeout_increments = [timeout_ms, timeout_ms * 2, timeout_ms * 4]  # 60s, 120s, 240s (doubling strategy)
+    def save_result(page_num, result, failed):
+        nonlocal table_count
 
-        for attempt in range(max_attempts):
-            current_timeout = timeout_increments[attempt]
+        if failed:
+            failed_pages.append(page_num + 1)
+        if result is None:
+            if merger is not None:
+                merger.add_page(page_num + 1, [])
+            return
+
+        dataframes = _result_to_dataframes(result, page_num)
+        output_files = [
+            output_dir / f"{pdf_path.stem}_page{page_num + 1}_table{i}{ext}"
+            for i, _ in dataframes
+        ]
+        manifest.begin_page(page_num + 1, output_files)
+
+        for (_, df), output_file in zip(dataframes, output_files):
+            # Save individual table file
+            write_table(df, output_file, output_format)
+            logger.info(f"    Saved: {output_file}")
 
-            try:
-                # Create client with current timeout for this attempt
-                backoff = BackoffStrategy(
-                    initial_interval=2, max_interval=10, exponent=2, max_elapsed_time=current_timeout // 1000
-                )
-                retry_config = RetryConfig(
-                    strategy="exponential",
-                    backoff=backoff,
-                    retry_connection_errors=True,
-                )
-                attempt_client = Mistral(api_key=api_key, timeout_ms=current_timeout, retry_config=retry_config)
+            table_count += 1
 
-                if attempt > 0:
-                    logger.info(f"  Retry attempt {attempt}/{max_attempts - 1} with timeout {current_timeout}ms")
+        if merger is not None:
+            merger.add_page(page_num + 1, [df for _, df in dataframes])
+
+        if not failed:
+            manifest.finish_page(
+                page_num + 1, output_files, seconds=time.monotonic() - started[page_num]
+            )
 
-                result = extract_tables_with_mistral(
-                    attempt_client, image_base64, page_num, model=model, custom_prompt=custom_prompt
+    # Skip or defer pages that almost certainly hold no table before paying for OCR
+    if prefilter and pending:
+        kept = apply_prefilter(pdf_path, pending, mode=prefilter, threshold=prefilter_threshold)
+        if merger is not None:
+            for page_num in {p for _, p in pending} - {p for _, p in kept}:
+                merger.add_page(page_num + 1, [])
+        pending = kept
+
+    page_index = {page_num: idx for idx, page_num in pending}
+
+    # A background thread renders the next `prefetch` pages from one open
+    # document while up to `workers` requests (of `pages_per_request` pages
+    # each) are in flight. Results are consumed oldest-first, so CSV writes
+    # and merge order stay deterministic and memory is bounded by
+    # (workers + 1) * pages_per_request + prefetch page images.
+    with http_client, RenderAhead(
+        lambda: fitz.open(pdf_path),
+        [page_num for _, page_num in pending],
+        lambda doc, page_num: _render_page_base64(
+            doc,
+            page_num,
+            dpi=dpi,
+            image_format=image_format,
+            image_color=image_color,
+            image_quality=image_quality,
+            max_image_bytes=max_image_bytes,
+        ),
+        prefetch=prefetch,
+    ) as renderer, ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        batch = []
+
+        def submit_batch():
+            in_flight.append(
+                executor.submit(
+                    _process_page_batch,
+                    list(batch),
+                    client,
+                    model,
+                    custom_prompt,
+                    timeout_ms,
+                    rate_limiter,
+                    dpi,
+                    cache,
                 )
-                break  # Success, exit retry loop
-
-            except Exception as e:
-                error_str = str(e).lower()
-                is_timeout = "timeout" in error_str or "timed out" in error_str
-                # Transient errors that should be retried: 500, 503, 429
-                is_transient = "status 500" in error_str or "status 503" in error_str or "status 429" in error_str
-                # JSON parsing errors may indicate incomplete API response - retry
-                is_json_error = "json parsing failed" in error_str
-                is_retryable = is_timeout or is_transient or is_json_error
-
-                if is_retryable and attempt < max_attempts - 1:
-                    # Retryable error and we have more attempts - continue to retry
-                    if is_timeout:
-                        logger.warning(f"  Request timed out after {current_timeout}ms")
-                    elif is_json_error:
-                        logger.warning(f"  Malformed JSON response (will retry with longer timeout)")
-                    else:
-                        logger.warning(f"  Transient API error (will retry): {e}")
-                    continue
-                elif is_retryable:
-                    # Retryable error on final attempt
-                    logger.error(f"  All retry attempts failed after {current_timeout}ms")
-                    logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
-                    failed_pages.append(page_num + 1)
-                    break
-                else:
-                    # Non-retryable error - skip retry
-                    logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
-                    failed_pages.append(page_num + 1)
-                    break
+            )
+            batch.clear()
 
-        if result is None:
-            continue  # Skip to next page
+            # Backpressure: wait for the oldest request before rendering more
+            while len(in_flight) >= workers:
+                for item in in_flight.popleft().result():
+                    save_result(*item)
 
-        # Process tables
-        for i, table_data in enumerate(result.get("tables", [])):
-            headers = table_data.get("headers", [])
-            rows = table_data.get("rows", [])
+        for page_num, image, error in renderer:
+            logger.info(f"Processing page {page_num + 1} ({page_index[page_num]}/{len(page_list)})")
 
-            if not rows:
-                logger.info(f"  Table {i}: empty, skipping")
+            if error is not None:
+                logger.error(f"  Failed to render page {page_num + 1}: {error}")
+                failed_pages.append(page_num + 1)
+                if merger is not None:
+                    merger.add_page(page_num + 1, [])
                 continue
 
-            # Create DataFrame with headers if available
-            if headers:
-                # Pad or trim rows to match header count
-                num_cols = len(headers)
-                padded_rows = []
-                rows_padded = 0
-                rows_trimmed = 0
-                for row_idx, row in enumerate(rows):
-                    if len(row) < num_cols:
-                        # Pad with empty strings
-                        padded_row = row + [""] * (num_cols - len(row))
-                        padded_rows.append(padded_row)
-                        rows_padded += 1
-                    elif len(row) > num_cols:
-                        # Trim extra columns
-                        padded_rows.append(row[:num_cols])
-                        rows_trimmed += 1
-                    else:
-                        padded_rows.append(row)
-
-                if rows_padded > 0:
-                    logger.warning(f"  Table {i}: {rows_padded} rows had fewer columns than headers (padded with empty strings)")
-                if rows_trimmed > 0:
-                    logger.warning(f"  Table {i}: {rows_trimmed} rows had more columns than headers (extra columns discarded)")
-
-                df = pd.DataFrame(padded_rows, columns=headers)
-            else:
-                df = pd.DataFrame(rows)
-
-            # Add page column
-            df.insert(0, "page", page_num + 1)
-
-            logger.info(f"  Table {i}: {df.shape}")
-
-            # Save individual CSV
-            output_file = (
-                output_dir / f"{pdf_path.stem}_page{page_num + 1}_table{i}.csv"
-            )
-            df.to_csv(output_file, index=False, encoding="utf-8-sig")
-            logger.info(f"    Saved: {output_file}")
+            started[page_num] = time.monotonic()
+            batch.append((page_num, image))
+            if len(batch) >= pages_per_request:
+                submit_batch()
 
-            if merge_output:
-                all_dataframes.append(df)
+        if batch:
+            submit_batch()
 
-            table_count += 1
+        while in_flight:
+            for item in in_flight.popleft().result():
+                save_result(*item)
 
-    doc.close()
+    manifest.close()
 
     # Log statistics
     successful_pages = len(page_list) - len(failed_pages)
     logger.info(f"Statistics: {successful_pages}/{len(page_list)} pages processed successfully")
+    if cache is not None:
+        logger.info(f"Response cache: {cache.hits} hits, {cache.misses} misses")
     if failed_pages:
         logger.warning(f"Failed pages: {', '.join(map(str, failed_pages))}")
 
-    # Merge all tables if requested
-    if merge_output and all_dataframes:
-        # Standardize column names before merge to handle variations
-        # (e.g., "TOTALE PERCEPITO" vs "TOTALE_PERCEPITO")
-        for df in all_dataframes:
-            df.columns = df.columns.str.replace(" ", "_")
-
-        # Sort dataframes by page number using natural sort
-        # Load all CSVs with natural sorting
-        all_csv_files = sorted(
-            list(output_dir.glob(f"{pdf_path.stem}_page*.csv")),
-            key=natural_sort_key
-        )
-        
-        sorted_dataframes = []
-        for csv_file in all_csv_files:
-            df = pd.read_csv(csv_file, encoding="utf-8-sig")
-            df.columns = df.columns.str.replace(" ", "_")
-            sorted_dataframes.append(df)
-        
-        merged_df = pd.concat(sorted_dataframes, ignore_index=True)
-
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
-        merged_df.to_csv(merged_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Merged all tables into: {merged_file} ({merged_df.shape})")
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
 
     return table_count
@@ -0,0 +1,206 @@
+"""
+Resume manifest: per-page processing state for an output directory.
+
+Every engine records each finished page (status, table count, output files,
+content hash, timing) in ``{pdf_stem}_manifest.sqlite`` next to the CSVs.
+Resume checks are a dictionary lookup instead of a directory glob per page,
+and each page is committed atomically:
+
+1. ``begin_page`` records the files about to be written (status 'writing')
+2. the engine writes its files
+3. ``finish_page`` marks the page 'done'
+
+A page left in 'writing' by an interrupted run has its partial files deleted
+and is processed again; 'done' pages are never re-paid. Output directories
+created before the manifest existed are imported once from their CSV files.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page INTEGER PRIMARY KEY,
+    status TEXT NOT NULL,
+    tables INTEGER NOT NULL DEFAULT 0,
+    files TEXT NOT NULL DEFAULT '[]',
+    content_hash TEXT,
+    seconds REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def manifest_path(output_dir, stem):
+    """Return the manifest location for a PDF stem in an output directory."""
+    return Path(output_dir) / f"{stem}_manifest.sqlite"
+
+
+def files_digest(paths):
+    """SHA-256 over the content of `paths`, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeManifest:
+    """
+    SQLite-backed record of which pages are finished (thread-safe).
+
+    Args:
+        output_dir: Output directory of the run
+        stem: PDF file stem used to name outputs
+        resume: If False, forget the recorded state of ``pages`` (their
+            outputs are rewritten); other pages stay done
+        pages: 1-based pages of this run; None means every page
+    """
+
+    def __init__(self, output_dir, stem, resume=True, pages=None):
+        self.output_dir = Path(output_dir)
+        self.stem = stem
+        self.path = manifest_path(output_dir, stem)
+        self._lock = threading.Lock()
+
+        is_new = not self.path.exists()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._done = {}
+
+        if not resume and pages is None:
+            with self._conn:
+                self._conn.execute("DELETE FROM pages")
+        else:
+            self._discard_interrupted()
+            if is_new:
+                self._import_legacy_outputs()
+            if not resume:
+                self.forget(pages)
+
+        # In-memory copy of finished pages for O(1) lookups
+        self._done = {
+            row[0]: {"tables": row[1], "files": json.loads(row[2])}
+            for row in self._conn.execute(
+                "SELECT page, tables, files FROM pages WHERE status = 'done'"
+            )
+        }
+
+    def _discard_interrupted(self):
+        """Delete partial outputs of pages an earlier run did not finish."""
+        rows = self._conn.execute(
+            "SELECT page, files FROM pages WHERE status = 'writing'"
+        ).fetchall()
+        for page, files in rows:
+            for name in json.loads(files):
+                (self.output_dir / name).unlink(missing_ok=True)
+            logger.info(f"Page {page} was interrupted in a previous run, reprocessing")
+        if rows:
+            with self._conn:
+                self._conn.execute("DELETE FROM pages WHERE status = 'writing'")
+
+    def _import_legacy_outputs(self):
+        """
+        Seed a new manifest from page CSVs written before manifests existed.
+
+        One directory scan replaces the former per-page globs. The most
+        recently written file may be a partial page from an interrupted run,
+        so its page is discarded and reprocessed.
+        """
+        pattern = re.compile(rf"^{re.escape(self.stem)}_page(\d+)_table\d+\.csv$")
+        by_page = {}
+        latest = None
+        for path in self.output_dir.glob(f"{self.stem}_page*_table*.csv"):
+            match = pattern.match(path.name)
+            if not match:
+                continue
+            by_page.setdefault(int(match.group(1)), []).append(path)
+            mtime = path.stat().st_mtime
+            if latest is None or mtime > latest[0]:
+                latest = (mtime, int(match.group(1)))
+
+        if not by_page:
+            return
+
+        latest_page = latest[1]
+        for path in by_page.pop(latest_page):
+            path.unlink()
+        logger.info(f"Deleted last created page output: page {latest_page}")
+
+        now = time.time()
+        with self._conn:
+            for page, paths in by_page.items():
+                paths.sort(key=lambda p: int(re.search(r"_table(\d+)\.csv$", p.name).group(1)))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (page, status, tables, files, updated_at) "
+                    "VALUES (?, 'done', ?, ?, ?)",
+                    (page, len(paths), json.dumps([p.name for p in paths]), now),
+                )
+        logger.info(f"Imported {len(by_page)} completed pages from existing output files")
+
+    def forget(self, pages):
+        """Drop the records of `pages` (1-based) so they are processed again."""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM pages WHERE page = ?", [(page,) for page in pages])
+        for page in pages:
+            self._done.pop(page, None)
+
+    def is_done(self, page):
+        """Return True if `page` (1-based) is finished."""
+        return page in self._done
+
+    def done_pages(self):
+        """Return the set of finished pages (1-based)."""
+        return set(self._done)
+
+    def table_count(self, page):
+        """Number of tables recorded for a finished page."""
+        return self._done[page]["tables"]
+
+    def page_files(self, page):
+        """Paths of the output files recorded for a finished page, in table order."""
+        return [self.output_dir / name for name in self._done[page]["files"]]
+
+    def begin_page(self, page, files):
+        """Record that `files` (paths or names) are about to be written for `page`."""
+        names = [Path(f).name for f in files]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (page, status, tables, files, updated_at) "
+                "VALUES (?, 'writing', ?, ?, ?)",
+                (page, len(names), json.dumps(names), time.time()),
+            )
+
+    def finish_page(self, page, files, seconds=None):
+        """Atomically mark `page` done with its written `files`."""
+        names = [Path(f).name for f in files]
+        content_hash = files_digest(self.output_dir / name for name in names)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(page, status, tables, files, content_hash, seconds, updated_at) "
+                "VALUES (?, 'done', ?, ?, ?, ?, ?)",
+                (page, len(names), json.dumps(names), content_hash, seconds, time.time()),
+            )
+            self._done[page] = {"tables": len(names), "files": names}
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,271 @@
+"""
+Streaming writer for the merged ``{pdf_name}_merged.{csv,parquet,arrow}`` output.
+
+Tables are appended to the merged file as soon as their page is next in page
+order, so only pages finished out of order (parallel workers, deferred pages)
+are held in memory. The header is the union of all table columns in order of
+first appearance, as ``pd.concat`` would build it: when a later table brings
+new columns, the file is rewritten once at close with one streaming pass that
+pads the earlier rows.
+
+Columnar formats store each page as its own Parquet row group / Arrow record
+batch, so readers can stream the merged file or select pages.
+"""
+
+import csv
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .output import arrow_schema, csv_column_names, read_table, to_arrow
+
+logger = logging.getLogger(__name__)
+
+
+def underscore_columns(df):
+    """Column names with spaces replaced by underscores (e.g. "TOTALE PERCEPITO")."""
+    return [str(col).replace(" ", "_") for col in df.columns]
+
+
+def positional_columns(df):
+    """Headless column names: ``page`` followed by ``col_0``, ``col_1``, ..."""
+    return ["page"] + [f"col_{i}" for i in range(len(df.columns) - 1)]
+
+
+class _CsvSink:
+    """Append rows to one CSV file; pad earlier rows if the header grows."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._header_columns = 0
+
+    def write_page(self, frames, columns):
+        for df in frames:
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8-sig", newline="")
+                self._header_columns = len(columns)
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+
+    @property
+    def written(self):
+        return self._file is not None
+
+    def finish(self, columns):
+        self._file.close()
+        self._file = None
+        if len(columns) > self._header_columns:
+            self._rewrite(columns)
+
+    def _rewrite(self, columns):
+        """Replace the first table's header with the column union and pad short rows."""
+        width = len(columns)
+        padded_path = self.path.with_name(self.path.name + ".padded")
+
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as src, open(
+            padded_path, "w", encoding="utf-8-sig", newline=""
+        ) as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator="\n")
+            next(reader)  # Header of the first table
+            writer.writerow(columns)
+            for row in reader:
+                writer.writerow(row + [""] * (width - len(row)))
+
+        os.replace(padded_path, self.path)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _ArrowSink:
+    """
+    Write one Parquet row group / Arrow record batch per page.
+
+    A file's schema is fixed once opened, so when the column union grows the
+    current part is closed and a new one started; at close, parts are copied
+    row group by row group into a single file with the final schema.
+    """
+
+    def __init__(self, path, output_format):
+        self.path = path
+        self.output_format = output_format
+        self._parts = []
+        self._writer = None
+        self._schema = None
+
+    def _open(self, path, schema):
+        if self.output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(str(path), schema)
+        import pyarrow as pa
+
+        return pa.ipc.new_file(str(path), schema)
+
+    def _write(self, writer, table):
+        if self.output_format == "parquet":
+            writer.write_table(table, row_group_size=max(1, table.num_rows))
+        else:
+            writer.write_table(table, max_chunksize=max(1, table.num_rows))
+
+    def write_page(self, frames, columns):
+        import pyarrow as pa
+
+        schema = arrow_schema(columns)
+        if self._schema is None or not schema.equals(self._schema):
+            if self._writer is not None:
+                self._writer.close()
+            part = self.path.with_name(f"{self.path.name}.part{len(self._parts)}")
+            self._parts.append(part)
+            self._writer = self._open(part, schema)
+            self._schema = schema
+
+        table = pa.concat_tables([to_arrow(df, schema) for df in frames])
+        self._write(self._writer, table.combine_chunks())
+
+    @property
+    def written(self):
+        return bool(self._parts)
+
+    def _read_parts(self):
+        """Yield each page (row group / record batch) of every part, in order."""
+        import pyarrow as pa
+
+        for part in self._parts:
+            if self.output_format == "parquet":
+                import pyarrow.parquet as pq
+
+                parquet_file = pq.ParquetFile(str(part))
+                for i in range(parquet_file.num_row_groups):
+                    yield parquet_file.read_row_group(i)
+            else:
+                with pa.ipc.open_file(str(part)) as reader:
+                    for i in range(reader.num_record_batches):
+                        yield pa.Table.from_batches([reader.get_batch(i)])
+
+    def finish(self, columns):
+        import pyarrow as pa
+
+        self._writer.close()
+        self._writer = None
+
+        if len(self._parts) == 1:
+            os.replace(self._parts[0], self.path)
+            return
+
+        schema = arrow_schema(columns)
+        with self._open(self.path, schema) as writer:
+            for table in self._read_parts():
+                missing = {name for name in schema.names if name not in table.column_names}
+                for name in missing:
+                    table = table.append_column(
+                        schema.field(name), pa.nulls(table.num_rows, schema.field(name).type)
+                    )
+                self._write(writer, table.select(schema.names))
+        for part in self._parts:
+            part.unlink()
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for part in self._parts:
+            part.unlink(missing_ok=True)
+
+
+class MergeWriter:
+    """
+    Append tables to the merged output in page order.
+
+    Args:
+        path: Merged output file
+        page_order: Pages in the order they must appear; pages added out of
+            order are buffered until all earlier pages have been added
+        column_names: Callable ``df -> list of names`` applied to each table
+            before merging (default: ``underscore_columns``)
+        output_format: 'csv', 'parquet' or 'arrow'
+    """
+
+    def __init__(self, path, page_order, column_names=underscore_columns, output_format="csv"):
+        self.path = Path(path)
+        self.rows = 0
+        self.columns = []
+        self._order = list(page_order)
+        self._position = 0
+        self._pending = {}
+        self._column_names = column_names
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        if output_format == "csv":
+            self._sink = _CsvSink(self._tmp_path)
+        else:
+            self._sink = _ArrowSink(self._tmp_path, output_format)
+
+    def add_page(self, page, tables):
+        """
+        Add the tables of one page (possibly none).
+
+        Args:
+            page: Page number as used in `page_order`
+            tables: DataFrames, or table file paths read only when the page is written
+        """
+        self._pending[page] = list(tables)
+        while self._position < len(self._order) and self._order[self._position] in self._pending:
+            self._write_page(self._pending.pop(self._order[self._position]))
+            self._position += 1
+
+    def _write_page(self, tables):
+        frames = []
+        for table in tables:
+            df = table if isinstance(table, pd.DataFrame) else read_table(table)
+            names = self._column_names(df.set_axis(csv_column_names(df.columns), axis=1))
+            known = set(self.columns)
+            self.columns.extend(name for name in names if name not in known)
+            frames.append(df.set_axis(names, axis=1))
+
+        if not frames:
+            return
+        frames = [df.reindex(columns=self.columns) for df in frames]
+        self._sink.write_page(frames, list(self.columns))
+        self.rows += sum(len(df) for df in frames)
+
+    def close(self):
+        """
+        Flush buffered pages and move the merged file into place.
+
+        Returns:
+            Shape (rows, columns) of the merged table, or None if nothing was written
+        """
+        for page in self._order[self._position:] + sorted(set(self._pending) - set(self._order)):
+            if page in self._pending:
+                self._write_page(self._pending.pop(page))
+        self._position = len(self._order)
+
+        if not self._sink.written:
+            return None
+        self._sink.finish(self.columns)
+        os.replace(self._tmp_path, self.path)
+
+        logger.info(f"Merged all tables into: {self.path} ({(self.rows, len(self.columns))})")
+        return self.rows, len(self.columns)
+
+    def abort(self):
+        """Discard the partial merged file."""
+        self._sink.abort()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,145 @@
+"""
+Table output formats: CSV (default), Parquet and Arrow IPC.
+
+CSV files are written as before (UTF-8 with BOM, pandas defaults). Columnar
+formats need pyarrow and store the ``page`` column as int64 and every other
+column as string, so per-page files and the merged file share one schema
+whatever the engine returned.
+"""
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ["csv", "parquet", "arrow"]
+
+OUTPUT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Parquet/Arrow output requires pyarrow. Install with: pip install 'alice-pdf[parquet]'"
+        )
+    return pyarrow
+
+
+def check_output_format(output_format):
+    """
+    Fail fast if `output_format` cannot be written in this environment.
+
+    Raises:
+        ImportError: Parquet/Arrow requested without pyarrow installed
+    """
+    if output_format != "csv":
+        _import_pyarrow()
+
+
+def csv_column_names(columns):
+    """
+    Column names as ``pd.read_csv`` would return them after a CSV round trip.
+
+    Blank names become "Unnamed: {position}" and duplicates get ".1", ".2", ...
+    Columnar formats require unique string names, and using the CSV names
+    keeps headers identical across output formats.
+    """
+    seen = {}
+    unique = []
+    for position, col in enumerate(columns):
+        col = str(col)
+        if not col:
+            col = f"Unnamed: {position}"
+        name = col
+        while name in seen:
+            seen[col] += 1
+            name = f"{col}.{seen[col]}"
+        seen.setdefault(name, 0)
+        unique.append(name)
+    return unique
+
+
+def arrow_schema(columns):
+    """Arrow schema for table columns: int64 ``page``, strings elsewhere."""
+    pa = _import_pyarrow()
+    return pa.schema(
+        [pa.field(name, pa.int64() if name == "page" else pa.string()) for name in columns]
+    )
+
+
+def to_arrow(df, schema=None):
+    """
+    Convert a table to a pyarrow Table with the columnar output schema.
+
+    Args:
+        df: DataFrame (column names must already be unique)
+        schema: Target schema; columns missing from `df` are filled with nulls
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = _import_pyarrow()
+    if schema is None:
+        schema = arrow_schema([str(col) for col in df.columns])
+
+    arrays = []
+    for field in schema:
+        if field.name not in df.columns:
+            arrays.append(pa.nulls(len(df), type=field.type))
+            continue
+        column = df[field.name]
+        if field.name == "page":
+            arrays.append(pa.array(column, type=pa.int64()))
+        else:
+            # OCR replies may mix numbers and text in one column
+            arrays.append(pa.array(column.astype("string"), type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_table(df, path, output_format="csv"):
+    """Write one extracted table to `path` in `output_format`."""
+    if output_format == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return
+
+    df = df.set_axis(csv_column_names(df.columns), axis=1)
+    table = to_arrow(df)
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    elif output_format == "arrow":
+        pa = _import_pyarrow()
+
+        with pa.ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+
+def read_table(path):
+    """
+    Read a table written by `write_table`; the format is taken from the suffix.
+
+    CSV cells are read as text with no NA conversion, so "007" or "1" are
+    written back unchanged when a resumed page is merged again.
+    """
+    path = Path(path)
+    if path.suffix == ".csv":
+        return pd.read_csv(path, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".arrow":
+        pa = _import_pyarrow()
+
+        with pa.ipc.open_file(str(path)) as reader:
+            return reader.read_pandas()
+    raise ValueError(f"Unknown table file type: {path}")
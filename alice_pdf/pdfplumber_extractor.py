@@ -5,12 +5,98 @@ pdfplumber provides robust text extraction from both native and scanned PDFs.
 """
 
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import re
 
+from .manifest import ResumeManifest
+from .merge import MergeWriter
+from .output import OUTPUT_EXTENSIONS, write_table
+from .utils import non_empty_mask
+
 logger = logging.getLogger(__name__)
 
+# Table-finding strategies, tried in this order until one finds tables
+TABLE_STRATEGIES = ("lines", "text", "default")
+
+_TOLERANCES = {
+    "text_tolerance": 3,
+    "vertical_tolerance": 3,
+    "horizontal_tolerance": 3,
+    "intersection_tolerance": 3,
+}
+
+
+def _table_settings(strategy, ruling_lines=()):
+    """
+    Return pdfplumber ``table_settings`` for a strategy.
+
+    Args:
+        strategy: One of TABLE_STRATEGIES
+        ruling_lines: Page curves and edges, used as explicit lines by "lines"
+
+    Returns:
+        Settings dict, or None for pdfplumber's defaults ("default")
+    """
+    if strategy == "lines":
+        return {
+            "vertical_strategy": "lines",
+            "horizontal_strategy": "lines",
+            "explicit_vertical_lines": ruling_lines,
+            "explicit_horizontal_lines": ruling_lines,
+            **_TOLERANCES,
+        }
+    if strategy == "text":
+        return {"vertical_strategy": "text", "horizontal_strategy": "text", **_TOLERANCES}
+    return None
+
+
+def _usable_strategies():
+    """
+    Return the strategies whose settings the installed pdfplumber accepts.
+
+    Settings are validated once per run: a strategy rejected here would fail
+    on every page, so it is dropped instead of being retried page after page.
+    """
+    import pdfplumber
+    from pdfplumber.table import TableSettings
+
+    usable = []
+    for strategy in TABLE_STRATEGIES:
+        try:
+            TableSettings.resolve(_table_settings(strategy, []))
+        except (TypeError, ValueError) as e:
+            logger.info(
+                f"Table strategy '{strategy}' disabled: not supported by pdfplumber {pdfplumber.__version__} ({e})"
+            )
+            continue
+        usable.append(strategy)
+    return usable
+
+
+def _find_tables(page, strategies):
+    """
+    Run `strategies` in order on `page` and return the first non-empty result.
+
+    Page curves and edges are computed at most once per page.
+    """
+    ruling_lines = None
+    for strategy in strategies:
+        try:
+            if strategy == "lines" and ruling_lines is None:
+                ruling_lines = page.curves + page.edges
+            tables = page.extract_tables(table_settings=_table_settings(strategy, ruling_lines))
+        except Exception as e:
+            logger.debug(f"  {strategy.capitalize()} strategy failed: {e}")
+            tables = []
+        if tables:
+            return tables
+    return []
+
+
 def distribute_id_cespite_values(df, id_cespite_col="Id. Cespite"):
     """
     Distribute multi-line Id. Cespite values across rows.
@@ -18,47 +104,251 @@ def distribute_id_cespite_values(df, id_cespite_col="Id. Cespite"):
     If a cell contains multiple numeric values like:
     "24\n24\n24\n24\n24\n24\n24\n24\n26\n27\n28\n29\n29\n29\n29\n29\n29\n29\n29\n29\n31\n31\n32\n33"
 
-    This function distributes them so each row gets the appropriate value.
+    This function distributes them so each row gets the appropriate value:
+    the numeric lines of all multi-line cells are concatenated and the k-th
+    multi-line row gets the k-th value (the last one once they run out).
+
+    Returns `df` itself when there is nothing to distribute, a fixed copy
+    otherwise.
     """
     if df.empty or id_cespite_col not in df.columns:
-        return df.copy()
+        return df
 
-    df_fixed = df.copy()
+    if df.columns.get_indexer_for([id_cespite_col]).size > 1:
+        # Ambiguous target column: refused, as the row-by-row version always did
+        raise ValueError(f"Duplicate '{id_cespite_col}' columns")
 
     # Find all rows that need processing (contain multi-line Id. Cespite)
-    rows_to_process = []
-    for idx, row in df.iterrows():
-        id_cell = row[id_cespite_col]
-
-        if pd.notna(id_cell) and '\n' in str(id_cell):
-            rows_to_process.append(idx)
+    values = df[id_cespite_col].to_numpy(dtype=object)
+    present = pd.notna(values)
+    text = np.where(present, values, "").astype(str)
+    rows_to_process = np.flatnonzero(present & (np.strings.find(text, "\n") >= 0))
 
-    if not rows_to_process:
+    if not len(rows_to_process):
         return df  # No processing needed
 
     # Collect all Id. Cespite values
-    all_id_values = []
-    for idx in rows_to_process:
-        id_cell = df.iloc[idx][id_cespite_col]
-        lines = [line.strip() for line in str(id_cell).split('\n') if line.strip().isdigit()]
-        all_id_values.extend(lines)
+    all_id_values = [
+        line.strip()
+        for cell in text[rows_to_process]
+        for line in cell.split("\n")
+        if line.strip().isdigit()
+    ]
 
     logger.info(f"Found {len(all_id_values)} Id. Cespite values to distribute across {len(rows_to_process)} rows")
 
-    # Distribute values to target rows
-    for i, row_idx in enumerate(rows_to_process):
-        if i < len(all_id_values):
-            df_fixed.loc[row_idx, id_cespite_col] = all_id_values[i]
-            logger.debug(f"  Row {row_idx + 1}: assigned Id. Cespite value '{all_id_values[i]}'")
-        else:
-            # If we run out of values, use the last one
-            df_fixed.loc[row_idx, id_cespite_col] = all_id_values[-1]
-            logger.debug(f"  Row {row_idx + 1}: assigned last Id. Cespite value '{all_id_values[-1]}'")
-
-    logger.info(f"Distributed Id. Cespite values: {df_fixed[id_cespite_col].tolist()}")
+    # k-th target row takes the k-th value; if we run out of values, use the last one
+    if not all_id_values:
+        raise IndexError("no numeric Id. Cespite values to distribute")
+    picks = np.minimum(np.arange(len(rows_to_process)), len(all_id_values) - 1)
+
+    df_fixed = df.copy()
+    df_fixed.iloc[rows_to_process, df.columns.get_loc(id_cespite_col)] = np.array(all_id_values, dtype=object)[picks]
+
+    logger.debug(f"Distributed Id. Cespite values: {df_fixed[id_cespite_col].tolist()}")
     return df_fixed
 
 
+def _strip_cells(df):
+    """Strip whitespace from the string cells of `df`, column by column."""
+    df = df.copy(deep=False)
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        try:
+            stripped = column.str.strip()
+        except AttributeError:
+            continue  # no string cells in this column
+        # Non-string cells come back as missing: keep their original value
+        df.isetitem(i, stripped.mask(stripped.isna(), column))
+    return df
+
+
+def _table_to_dataframe(table_data, page_num, strip_text):
+    """
+    Build the DataFrame of one extracted table.
+
+    The first row becomes the header when it has at least 80% of the
+    average number of non-empty cells per row; otherwise columns are named
+    col_0, col_1, ... A "page" column is prepended and the Id. Cespite fix
+    applied.
+
+    Returns:
+        DataFrame, or None for an empty table
+    """
+    df = pd.DataFrame(table_data)
+    if df.empty:
+        return None
+
+    # Detect if first row is likely a header
+    # Same test as ``cell and str(cell).strip()``: NaN counts as text
+    non_empty_per_row = non_empty_mask(df.to_numpy(dtype=object), nan_is_empty=False).sum(axis=1)
+    first_row_non_empty = non_empty_per_row[0]
+    avg_non_empty = non_empty_per_row.mean()
+
+    if first_row_non_empty >= avg_non_empty * 0.8 and first_row_non_empty > 0:
+        # Use first row as headers
+        headers = df.iloc[0].fillna('').astype(str)
+        if strip_text:
+            headers = headers.str.strip()
+        df = df[1:].reset_index(drop=True)
+        df.columns = headers
+    else:
+        # Generate default column names
+        num_cols = len(df.columns)
+        df.columns = [f"col_{i}" for i in range(num_cols)]
+
+    # Clean data
+    if strip_text:
+        df = _strip_cells(df)
+
+    # Add page column
+    df.insert(0, "page", page_num)
+
+    # Apply post-processing fix for Id. Cespite column if needed
+    df_fixed = distribute_id_cespite_values(df, "Id. Cespite")
+    if df_fixed is not df:
+        logger.info(f"  Applied Id. Cespite distribution fix for {len(df_fixed)} rows")
+
+    return df_fixed
+
+def _extract_page(page, page_num, strategies, min_rows, min_cols, strip_text):
+    """
+    Find and clean the tables of one pdfplumber page.
+
+    The page's object cache is released before returning, so memory does not
+    grow with the number of pages processed.
+
+    Args:
+        page: pdfplumber Page
+        page_num: 1-based page number (for the "page" column and logs)
+        strategies: Table strategies to try, in order (see _usable_strategies)
+        min_rows, min_cols, strip_text: See extract_tables_with_pdfplumber
+
+    Returns:
+        List of (table_idx, DataFrame) for the tables kept
+    """
+    try:
+        tables = _find_tables(page, strategies)
+    finally:
+        page.close()
+
+    if not tables:
+        logger.info(f"  No tables found on page {page_num}")
+        return []
+
+    logger.info(f"  Found {len(tables)} table(s) on page {page_num}")
+
+    # Process each table
+    page_tables = []
+    for table_idx, table_data in enumerate(tables):
+        # Filter out empty tables that don't meet minimum requirements
+        if (len(table_data) < min_rows or
+            (len(table_data) > 0 and len(table_data[0]) < min_cols)):
+            logger.info(f"  Table {table_idx}: too small ({len(table_data)}x{len(table_data[0]) if table_data else 0}), skipping")
+            continue
+
+        # Convert to DataFrame
+        try:
+            df = _table_to_dataframe(table_data, page_num, strip_text)
+            if df is not None:
+                logger.info(f"  Table {table_idx}: {df.shape}")
+                page_tables.append((table_idx, df))
+
+        except Exception as e:
+            logger.warning(f"  Failed to process table {table_idx}: {e}")
+            continue
+
+    return page_tables
+
+
+# Per-process state of the worker pool (set by _init_worker)
+_worker_pdf = None
+_worker_strategies = None
+
+
+def _init_worker(pdf_path, strategies):
+    """Open the PDF once in a worker process."""
+    global _worker_pdf, _worker_strategies
+    import pdfplumber
+
+    _worker_pdf = pdfplumber.open(pdf_path)
+    _worker_strategies = strategies
+
+
+def _extract_page_in_worker(page_num, min_rows, min_cols, strip_text):
+    """`_extract_page` on the worker's own document, plus its duration in seconds."""
+    started = time.monotonic()
+    page_tables = _extract_page(
+        _worker_pdf.pages[page_num - 1], page_num, _worker_strategies, min_rows, min_cols, strip_text
+    )
+    return page_tables, time.monotonic() - started
+
+
+def _iter_pages(pdf, pdf_path, page_nums, strategies, options, workers=1):
+    """
+    Extract pages in this process or in a process pool.
+
+    Args:
+        pdf: Open pdfplumber document (used by the serial path)
+        pdf_path: Path to PDF file, opened once by each worker process
+        page_nums: 1-based page numbers to extract
+        strategies: Table strategies (see _usable_strategies)
+        options: Tuple (min_rows, min_cols, strip_text)
+        workers: Number of worker processes
+
+    Yields:
+        Tuples (page_num, page_tables, seconds, error), error being None or the
+        exception raised for the page; with several workers, in completion
+        order, with at most 2 x workers pages submitted ahead
+    """
+    if workers <= 1 or len(page_nums) <= 1:
+        for idx, page_num in enumerate(page_nums, start=1):
+            logger.info(f"Processing page {page_num} ({idx}/{len(page_nums)})")
+            started = time.monotonic()
+            try:
+                page_tables = _extract_page(pdf.pages[page_num - 1], page_num, strategies, *options)
+            except Exception as e:
+                yield page_num, None, time.monotonic() - started, e
+                continue
+            yield page_num, page_tables, time.monotonic() - started, None
+        return
+
+    remaining = iter(page_nums)
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(page_nums)),
+        initializer=_init_worker,
+        initargs=(str(pdf_path), strategies),
+    ) as executor:
+        in_flight = {}
+
+        def submit_next():
+            page_num = next(remaining, None)
+            if page_num is not None:
+                in_flight[executor.submit(_extract_page_in_worker, page_num, *options)] = page_num
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        try:
+            done_count = 0
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_num = in_flight.pop(future)
+                    submit_next()
+                    done_count += 1
+                    logger.info(f"Page {page_num} extracted ({done_count}/{len(page_nums)})")
+                    try:
+                        page_tables, seconds = future.result()
+                    except Exception as e:
+                        yield page_num, None, 0.0, e
+                        continue
+                    yield page_num, page_tables, seconds, None
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
 def natural_sort_key(path):
     """
     Generate a key for natural sorting of file paths.
@@ -80,19 +370,29 @@ def extract_tables_with_pdfplumber(
     min_rows=1,
     min_cols=1,
     strip_text=True,
+    output_format="csv",
+    workers=1,
 ):
     """
     Extract tables from PDF using pdfplumber.
 
+    With `workers` > 1, pages are extracted in a process pool where each
+    worker opens the PDF once; tables are sent back to this process, which
+    writes files, manifest and merged output, so results are the same as in
+    the serial path.
+
     Args:
         pdf_path: Path to PDF file
         output_dir: Output directory for CSV files
         pages: Pages to process ('all', '1', '1-3', '1,3,5')
         merge_output: If True, merge all tables into single CSV
-        resume: If True, skip pages that already have output files
+        resume: If True, skip pages recorded as done in the resume manifest
         min_rows: Minimum number of rows for a table to be extracted
         min_cols: Minimum number of columns for a table to be extracted
         strip_text: Whether to strip whitespace from extracted text
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
+        workers: Number of processes extracting pages in parallel
 
     Returns:
         Number of tables extracted
@@ -109,10 +409,11 @@ def extract_tables_with_pdfplumber(
     output_dir = Path(output_dir)
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
 
     # Delete merged file if exists
     if merge_output:
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
         if merged_file.exists():
             merged_file.unlink()
             logger.info(f"Deleted previous merged file: {merged_file.name}")
@@ -120,9 +421,12 @@ def extract_tables_with_pdfplumber(
     logger.info(f"Processing PDF: {pdf_path}")
     logger.info(f"Pages: {pages}, Min rows: {min_rows}, Min cols: {min_cols}")
 
-    all_dataframes = []
+    # Per-page resume state; partial pages of an interrupted run are discarded
+    manifest = ResumeManifest(output_dir, pdf_path.stem)
+
     table_count = 0
     failed_pages = []
+    merger = None
 
     try:
         with pdfplumber.open(pdf_path) as pdf:
@@ -141,156 +445,90 @@ def extract_tables_with_pdfplumber(
                         page_list.append(int(part) - 1)
 
             logger.info(f"Processing {len(page_list)} pages from: {pdf_path}")
-
-            # Process each page
+            if not resume:
+                manifest.forget([page_num + 1 for page_num in page_list])
+            strategies = _usable_strategies()
+
+            # Merged output is streamed in page order while pages complete
+            if merge_output:
+                merger = MergeWriter(
+                    output_dir / f"{pdf_path.stem}_merged{ext}",
+                    sorted({page_num + 1 for page_num in page_list if page_num < total_pages}),
+                    output_format=output_format,
+                )
+
+            # Resolve resume state up front so finished pages are never extracted again
+            pending = []
+            queued = set()
             for idx, page_num in enumerate(page_list, start=1):
                 if page_num >= total_pages:
                     logger.warning(f"Page {page_num + 1} out of range, skipping")
                     continue
 
                 # Check if page already processed (resume mode)
-                if resume:
-                    existing_files = sorted(
-                        list(output_dir.glob(f"{pdf_path.stem}_page{page_num + 1}_table*.csv")),
-                        key=natural_sort_key
+                if manifest.is_done(page_num + 1):
+                    logger.info(
+                        f"Page {page_num + 1} ({idx}/{len(page_list)}) - already processed, skipping"
                     )
-                    if existing_files:
-                        logger.info(
-                            f"Page {page_num + 1} ({idx}/{len(page_list)}) - already processed, skipping"
-                        )
-                        if merge_output:
-                            for csv_file in existing_files:
-                                df = pd.read_csv(csv_file, encoding="utf-8-sig")
-                                all_dataframes.append(df)
-                        table_count += len(existing_files)
-                        continue
+                    if merger is not None:
+                        merger.add_page(page_num + 1, manifest.page_files(page_num + 1))
+                    table_count += manifest.table_count(page_num + 1)
+                    continue
 
-                logger.info(f"Processing page {page_num + 1} ({idx}/{len(page_list)})")
+                if page_num + 1 not in queued:
+                    queued.add(page_num + 1)
+                    pending.append(page_num + 1)
 
-                try:
-                    page = pdf.pages[page_num]
+            if workers > 1:
+                logger.info(f"Extracting {len(pending)} pages with {workers} worker processes")
 
-                    # Extract tables using pdfplumber's table finder
+            page_results = _iter_pages(
+                pdf, pdf_path, pending, strategies, (min_rows, min_cols, strip_text), workers=workers
+            )
+            for page_num, page_tables, seconds, error in page_results:
+                if error is None:
                     try:
-                        tables = page.extract_tables(
-                            table_settings={
-                                "vertical_strategy": "lines",
-                                "horizontal_strategy": "lines",
-                                "explicit_vertical_lines": page.curves + page.edges,
-                                "explicit_horizontal_lines": page.curves + page.edges,
-                                "text_tolerance": 3,
-                                "vertical_tolerance": 3,
-                                "horizontal_tolerance": 3,
-                                "intersection_tolerance": 3,
-                            }
+                        started = time.monotonic()
+                        page_tables = [
+                            (output_dir / f"{pdf_path.stem}_page{page_num}_table{table_idx}{ext}", df_fixed)
+                            for table_idx, df_fixed in page_tables
+                        ]
+
+                        # Write the page's tables, then record the page as done
+                        output_files = [output_file for output_file, _ in page_tables]
+                        manifest.begin_page(page_num, output_files)
+
+                        for output_file, df_fixed in page_tables:
+                            # Save individual table file
+                            write_table(df_fixed, output_file, output_format)
+                            logger.info(f"    Saved: {output_file}")
+
+                            table_count += 1
+
+                        manifest.finish_page(
+                            page_num, output_files, seconds=seconds + time.monotonic() - started
                         )
-                    except Exception as e:
-                        logger.debug(f"  Lines strategy failed: {e}")
-                        tables = []
-
-                    if not tables:
-                        try:
-                            # Try with whitespace strategy if no lines found
-                            tables = page.extract_tables(
-                                table_settings={
-                                    "vertical_strategy": "text",
-                                    "horizontal_strategy": "text",
-                                    "text_tolerance": 3,
-                                    "vertical_tolerance": 3,
-                                    "horizontal_tolerance": 3,
-                                    "intersection_tolerance": 3,
-                                }
-                            )
-                        except Exception as e:
-                            logger.debug(f"  Text strategy failed: {e}")
-                            tables = []
-
-                    if not tables:
-                        # Try with basic extraction
-                        try:
-                            tables = page.extract_tables()
-                        except Exception as e:
-                            logger.debug(f"  Basic extraction failed: {e}")
-                            tables = []
-
-                    if not tables:
-                        logger.info(f"  No tables found on page {page_num + 1}")
+                        if merger is not None:
+                            merger.add_page(page_num, [df_fixed for _, df_fixed in page_tables])
                         continue
 
-                    logger.info(f"  Found {len(tables)} table(s) on page {page_num + 1}")
-
-                    # Process each table
-                    for table_idx, table_data in enumerate(tables):
-                        # Filter out empty tables that don't meet minimum requirements
-                        if (len(table_data) < min_rows or
-                            (len(table_data) > 0 and len(table_data[0]) < min_cols)):
-                            logger.info(f"  Table {table_idx}: too small ({len(table_data)}x{len(table_data[0]) if table_data else 0}), skipping")
-                            continue
-
-                        # Convert to DataFrame
-                        try:
-                            # Use first row as header if it looks like headers
-                            # Check if first row has more non-empty cells than other rows
-                            df = pd.DataFrame(table_data)
-
-                            if not df.empty:
-                                # Detect if first row is likely a header
-                                first_row_non_empty = sum(1 for cell in df.iloc[0] if cell and str(cell).strip())
-                                avg_non_empty = df.apply(lambda row: sum(1 for cell in row if cell and str(cell).strip()), axis=1).mean()
-
-                                if first_row_non_empty >= avg_non_empty * 0.8 and first_row_non_empty > 0:
-                                    # Use first row as headers
-                                    headers = df.iloc[0].fillna('').astype(str)
-                                    if strip_text:
-                                        headers = headers.str.strip()
-                                    df = df[1:].reset_index(drop=True)
-                                    df.columns = headers
-                                else:
-                                    # Generate default column names
-                                    num_cols = len(df.columns)
-                                    df.columns = [f"col_{i}" for i in range(num_cols)]
-
-                                # Clean data
-                                if strip_text:
-                                    df = df.map(lambda x: x.strip() if isinstance(x, str) and x else x)
-
-                                # Add page column
-                                df.insert(0, "page", page_num + 1)
-
-                                logger.info(f"  Table {table_idx}: {df.shape}")
-
-                                # Apply post-processing fix for Id. Cespite column if needed
-                                df_fixed = distribute_id_cespite_values(df, "Id. Cespite")
-
-                                if not df_fixed.equals(df):
-                                    logger.info(f"  Applied Id. Cespite distribution fix for {len(df_fixed)} rows")
-
-                                # Save individual CSV
-                                output_file = (
-                                    output_dir / f"{pdf_path.stem}_page{page_num + 1}_table{table_idx}.csv"
-                                )
-                                df_fixed.to_csv(output_file, index=False, encoding="utf-8-sig")
-                                logger.info(f"    Saved: {output_file}")
-
-                                if merge_output:
-                                    all_dataframes.append(df_fixed)
-
-                                table_count += 1
-
-                        except Exception as e:
-                            logger.warning(f"  Failed to process table {table_idx}: {e}")
-                            continue
-
-                except Exception as e:
-                    logger.error(f"  Failed to process page {page_num + 1}: {e}")
-                    failed_pages.append(page_num + 1)
-                    continue
+                    except Exception as e:
+                        error = e
+
+                logger.error(f"  Failed to process page {page_num}: {error}")
+                failed_pages.append(page_num)
+                if merger is not None:
+                    merger.add_page(page_num, [])
 
     except Exception as e:
         logger.error(f"pdfplumber extraction failed: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        if merger is not None:
+            merger.abort()
         raise
+    finally:
+        manifest.close()
 
     # Log statistics
     successful_pages = len(page_list) - len(failed_pages)
@@ -298,29 +536,8 @@ def extract_tables_with_pdfplumber(
     if failed_pages:
         logger.warning(f"Failed pages: {', '.join(map(str, failed_pages))}")
 
-    # Merge all tables if requested
-    if merge_output and all_dataframes:
-        # Standardize column names before merge to handle variations
-        for df in all_dataframes:
-            df.columns = df.columns.str.replace(" ", "_")
-
-        # Sort dataframes by page number using natural sort
-        # Load all CSVs with natural sorting
-        all_csv_files = sorted(
-            list(output_dir.glob(f"{pdf_path.stem}_page*.csv")),
-            key=natural_sort_key
-        )
-
-        sorted_dataframes = []
-        for csv_file in all_csv_files:
-            df = pd.read_csv(csv_file, encoding="utf-8-sig")
-            df.columns = df.columns.str.replace(" ", "_")
-            sorted_dataframes.append(df)
-
-        merged_df = pd.concat(sorted_dataframes, ignore_index=True)
-
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
-        merged_df.to_csv(merged_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Merged all tables into: {merged_file} ({merged_df.shape})")
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
 
     return table_count
\ No newline at end of file
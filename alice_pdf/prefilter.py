@@ -0,0 +1,218 @@
+"""
+Cheap local pre-classification of pages before paying for OCR.
+
+Scores each page's table likelihood (0-1) with PyMuPDF in milliseconds:
+
+- Native pages: ruling lines from the vector drawings, and cell starts
+  (words after a wide gap) lining up in several columns across several
+  text lines.
+- Image-only (scanned) pages: a low-resolution grayscale thumbnail is checked
+  for ink (blank separators score 0) and for long horizontal/vertical rules.
+  Scanned pages with ink but no rules get a neutral score, since borderless
+  tables cannot be told apart from prose without OCR.
+"""
+
+import logging
+
+import fitz  # PyMuPDF
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Score given to non-blank scanned pages without visible rules
+UNKNOWN_SCORE = 0.5
+
+# Thumbnail resolution for image-only pages
+THUMBNAIL_DPI = 36
+
+
+def _count_drawn_rules(page):
+    """Count horizontal and vertical rule segments in the page's vector drawings."""
+    horizontal = 0
+    vertical = 0
+    for path in page.get_drawings():
+        for item in path.get("items", []):
+            kind = item[0]
+            if kind == "l":
+                p1, p2 = item[1], item[2]
+                dx, dy = abs(p2.x - p1.x), abs(p2.y - p1.y)
+                if dy < 1 and dx > 20:
+                    horizontal += 1
+                elif dx < 1 and dy > 10:
+                    vertical += 1
+            elif kind == "re":
+                rect = item[1]
+                if rect.height < 2 and rect.width > 20:
+                    horizontal += 1
+                elif rect.width < 2 and rect.height > 10:
+                    vertical += 1
+                elif rect.width > 20 and rect.height > 10:
+                    # Stroked cell/box outline
+                    horizontal += 2
+                    vertical += 2
+    return horizontal, vertical
+
+
+def _aligned_columns(words, bucket=4.0, min_lines=3, min_gap=8.0):
+    """
+    Count x positions where cells start on at least `min_lines` distinct text lines.
+
+    A cell start is the first word of a visual line or a word preceded by a
+    gap wider than `min_gap` points. Prose only has its left margin as an
+    anchor (word spacing stays small); tables have one anchor per column.
+    """
+    if not words:
+        return 0
+
+    arr = np.array([(w[0], w[1], w[2], w[3]) for w in words], dtype=float)
+    y_line = np.round(arr[:, 3] / 3.0).astype(np.int64)  # baseline bucket
+
+    # Sort by visual line, then left edge
+    order = np.lexsort((arr[:, 0], y_line))
+    x0 = arr[order, 0]
+    x1 = arr[order, 2]
+    y_line = y_line[order]
+
+    new_line = np.ones(len(x0), dtype=bool)
+    new_line[1:] = y_line[1:] != y_line[:-1]
+    gap = np.full(len(x0), np.inf)
+    gap[1:] = x0[1:] - x1[:-1]
+    starts = new_line | (gap > min_gap)
+
+    x_bucket = np.round(x0[starts] / bucket).astype(np.int64)
+    pairs = np.unique(np.stack([x_bucket, y_line[starts]], axis=1), axis=0)
+    _, lines_per_bucket = np.unique(pairs[:, 0], return_counts=True)
+    return int((lines_per_bucket >= min_lines).sum())
+
+
+def _thumbnail_rules(page):
+    """
+    Inspect a grayscale thumbnail of an image-only page.
+
+    Returns:
+        Tuple (ink ratio, horizontal rule count, vertical rule count)
+    """
+    mat = fitz.Matrix(THUMBNAIL_DPI / 72, THUMBNAIL_DPI / 72)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY)
+    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, : pix.width]
+    dark = arr < 128
+
+    ink = float(dark.mean()) if dark.size else 0.0
+
+    def runs(mask):
+        # Number of contiguous True runs (adjacent rows/cols form one rule)
+        if not mask.any():
+            return 0
+        return int(np.count_nonzero(np.diff(mask.astype(np.int8)) == 1) + mask[0])
+
+    horizontal = runs(dark.mean(axis=1) > 0.3)
+    vertical = runs(dark.mean(axis=0) > 0.2)
+    return ink, horizontal, vertical
+
+
+def score_page(page):
+    """
+    Score how likely a page is to contain a table.
+
+    Args:
+        page: PyMuPDF page
+
+    Returns:
+        Tuple (score between 0 and 1, short reason string)
+    """
+    words = page.get_text("words")
+
+    if words:
+        horizontal, vertical = _count_drawn_rules(page)
+        rule_score = min(1.0, (horizontal + vertical) / 10)
+        columns = _aligned_columns(words)
+        align_score = min(1.0, max(0, columns - 1) / 3)
+        score = max(rule_score, align_score)
+        return score, f"text: {horizontal}h/{vertical}v rules, {columns} aligned columns"
+
+    ink, horizontal, vertical = _thumbnail_rules(page)
+    if ink < 0.002:
+        return 0.0, "blank"
+    rule_score = min(1.0, (horizontal + vertical) / 10)
+    if rule_score == 0:
+        return UNKNOWN_SCORE, f"image: {ink:.1%} ink, no rules"
+    return max(rule_score, UNKNOWN_SCORE), f"image: {horizontal}h/{vertical}v rules"
+
+
+def prefilter_pages(pdf_path, page_nums, threshold=0.3):
+    """
+    Split pages into likely-table and unlikely-table groups.
+
+    Args:
+        pdf_path: Path to PDF file
+        page_nums: Page numbers (0-based) to classify
+        threshold: Pages scoring below this are considered table-free
+
+    Returns:
+        Tuple (kept page numbers, low-scoring page numbers), both in input order
+    """
+    kept = []
+    low = []
+
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_nums:
+            try:
+                score, reason = score_page(doc[page_num])
+            except Exception as e:
+                # Never lose a page because the heuristic failed
+                logger.debug(f"  Page {page_num + 1}: pre-filter failed ({e}), keeping")
+                kept.append(page_num)
+                continue
+
+            logger.debug(f"  Page {page_num + 1}: table score {score:.2f} ({reason})")
+            if score < threshold:
+                low.append(page_num)
+            else:
+                kept.append(page_num)
+    finally:
+        doc.close()
+
+    return kept, low
+
+
+PREFILTER_MODES = ["skip", "defer"]
+
+
+def apply_prefilter(pdf_path, pending, mode="skip", threshold=0.3):
+    """
+    Apply the pre-filter to a list of pages waiting for OCR and log a report.
+
+    Args:
+        pdf_path: Path to PDF file
+        pending: List of (idx, page_num) tuples in processing order
+        mode: 'skip' drops low-scoring pages, 'defer' moves them to the end
+        threshold: Minimum table score for a page to be processed first
+
+    Returns:
+        New list of (idx, page_num) tuples
+    """
+    if mode not in PREFILTER_MODES:
+        raise ValueError(f"Unknown prefilter mode: {mode}")
+
+    kept, low = prefilter_pages(pdf_path, [page_num for _, page_num in pending], threshold)
+    low_set = set(low)
+
+    if not low:
+        logger.info(f"Pre-filter: all {len(pending)} pages look like tables (threshold {threshold})")
+        return pending
+
+    pages_str = ", ".join(str(page_num + 1) for page_num in low)
+    if mode == "skip":
+        logger.info(
+            f"Pre-filter: skipping {len(low)}/{len(pending)} pages without tables "
+            f"({len(low)} API calls avoided): {pages_str}"
+        )
+        return [item for item in pending if item[1] not in low_set]
+
+    logger.info(
+        f"Pre-filter: deferring {len(low)}/{len(pending)} low-scoring pages to the end: {pages_str}"
+    )
+    return [item for item in pending if item[1] not in low_set] + [
+        item for item in pending if item[1] in low_set
+    ]
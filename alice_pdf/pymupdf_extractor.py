@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Extract tables from PDF using PyMuPDF's own table finder.
+``page.find_tables()`` works on the already-parsed page, so native PDFs need
+neither Ghostscript/OpenCV (Camelot) nor a pure-Python layout pass (pdfplumber).
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from .manifest import ResumeManifest
+from .merge import MergeWriter
+from .output import OUTPUT_EXTENSIONS, write_table
+from .utils import selected_pages
+
+logger = logging.getLogger(__name__)
+
+# Strategies accepted by page.find_tables(): ruling lines or word alignment
+PYMUPDF_STRATEGIES = ("lines", "text")
+
+
+def _page_tables(page, page_num, strategy):
+    """
+    Find the tables of one page.
+
+    Column names come from the header PyMuPDF detects (inside or just above
+    the table; empty or repeated names are made unique by ``to_pandas``).
+
+    Returns:
+        List of DataFrames with a leading "page" column
+    """
+    frames = []
+    for table in page.find_tables(strategy=strategy):
+        df = table.to_pandas()
+        if df.empty:
+            continue
+        df.insert(0, "page", page_num)
+        frames.append(df)
+    return frames
+
+
+def extract_tables_with_pymupdf(
+    pdf_path,
+    output_dir,
+    pages="all",
+    merge_output=False,
+    resume=True,
+    strategy="lines",
+    output_format="csv",
+):
+    """
+    Extract tables from PDF using PyMuPDF ``page.find_tables()``.
+
+    Args:
+        pdf_path: Path to PDF file
+        output_dir: Output directory for CSV files
+        pages: Pages to process ('all', '1', '1-3', '1,3,5')
+        merge_output: If True, merge all tables into single CSV
+        resume: If True, skip pages recorded as done in the resume manifest
+        strategy: 'lines' (ruled tables) or 'text' (tables aligned by whitespace)
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
+
+    Returns:
+        Number of tables extracted
+    """
+    if strategy not in PYMUPDF_STRATEGIES:
+        raise ValueError(f"strategy must be one of {', '.join(PYMUPDF_STRATEGIES)}, got {strategy!r}")
+
+    pdf_path = Path(pdf_path)
+    output_dir = Path(output_dir)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
+
+    # Delete merged file if exists
+    if merge_output:
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
+        if merged_file.exists():
+            merged_file.unlink()
+            logger.info(f"Deleted previous merged file: {merged_file.name}")
+
+    logger.info(f"Processing PDF: {pdf_path}")
+    logger.info(f"Strategy: {strategy}, Pages: {pages}")
+
+    table_count = 0
+    doc = None
+    manifest = None
+    merger = None
+
+    try:
+        doc = fitz.open(pdf_path)
+
+        page_list = []
+        for page_num in selected_pages(pages, doc.page_count):
+            if not 1 <= page_num <= doc.page_count:
+                logger.warning(f"Page {page_num} out of range, skipping")
+            elif page_num not in page_list:
+                page_list.append(page_num)
+
+        # Per-page resume state; partial pages of an interrupted run are discarded
+        manifest = ResumeManifest(output_dir, pdf_path.stem, resume=resume, pages=page_list)
+
+        # Merged output is streamed in page order while pages complete
+        if merge_output:
+            merger = MergeWriter(
+                output_dir / f"{pdf_path.stem}_merged{ext}",
+                sorted(page_list),
+                output_format=output_format,
+            )
+
+        for idx, page_num in enumerate(page_list, start=1):
+            # Check if page already processed (resume mode)
+            if manifest.is_done(page_num):
+                logger.info(f"Page {page_num} ({idx}/{len(page_list)}) - already processed, skipping")
+                if merger is not None:
+                    merger.add_page(page_num, manifest.page_files(page_num))
+                table_count += manifest.table_count(page_num)
+                continue
+
+            logger.info(f"Processing page {page_num} ({idx}/{len(page_list)})")
+            started = time.monotonic()
+
+            frames = _page_tables(doc[page_num - 1], page_num, strategy)
+            if frames:
+                logger.info(f"  Found {len(frames)} table(s) on page {page_num}")
+            else:
+                logger.info(f"  No tables found on page {page_num}")
+
+            # Tables are numbered per page in order of appearance
+            output_files = [
+                output_dir / f"{pdf_path.stem}_page{page_num}_table{k}{ext}" for k in range(len(frames))
+            ]
+            manifest.begin_page(page_num, output_files)
+
+            for df, output_file in zip(frames, output_files):
+                # Save individual table file
+                write_table(df, output_file, output_format)
+                logger.info(f"  Saved: {output_file}")
+
+                table_count += 1
+
+            manifest.finish_page(page_num, output_files, seconds=time.monotonic() - started)
+            if merger is not None:
+                merger.add_page(page_num, frames)
+
+    except Exception as e:
+        logger.error(f"PyMuPDF extraction failed: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        if merger is not None:
+            merger.abort()
+        raise
+    finally:
+        if manifest is not None:
+            manifest.close()
+        if doc is not None:
+            doc.close()
+
+    if table_count == 0:
+        logger.warning("No tables found in PDF")
+
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
+
+    return table_count
@@ -0,0 +1,146 @@
+"""
+Client-side rate limiting shared by concurrent API workers.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request takes one token; when the bucket is empty the caller
+    sleeps until the next token is available. A capacity of 1 spaces
+    requests evenly, larger capacities allow short bursts.
+
+    Args:
+        rate: Sustained requests per second (must be > 0)
+        capacity: Maximum burst size (default: 1)
+        clock: Monotonic clock function (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens=1):
+        """
+        Block until ``tokens`` tokens are available and consume them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"cannot acquire {tokens} tokens from bucket of capacity {self.capacity}")
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on requests in flight.
+
+    After every ``limit`` healthy completions the limit grows by one, up to
+    ``max_limit``. A completion is healthy when it succeeded and its latency
+    is within ``latency_tolerance`` times the fastest latency seen so far;
+    slow requests or other errors hold the limit where it is. A throttling
+    error halves the limit (down to ``min_limit``). Requests are tagged with
+    the epoch they started in, so a burst of throttling errors caused by the
+    same window only backs off once.
+
+    The caller checks ``limit`` before starting a request, calls ``start``
+    to get its epoch and reports the outcome with ``finish``.
+
+    Args:
+        max_limit: Maximum requests in flight
+        initial: Starting limit (default: half of max_limit, at least 1)
+        min_limit: Minimum requests in flight (default: 1)
+        latency_tolerance: Latency ratio to the fastest request still
+            considered healthy (default: 2.0)
+    """
+
+    def __init__(self, max_limit, initial=None, min_limit=1, latency_tolerance=2.0):
+        if max_limit < 1:
+            raise ValueError(f"max_limit must be >= 1, got {max_limit}")
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"min_limit must be between 1 and {max_limit}, got {min_limit}")
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_tolerance = latency_tolerance
+        if initial is None:
+            initial = max(min_limit, max_limit // 2)
+        self.limit = min(max(initial, min_limit), max_limit)
+        self.peak = self.limit
+        self.backoffs = 0
+        self._epoch = 0
+        self._healthy = 0
+        self._best_latency = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Return the epoch to pass to ``finish`` for a request starting now."""
+        with self._lock:
+            return self._epoch
+
+    def finish(self, epoch, latency=None, throttled=False, error=False):
+        """
+        Report the outcome of a request.
+
+        Args:
+            epoch: Value returned by ``start`` for this request
+            latency: Seconds the request took (successful requests)
+            throttled: The service rejected the request for exceeding its rate
+            error: The request failed for another reason
+        """
+        with self._lock:
+            if throttled:
+                if epoch == self._epoch:
+                    self.limit = max(self.min_limit, self.limit // 2)
+                    self.backoffs += 1
+                    self._epoch += 1
+                    self._healthy = 0
+                return
+
+            if error:
+                self._healthy = 0
+                return
+
+            if latency is not None:
+                if self._best_latency is None or latency < self._best_latency:
+                    self._best_latency = latency
+                if latency > self._best_latency * self.latency_tolerance:
+                    return
+
+            self._healthy += 1
+            if self._healthy >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self.peak = max(self.peak, self.limit)
+                self._healthy = 0
@@ -0,0 +1,62 @@
+"""
+Store of raw Textract ``Blocks`` per page, for re-parsing without API calls.
+
+Each page's blocks are written as gzip-compressed JSON named by a key built
+from the page content (the page copied into a standalone PDF) and the request
+settings, so they survive re-runs and stay valid as long as the page does.
+Re-parsing with a different confidence threshold or parser then needs only
+local reads.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def raw_store_dir(output_dir, stem):
+    """Return the raw blocks directory for a PDF: ``{output_dir}/{stem}_textract_raw``."""
+    return Path(output_dir) / f"{stem}_textract_raw"
+
+
+class RawBlockStore:
+    """
+    Directory of gzip JSON block lists keyed by page hash (thread-safe).
+
+    Args:
+        directory: Directory holding the ``{key}.json.gz`` files (created if missing)
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.directory / f"{key}.json.gz"
+
+    def get(self, key):
+        """Return the stored blocks for `key`, or None if missing or unreadable."""
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable raw blocks {self._path(key).name}: {e}")
+            return None
+
+    def put(self, key, blocks):
+        """Store `blocks` under `key`; the file is replaced atomically."""
+        data = json.dumps(blocks, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=6, mtime=0))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
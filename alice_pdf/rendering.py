@@ -0,0 +1,323 @@
+"""
+Page image rendering helpers for engines that send page images to an API.
+
+- Image encoding with a payload byte budget (format, colour mode, quality)
+- Render-ahead pipeline: a single background thread keeps one document
+  handle open and renders the next pages into a bounded queue while the
+  caller is waiting on the network. The queue size is the only buffer, so
+  memory stays bounded regardless of document length.
+- Process render pool: the same interface backed by worker processes, each
+  holding its own open document, so CPU-bound rendering and encoding run
+  outside the GIL of the process doing network I/O.
+"""
+
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# CLI format name -> (Pillow format, MIME type)
+IMAGE_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+IMAGE_COLORS = ["rgb", "gray", "bilevel"]
+
+# Lower bounds for the byte-budget search
+MIN_QUALITY = 40
+MIN_SIDE = 600
+
+
+def convert_image_color(img, color="rgb"):
+    """
+    Convert a PIL image to the requested colour mode.
+
+    Args:
+        img: PIL Image
+        color: 'rgb', 'gray' (8-bit grayscale) or 'bilevel' (1-bit black/white)
+
+    Returns:
+        Converted PIL Image
+    """
+    if color == "rgb":
+        return img if img.mode == "RGB" else img.convert("RGB")
+    if color == "gray":
+        return img if img.mode == "L" else img.convert("L")
+    if color == "bilevel":
+        return img.convert("L").convert("1")
+    raise ValueError(f"Unknown image color mode: {color}")
+
+
+def _save_image(img, image_format, quality):
+    pil_format, _ = IMAGE_FORMATS[image_format]
+    if image_format != "png" and img.mode == "1":
+        # JPEG/WebP have no 1-bit mode; keep the thresholded pixels as 8-bit
+        img = img.convert("L")
+
+    buffered = BytesIO()
+    if image_format == "png":
+        img.save(buffered, format=pil_format)
+    else:
+        img.save(buffered, format=pil_format, quality=quality)
+    return buffered.getvalue()
+
+
+def encode_image(img, image_format="png", quality=85, max_bytes=None):
+    """
+    Encode a PIL image, recompressing and downscaling until it fits a byte budget.
+
+    Lossy formats first step quality down to MIN_QUALITY, then the image is
+    downscaled by 20% per step until it fits or its shorter side would drop
+    below MIN_SIDE pixels. If the budget still cannot be met, the smallest
+    encoding found is returned and a warning is logged.
+
+    Args:
+        img: PIL Image (already in the desired colour mode)
+        image_format: 'png', 'jpeg' or 'webp'
+        quality: Initial quality for lossy formats (1-100)
+        max_bytes: Optional maximum size of the encoded image in bytes
+
+    Returns:
+        Tuple (encoded bytes, MIME type, (width, height))
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown image format: {image_format}")
+    _, mime_type = IMAGE_FORMATS[image_format]
+
+    data = _save_image(img, image_format, quality)
+    if max_bytes is None or len(data) <= max_bytes:
+        return data, mime_type, img.size
+
+    # Recompress at lower quality (lossy formats only)
+    if image_format != "png":
+        while len(data) > max_bytes and quality > MIN_QUALITY:
+            quality = max(MIN_QUALITY, quality - 15)
+            data = _save_image(img, image_format, quality)
+
+    # Downscale until it fits
+    while len(data) > max_bytes and min(img.size) * 0.8 >= MIN_SIDE:
+        width, height = img.size
+        img = img.resize((int(width * 0.8), int(height * 0.8)))
+        data = _save_image(img, image_format, quality)
+
+    if len(data) > max_bytes:
+        logger.warning(
+            f"  Could not fit image in {max_bytes} bytes "
+            f"(smallest: {len(data)} bytes at {img.size[0]}x{img.size[1]})"
+        )
+
+    return data, mime_type, img.size
+
+
+class RenderAhead:
+    """
+    Bounded producer/consumer page renderer.
+
+    Iterating yields ``(page_num, payload, error)`` tuples in the order of
+    ``page_nums``. ``payload`` is whatever ``render_page(doc, page_num)``
+    returns; if rendering raised, ``payload`` is None and ``error`` holds the
+    exception so the caller can log it and move on.
+
+    The document is opened and used only by the producer thread (PyMuPDF
+    documents are not safe to share between threads).
+
+    Args:
+        open_document: Zero-argument callable returning an open document
+        page_nums: Page numbers (0-based) to render, in order
+        render_page: Callable ``(doc, page_num) -> payload``
+        prefetch: Maximum number of rendered pages waiting to be consumed
+    """
+
+    def __init__(self, open_document, page_nums, render_page, prefetch=2):
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be >= 1, got {prefetch}")
+
+        self._open_document = open_document
+        self._page_nums = list(page_nums)
+        self._render_page = render_page
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """Start the producer thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._produce, name="alice-pdf-render", daemon=True
+            )
+            self._thread.start()
+
+    def _put(self, item):
+        """Put with backpressure, giving up if the consumer has gone away."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            doc = self._open_document()
+        except Exception as e:
+            # Report the failure against every page so callers see it per page
+            for page_num in self._page_nums:
+                if not self._put((page_num, None, e)):
+                    return
+            self._put(_DONE)
+            return
+
+        try:
+            for page_num in self._page_nums:
+                if self._stop.is_set():
+                    return
+                try:
+                    item = (page_num, self._render_page(doc, page_num), None)
+                except Exception as e:
+                    item = (page_num, None, e)
+                if not self._put(item):
+                    return
+        finally:
+            doc.close()
+            self._put(_DONE)
+
+    def __iter__(self):
+        self.start()
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            yield item
+
+    def close(self):
+        """Stop the producer and release the document handle."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def default_render_workers():
+    """
+    Number of render processes for this machine: one core is left to the
+    process doing network I/O, and at least one worker is used.
+    """
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+# Per-process state of RenderPool workers
+_worker_document = None
+_worker_render_page = None
+
+
+def _init_render_worker(open_document, render_page):
+    global _worker_document, _worker_render_page
+    _worker_document = open_document()
+    _worker_render_page = render_page
+
+
+def _render_in_worker(page_num):
+    return _worker_render_page(_worker_document, page_num)
+
+
+class RenderPool:
+    """
+    Page renderer backed by a process pool, with the RenderAhead interface.
+
+    Each worker process opens the document once in its initializer and
+    renders the pages it is given. At most ``workers + prefetch`` pages are
+    submitted ahead of the consumer, and results are yielded in the order of
+    ``page_nums`` as ``(page_num, payload, error)`` tuples.
+
+    ``open_document`` and ``render_page`` are sent to the workers, so they
+    must be picklable (module-level functions or ``functools.partial``).
+
+    Args:
+        open_document: Zero-argument callable returning an open document
+        page_nums: Page numbers (0-based) to render, in order
+        render_page: Callable ``(doc, page_num) -> payload``
+        workers: Number of render processes
+        prefetch: Rendered pages waiting to be consumed, on top of `workers`
+    """
+
+    def __init__(self, open_document, page_nums, render_page, workers, prefetch=2):
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be >= 1, got {prefetch}")
+
+        self._open_document = open_document
+        self._page_nums = list(page_nums)
+        self._render_page = render_page
+        self._workers = workers
+        self._ahead = workers + prefetch
+        self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """Start the worker processes (idempotent)."""
+        if self._executor is None and self._page_nums:
+            self._executor = ProcessPoolExecutor(
+                max_workers=min(self._workers, len(self._page_nums)),
+                initializer=_init_render_worker,
+                initargs=(self._open_document, self._render_page),
+            )
+
+    def __iter__(self):
+        self.start()
+        pages = iter(self._page_nums)
+        in_flight = deque()
+
+        def submit_next():
+            page_num = next(pages, None)
+            if page_num is None:
+                return
+            try:
+                future = self._executor.submit(_render_in_worker, page_num)
+            except Exception as e:
+                # Broken pool (e.g. the document failed to open in a worker)
+                future = Future()
+                future.set_exception(e)
+            in_flight.append((page_num, future))
+
+        for _ in range(self._ahead):
+            submit_next()
+
+        while in_flight:
+            page_num, future = in_flight.popleft()
+            try:
+                item = (page_num, future.result(), None)
+            except Exception as e:
+                item = (page_num, None, e)
+            submit_next()
+            yield item
+
+    def close(self):
+        """Stop the workers; pages not yet rendered are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
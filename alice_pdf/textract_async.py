@@ -0,0 +1,205 @@
+"""
+Asynchronous Textract document analysis for large PDFs.
+
+Instead of one synchronous ``analyze_document`` call per rendered page, the
+selected pages are cut into chunk PDFs (PyMuPDF ``insert_pdf``), uploaded to
+S3 and analysed as ``StartDocumentAnalysis`` jobs. Jobs run concurrently;
+each is polled and its ``GetDocumentAnalysis`` result pages are followed
+through ``NextToken``, then blocks are mapped back to the original page
+numbers via their ``Page`` attribute.
+
+The Textract and S3 clients are injected, so tests can run the whole flow
+against in-process stand-ins.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("SUCCEEDED", "PARTIAL_SUCCESS")
+
+
+class TextractJobs:
+    """
+    Start, wait for and clean up Textract document-analysis jobs.
+
+    Args:
+        textract_client: boto3 Textract client (or compatible stand-in)
+        s3_client: boto3 S3 client used to stage the chunk PDFs
+        bucket: S3 bucket Textract can read from (same region as Textract)
+        prefix: Key prefix of the staged chunk PDFs
+        poll_interval: Seconds between GetDocumentAnalysis status checks
+        timeout: Seconds after which a job still running is given up
+        sleep: Sleep function (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        textract_client,
+        s3_client,
+        bucket,
+        prefix="alice-pdf",
+        poll_interval=5.0,
+        timeout=3600.0,
+        sleep=time.sleep,
+    ):
+        self.textract = textract_client
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._sleep = sleep
+
+    def start(self, pdf_bytes, name):
+        """
+        Upload a PDF and start its analysis.
+
+        Returns:
+            Tuple (job id, S3 key of the staged PDF)
+        """
+        key = f"{self.prefix}/{name}" if self.prefix else name
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=pdf_bytes)
+        response = self.textract.start_document_analysis(
+            DocumentLocation={"S3Object": {"Bucket": self.bucket, "Name": key}},
+            FeatureTypes=["TABLES"],
+        )
+        return response["JobId"], key
+
+    def wait(self, job_id):
+        """
+        Poll a job until it finishes and return all of its blocks.
+
+        Returns:
+            Tuple (blocks, partial); `partial` is True if the job only
+            partially succeeded, so some pages may have no blocks
+
+        Raises:
+            RuntimeError: If the job failed
+            TimeoutError: If the job is still running after `timeout` seconds
+        """
+        waited = 0.0
+        while True:
+            response = self.textract.get_document_analysis(JobId=job_id, MaxResults=1000)
+            status = response.get("JobStatus")
+            if status in FINISHED_STATUSES:
+                break
+            if status == "FAILED":
+                raise RuntimeError(
+                    f"Textract job {job_id} failed: {response.get('StatusMessage', 'no message')}"
+                )
+            if waited >= self.timeout:
+                raise TimeoutError(f"Textract job {job_id} still {status} after {waited:.0f}s")
+            self._sleep(self.poll_interval)
+            waited += self.poll_interval
+
+        if status == "PARTIAL_SUCCESS":
+            logger.warning(f"  Textract job {job_id} partially succeeded: {response.get('Warnings', [])}")
+
+        # Results are paginated: follow NextToken until exhausted
+        blocks = list(response.get("Blocks", []))
+        token = response.get("NextToken")
+        while token:
+            response = self.textract.get_document_analysis(
+                JobId=job_id, MaxResults=1000, NextToken=token
+            )
+            blocks.extend(response.get("Blocks", []))
+            token = response.get("NextToken")
+        return blocks, status == "PARTIAL_SUCCESS"
+
+    def delete(self, key):
+        """Remove a staged PDF from S3."""
+        self.s3.delete_object(Bucket=self.bucket, Key=key)
+
+
+def page_chunk_pdf(doc, page_nums):
+    """Return the bytes of a new PDF holding `page_nums` (0-based) of `doc`, in order."""
+    chunk = fitz.open()
+    try:
+        for page_num in page_nums:
+            chunk.insert_pdf(doc, from_page=page_num, to_page=page_num)
+        # No new file ID, so the same pages always give the same bytes (cache keys)
+        return chunk.tobytes(garbage=3, deflate=True, no_new_id=True)
+    finally:
+        chunk.close()
+
+
+def blocks_by_page(blocks):
+    """Group blocks by their 1-based ``Page`` attribute."""
+    pages = {}
+    for block in blocks:
+        pages.setdefault(block.get("Page", 1), []).append(block)
+    return pages
+
+
+def _run_chunk(jobs, pdf_path, chunk_index, page_nums):
+    doc = fitz.open(pdf_path)
+    try:
+        pdf_bytes = page_chunk_pdf(doc, page_nums)
+    finally:
+        doc.close()
+
+    name = f"{pdf_path.stem}_chunk{chunk_index}_{int(time.time() * 1000)}.pdf"
+    job_id, key = jobs.start(pdf_bytes, name)
+    logger.info(
+        f"  Started Textract job {job_id} for pages "
+        f"{page_nums[0] + 1}-{page_nums[-1] + 1} ({len(page_nums)} pages, {len(pdf_bytes)} bytes)"
+    )
+    try:
+        return jobs.wait(job_id)
+    finally:
+        try:
+            jobs.delete(key)
+        except Exception as e:
+            logger.warning(f"  Could not delete staged s3://{jobs.bucket}/{key}: {e}")
+
+
+def run_document_analysis(jobs, pdf_path, page_nums, chunk_pages=100, max_jobs=5):
+    """
+    Analyse pages with concurrent document-analysis jobs.
+
+    Args:
+        jobs: TextractJobs instance
+        pdf_path: Path of the source PDF
+        page_nums: Page numbers (0-based) to analyse
+        chunk_pages: Maximum pages per job
+        max_jobs: Maximum jobs running at once
+
+    Yields:
+        Tuples (page_num, blocks, error) as chunks finish; on a failed job
+        every page of the chunk is yielded with blocks None and the exception,
+        and so is every page a partially successful job returned no blocks for
+    """
+    if chunk_pages < 1:
+        raise ValueError(f"chunk_pages must be >= 1, got {chunk_pages}")
+
+    chunks = [page_nums[i : i + chunk_pages] for i in range(0, len(page_nums), chunk_pages)]
+    if not chunks:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_jobs, len(chunks))) as executor:
+        futures = {
+            executor.submit(_run_chunk, jobs, pdf_path, index, chunk): chunk
+            for index, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                blocks, partial = future.result()
+            except Exception as e:
+                for page_num in chunk:
+                    yield page_num, None, e
+                continue
+
+            # Page N of the chunk PDF is the N-th selected page
+            pages = blocks_by_page(blocks)
+            for position, page_num in enumerate(chunk, start=1):
+                if partial and position not in pages:
+                    error = RuntimeError("no blocks returned, Textract job partially succeeded")
+                    yield page_num, None, error
+                else:
+                    yield page_num, pages.get(position, []), None
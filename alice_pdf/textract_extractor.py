@@ -5,23 +5,60 @@ Converts PDF pages to images and uses Textract API for table extraction.
 """
 
 import logging
-import base64
 from pathlib import Path
 from io import BytesIO
-import json
 import time
-import shutil
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import hashlib
+from collections import deque
+from functools import partial
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import fitz  # PyMuPDF
 from PIL import Image
 import pandas as pd
 
+from .cache import DEFAULT_MAX_BYTES, ResponseCache, cache_key
+from .manifest import ResumeManifest
+from .merge import MergeWriter
+from .output import OUTPUT_EXTENSIONS, write_table
+from .prefilter import apply_prefilter
+from .rate_limit import AdaptiveConcurrency, TokenBucket
+from .raw_store import RawBlockStore, raw_store_dir
+from .rendering import RenderAhead, RenderPool, default_render_workers
+from .textract_async import TextractJobs, page_chunk_pdf, run_document_analysis
+
 logger = logging.getLogger(__name__)
 
+# Cells at or below this Textract confidence (0-100) are dropped
+MIN_CELL_CONFIDENCE = 30
+
+# Error codes Textract returns when requests exceed the account's rate quota
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "LimitExceededException",
+}
+
+# Times a throttled page is resubmitted before it is marked as failed
+MAX_THROTTLE_RETRIES = 5
+
+# Sync API document limits: larger single-page PDFs are sent as raster images
+TEXTRACT_MAX_DOCUMENT_BYTES = 10 * 1024 * 1024
+TEXTRACT_MAX_PAGE_POINTS = 2880  # 40 inches
+
+# Error codes for documents Textract cannot read as PDF (retried as PNG)
+PDF_REJECTED_ERROR_CODES = {
+    "UnsupportedDocumentException",
+    "BadDocumentException",
+    "DocumentTooLargeException",
+}
+
+TEXTRACT_INPUTS = ["png", "pdf"]
+
 # Global client cache for connection reuse
 _textract_client_cache = {}
+_s3_client_cache = {}
 
 
 def _get_textract_client(aws_access_key_id, aws_secret_access_key, aws_region):
@@ -64,78 +101,138 @@ def _get_textract_client(aws_access_key_id, aws_secret_access_key, aws_region):
     return _textract_client_cache[cache_key]
 
 
-def natural_sort_key(path):
+def _get_s3_client(aws_access_key_id, aws_secret_access_key, aws_region):
     """
-    Generate a key for natural sorting of file paths.
-    Extracts page number from filename for proper numeric sorting.
+    Get or create a cached S3 client, used to stage PDFs for async Textract jobs.
+
+    Args:
+        aws_access_key_id: AWS access key ID
+        aws_secret_access_key: AWS secret access key
+        aws_region: AWS region (the bucket must be in the Textract region)
+
+    Returns:
+        Cached boto3 S3 client
     """
-    # Extract page number from filename like "..._page12_table0.csv"
-    match = re.search(r"_page(\d+)_", path.name)
-    if match:
-        return int(match.group(1))
-    return 0
+    cache_key = (aws_access_key_id, aws_secret_access_key, aws_region)
+
+    if cache_key not in _s3_client_cache:
+        import boto3
+
+        _s3_client_cache[cache_key] = boto3.client(
+            "s3",
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region_name=aws_region,
+        )
+
+    return _s3_client_cache[cache_key]
+
 
+def _child_ids(block):
+    """Ids of a block's CHILD relationships, in order."""
+    for relationship in block.get("Relationships", []):
+        if relationship.get("Type") == "CHILD":
+            yield from relationship.get("Ids", [])
 
-def pdf_page_to_base64(pdf_path, page_num, dpi=150):
+
+def parse_textract_tables(blocks, min_confidence=MIN_CELL_CONFIDENCE):
     """
-    Convert PDF page to base64-encoded image with enhanced preprocessing.
+    Build table grids from Textract ``Blocks`` in linear time.
+
+    Blocks are indexed by Id once; each TABLE then walks its own CHILD cells,
+    and each cell its own CHILD words, so multi-table pages do not share cells.
 
     Args:
-        pdf_path: Path to PDF file
-        page_num: Page number (0-based)
-        dpi: Resolution for rendering
+        blocks: ``Blocks`` list of an ``analyze_document`` response
+        min_confidence: Cells with confidence at or below this are left empty
 
     Returns:
-        Base64-encoded image string
+        List of {"headers": [...], "rows": [[...], ...]} dicts, first row as headers
     """
-    doc = fitz.open(pdf_path)
-    page = doc[page_num]
-
-    # Render page to pixmap at requested DPI (150-200 recommended for most cases)
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
-    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB)
+    by_id = {block["Id"]: block for block in blocks if "Id" in block}
 
-    # Convert to PIL Image
-    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    tables = []
+    for table_block in blocks:
+        if table_block["BlockType"] != "TABLE":
+            continue
 
-    # Enhance image for better table detection
-    from PIL import ImageEnhance, ImageFilter
+        cells = [
+            by_id[cell_id]
+            for cell_id in _child_ids(table_block)
+            if cell_id in by_id
+            and by_id[cell_id]["BlockType"] == "CELL"
+            and by_id[cell_id].get("Confidence", 0) > min_confidence
+        ]
+        if not cells:
+            continue
 
-    # Increase contrast
-    enhancer = ImageEnhance.Contrast(img)
-    img = enhancer.enhance(1.5)
+        max_row = max(cell["RowIndex"] for cell in cells)
+        max_col = max(cell["ColumnIndex"] for cell in cells)
+        grid = [[""] * max_col for _ in range(max_row)]
 
-    # Sharpen the image
-    img = img.filter(ImageFilter.SHARPEN)
+        for cell in cells:
+            words = [
+                by_id[word_id].get("Text", "")
+                for word_id in _child_ids(cell)
+                if word_id in by_id and by_id[word_id]["BlockType"] == "WORD"
+            ]
+            grid[cell["RowIndex"] - 1][cell["ColumnIndex"] - 1] = " ".join(words).strip()
 
-    # Convert to grayscale for better text detection (Textract handles RGB better, but we keep RGB)
-    # img = img.convert('L')
+        tables.append({"headers": grid[0], "rows": grid[1:]})
 
-    # Convert to base64
-    buffered = BytesIO()
-    img.save(buffered, format="PNG", optimize=True)
-    img_base64 = base64.b64encode(buffered.getvalue()).decode()
-
-    doc.close()
-    return img_base64
+    return tables
 
 
 def extract_tables_with_textract_api(
-    textract_client, image_bytes, page_num, max_results=1000, use_async=False
+    textract_client,
+    image_bytes,
+    page_num,
+    max_results=1000,
+    use_async=False,
+    cache=None,
+    cache_key=None,
+    min_confidence=MIN_CELL_CONFIDENCE,
+    raw_store=None,
+    raw_key=None,
 ):
     """
     Extract tables from image using Amazon Textract with enhanced options.
 
     Args:
         textract_client: Textract client
-        image_bytes: Image bytes
+        image_bytes: Image or single-page PDF bytes
         page_num: Page number for reference
         max_results: Maximum number of blocks to return
         use_async: Use async processing for better table detection
+        cache: Optional ResponseCache; the response blocks are stored after a
+            call and parsed again on a hit
+        cache_key: Key identifying this request in `cache`
+        min_confidence: Cells at or below this confidence are left empty
+        raw_store: Optional RawBlockStore; the response blocks are stored
+            under `raw_key` for later re-parsing
+        raw_key: Key of this page in `raw_store`
 
     Returns:
         Extracted table data as dict
     """
+    cached = cache.get(cache_key) if cache is not None and cache_key is not None else None
+    if cached is not None:
+        logger.info(f"  Page {page_num + 1}: response cache hit")
+        blocks = cached["blocks"]
+    else:
+        blocks = _analyze_document(textract_client, image_bytes, page_num)
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, {"blocks": blocks})
+
+    # Stored on cache hits too, so a fresh output directory can be re-parsed
+    if raw_store is not None and raw_key is not None:
+        raw_store.put(raw_key, blocks)
+
+    return {"tables": parse_textract_tables(blocks, min_confidence=min_confidence)}
+
+
+def _analyze_document(textract_client, image_bytes, page_num):
+    """Send one page to the sync AnalyzeDocument API and return its response blocks."""
     logger.info(f"  Sending page {page_num + 1} to Textract API...")
 
     try:
@@ -159,126 +256,199 @@ def extract_tables_with_textract_api(
         logger.error(f"  Unexpected response type: {type(response)}")
         logger.debug(f"  Response content: {response}")
         raise ValueError(f"Expected dict, got {type(response)}")
+    return blocks
 
-    # Find all table blocks
-    table_blocks = [block for block in blocks if block["BlockType"] == "TABLE"]
 
-    tables = []
+def _render_page_png(doc, page_num, dpi=150):
+    """Render a page of an already open document to PNG bytes for Textract."""
+    page = doc[page_num]
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB)
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
 
-    for table_idx, table_block in enumerate(table_blocks):
-        # Get table cells
-        cells = [
-            block
-            for block in blocks
-            if block["BlockType"] == "CELL" and block.get("Confidence", 0) > 30
-        ]  # Filter low confidence cells (lowered threshold)
+    # Convert to bytes for Textract
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    return buffered.getvalue()
 
-        if not cells:
-            continue
 
-        # Organize cells by row and column
-        table_data = {}
-        max_row = 0
-        max_col = 0
+def _render_page_document(doc, page_num, dpi=150, textract_input="png", page_pdf=None):
+    """
+    Prepare the document bytes sent to Textract for one page.
 
-        for cell in cells:
-            row_index = cell["RowIndex"]
-            col_index = cell["ColumnIndex"]
+    With `textract_input` 'pdf' the page is copied into a standalone
+    single-page PDF (no rasterisation), or `page_pdf` is used if that copy
+    was already made; pages beyond the sync API limits are rendered to PNG
+    instead.
 
-            max_row = max(max_row, row_index)
-            max_col = max(max_col, col_index)
+    Returns:
+        Tuple (bytes, kind) where kind is 'pdf' or 'png'
+    """
+    if textract_input == "pdf":
+        page = doc[page_num]
+        if max(page.rect.width, page.rect.height) > TEXTRACT_MAX_PAGE_POINTS:
+            logger.info(f"  Page {page_num + 1}: larger than {TEXTRACT_MAX_PAGE_POINTS} pt, sending PNG")
+        else:
+            pdf_bytes = page_pdf if page_pdf is not None else page_chunk_pdf(doc, [page_num])
+            if len(pdf_bytes) <= TEXTRACT_MAX_DOCUMENT_BYTES:
+                return pdf_bytes, "pdf"
+            logger.info(f"  Page {page_num + 1}: single-page PDF is {len(pdf_bytes)} bytes, sending PNG")
 
-            # Get cell text
-            cell_text = ""
-            cell_relationships = cell.get("Relationships", [])
-            if cell_relationships:
-                for relationship in cell_relationships:
-                    if relationship.get("Type") == "CHILD":
-                        child_ids = relationship.get("Ids", [])
-                        for block in blocks:
-                            if block.get("Id") in child_ids:
-                                if block["BlockType"] == "WORD":
-                                    cell_text += block.get("Text", "") + " "
+    return _render_page_png(doc, page_num, dpi=dpi), "png"
 
-            table_data[(row_index, col_index)] = cell_text.strip()
 
-        # Build table matrix
-        headers = []
-        rows = []
+def _page_hash(doc, page_num):
+    """SHA-256 of a page copied into a standalone PDF (stable across runs)."""
+    return hashlib.sha256(page_chunk_pdf(doc, [page_num])).hexdigest()
 
-        # First row as headers
-        for col in range(1, max_col + 1):
-            headers.append(table_data.get((1, col), ""))
 
-        # Remaining rows as data
-        for row in range(2, max_row + 1):
-            row_data = []
-            for col in range(1, max_col + 1):
-                row_data.append(table_data.get((row, col), ""))
-            rows.append(row_data)
+def _raw_key(page_hash, payload, dpi):
+    """Key of a page's raw blocks: page content plus what was sent to Textract."""
+    return cache_key("textract-raw", payload, dpi, page_hash)
 
-        tables.append({"headers": headers, "rows": rows})
 
-    return {"tables": tables}
+def _prepare_page(doc, page_num, dpi=150, textract_input="png"):
+    """Payload (bytes, kind) and page hash of one page; runs in a render process."""
+    # One standalone copy of the page serves both the hash and the PDF payload
+    page_pdf = page_chunk_pdf(doc, [page_num])
+    return (
+        _render_page_document(doc, page_num, dpi=dpi, textract_input=textract_input, page_pdf=page_pdf),
+        hashlib.sha256(page_pdf).hexdigest(),
+    )
 
 
-def _process_single_page(
-    pdf_path, page_num, total_pages, idx, page_list_len, output_dir, dpi, textract_client
-):
+def _error_code(error):
+    """Error code of a botocore ClientError, or None."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+def _is_throttling_error(error):
+    """True if `error` is a botocore ClientError for exceeding the Textract rate."""
+    return _error_code(error) in THROTTLING_ERROR_CODES
+
+
+class _InputStats:
+    """Thread-safe per-kind totals of bytes sent and request latency."""
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, kind, size, seconds):
+        with self._lock:
+            count, total_size, total_seconds = self._totals.get(kind, (0, 0, 0.0))
+            self._totals[kind] = (count + 1, total_size + size, total_seconds + seconds)
+
+    def log(self):
+        """Log average size and latency per input kind."""
+        for kind, (count, total_size, total_seconds) in sorted(self._totals.items()):
+            logger.info(
+                f"Textract input {kind}: {count} requests, "
+                f"{total_size / count / 1024:.1f} KB/page, {total_seconds / count:.2f} s/request"
+            )
+
+
+def _timed(func, *args):
+    """Call `func(*args)` and return (elapsed seconds, result)."""
+    started = time.monotonic()
+    result = func(*args)
+    return time.monotonic() - started, result
+
+
+def _existing_page_files(manifest, page_num, idx, page_list_len):
     """
-    Process a single PDF page (thread-safe).
-    Returns: (page_num, tables_count, failed, dataframes)
+    Return the already written table files of a page in resume mode.
+    Returns: list of CSV paths, or None if the page has not been processed
     """
-    # Check if page already processed
-    existing_files = sorted(
-        list(output_dir.glob(f"{pdf_path.stem}_page{page_num + 1}_table*.csv")),
-        key=natural_sort_key,
-    )
-    if existing_files:
-        logger.info(
-            f"Page {page_num + 1} ({idx}/{page_list_len}) - already processed, skipping"
-        )
-        # Load existing dataframes for merge
-        dataframes = []
-        for csv_file in existing_files:
-            df = pd.read_csv(csv_file, encoding="utf-8-sig")
-            dataframes.append(df)
-        return (page_num, len(existing_files), False, dataframes)
+    if not manifest.is_done(page_num + 1):
+        return None
 
-    if page_num >= total_pages:
-        logger.warning(f"Page {page_num + 1} out of range, skipping")
-        return (page_num, 0, True, [])
+    logger.info(
+        f"Page {page_num + 1} ({idx}/{page_list_len}) - already processed, skipping"
+    )
+    return manifest.page_files(page_num + 1)
 
-    logger.info(f"Processing page {page_num + 1} ({idx}/{page_list_len})")
 
-    # Convert page to image (thread-safe: each thread opens its own document)
-    try:
-        doc = fitz.open(pdf_path)
-        page = doc[page_num]
-        mat = fitz.Matrix(dpi / 72, dpi / 72)
-        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB)
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-
-        # Convert to bytes for Textract
-        buffered = BytesIO()
-        img.save(buffered, format="PNG")
-        image_bytes = buffered.getvalue()
-        doc.close()
-    except Exception as e:
-        logger.error(f"  Failed to render page {page_num + 1}: {e}")
-        return (page_num, 0, True, [])
+def _process_single_page(
+    pdf_path,
+    page_num,
+    document,
+    output_dir,
+    textract_client,
+    dpi=150,
+    cache=None,
+    manifest=None,
+    output_format="csv",
+    stats=None,
+    min_confidence=MIN_CELL_CONFIDENCE,
+    raw_store=None,
+    raw_key=None,
+):
+    """
+    Send a single pre-rendered page to Textract and save its tables (thread-safe).
+    `document` is the (bytes, kind) pair from `_render_page_document`; a PDF
+    rejected by Textract is rendered and sent again as PNG.
+    The page is recorded in `manifest` (if given) once all its CSVs are written.
+    Throttling errors are raised so the caller can back off and retry.
+    Returns: (page_num, tables_count, failed, dataframes)
+    """
+    started = time.monotonic()
+    document_bytes, kind = document
 
     # Extract tables using Textract
-    try:
-        result = extract_tables_with_textract_api(
-            textract_client, image_bytes, page_num
+    while True:
+        key = (
+            cache_key("textract", "TABLES", "blocks", dpi, document_bytes)
+            if cache is not None
+            else None
         )
-    except Exception as e:
-        logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
-        return (page_num, 0, True, [])
+        request_started = time.monotonic()
+        try:
+            result = extract_tables_with_textract_api(
+                textract_client,
+                document_bytes,
+                page_num,
+                cache=cache,
+                cache_key=key,
+                min_confidence=min_confidence,
+                raw_store=raw_store,
+                raw_key=raw_key,
+            )
+            break
+        except Exception as e:
+            if _is_throttling_error(e):
+                # Let the caller back off and resubmit the page
+                raise
+            if kind == "pdf" and _error_code(e) in PDF_REJECTED_ERROR_CODES:
+                logger.warning(f"  Page {page_num + 1}: Textract rejected the PDF page, sending PNG")
+                doc = fitz.open(pdf_path)
+                try:
+                    document_bytes, kind = _render_page_png(doc, page_num, dpi=dpi), "png"
+                finally:
+                    doc.close()
+                continue
+            logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
+            return (page_num, 0, True, [])
+
+    if stats is not None:
+        stats.add(kind, len(document_bytes), time.monotonic() - request_started)
+
+    tables_saved, dataframes = _save_page_tables(
+        pdf_path, page_num, result.get("tables", []), output_dir, manifest, output_format, started
+    )
+    return (page_num, tables_saved, False, dataframes)
+
 
-    # Process tables
-    tables = result.get("tables", [])
+def _save_page_tables(pdf_path, page_num, tables, output_dir, manifest, output_format, started=None):
+    """
+    Save the parsed tables of one page and record it in `manifest` (if given).
+    Files an earlier run recorded for the page and not written again are deleted.
+    Returns: (tables_saved, dataframes)
+    """
+    ext = OUTPUT_EXTENSIONS[output_format]
     dataframes = []
     tables_saved = 0
 
@@ -301,17 +471,29 @@ def _process_single_page(
 
         logger.info(f"  Table {i}: {df.shape}")
 
-        # Save individual CSV
-        output_file = (
-            output_dir / f"{pdf_path.stem}_page{page_num + 1}_table{i}.csv"
+        dataframes.append(
+            (output_dir / f"{pdf_path.stem}_page{page_num + 1}_table{i}{ext}", df)
         )
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        logger.info(f"    Saved: {output_file}")
 
-        dataframes.append(df)
+    output_files = [output_file for output_file, _ in dataframes]
+    if manifest is not None:
+        if manifest.is_done(page_num + 1):
+            # A rebuilt page may have fewer tables than before; drop the rest
+            for stale in set(manifest.page_files(page_num + 1)) - set(output_files):
+                stale.unlink(missing_ok=True)
+        manifest.begin_page(page_num + 1, output_files)
+
+    for output_file, df in dataframes:
+        # Save individual table file
+        write_table(df, output_file, output_format)
+        logger.info(f"    Saved: {output_file}")
         tables_saved += 1
 
-    return (page_num, tables_saved, False, dataframes)
+    if manifest is not None:
+        seconds = time.monotonic() - started if started is not None else None
+        manifest.finish_page(page_num + 1, output_files, seconds=seconds)
+
+    return tables_saved, [df for _, df in dataframes]
 
 
 def extract_tables_with_textract(
@@ -324,9 +506,30 @@ def extract_tables_with_textract(
     dpi=150,
     merge_output=False,
     resume=True,
+    prefetch=2,
+    cache_dir=None,
+    cache_max_bytes=DEFAULT_MAX_BYTES,
+    prefilter=None,
+    prefilter_threshold=0.3,
+    output_format="csv",
+    use_async=False,
+    s3_bucket=None,
+    s3_prefix="alice-pdf",
+    async_chunk_pages=100,
+    poll_interval=5.0,
+    max_workers=5,
+    target_rps=None,
+    textract_input="png",
+    min_confidence=MIN_CELL_CONFIDENCE,
+    reparse_from_raw=False,
+    render_workers=None,
 ):
     """
-    Extract tables from PDF using Amazon Textract sync API with parallel processing.
+    Extract tables from PDF using Amazon Textract with parallel processing.
+
+    By default each page is rendered and sent to the sync API. With
+    `use_async`, pages are submitted in chunks as document-analysis jobs
+    through `s3_bucket` (better for large PDFs).
 
     Args:
         pdf_path: Path to PDF file
@@ -337,46 +540,85 @@ def extract_tables_with_textract(
         pages: Pages to process ('all', '1', '1-3', '1,3,5')
         dpi: Image resolution
         merge_output: If True, merge all tables into single CSV
-        resume: If True, skip pages that already have output files
+        resume: If True, skip pages recorded as done in the resume manifest
+        prefetch: Number of pages rendered ahead while requests are in flight
+        cache_dir: Optional directory of the persistent response cache
+            (None disables caching)
+        cache_max_bytes: Size bound of the response cache (LRU eviction)
+        prefilter: None, 'skip' or 'defer' pages with a low local table score
+        prefilter_threshold: Minimum table score (0-1) for the pre-filter
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
+        use_async: If True, use async document-analysis jobs instead of
+            one sync request per page (requires `s3_bucket`)
+        s3_bucket: S3 bucket where page chunks are staged for async jobs
+        s3_prefix: Key prefix of the staged chunks (deleted after each job)
+        async_chunk_pages: Maximum pages per async job
+        poll_interval: Seconds between async job status checks
+        max_workers: Upper bound of sync requests in flight (adapted between
+            1 and this value from latency and throttling) or async jobs running
+        target_rps: Optional cap on sync requests per second
+        textract_input: Sync request payload: 'png' renders each page at
+            `dpi`, 'pdf' sends a standalone single-page PDF (PNG fallback for
+            pages beyond the API limits or rejected by Textract)
+        min_confidence: Cells at or below this Textract confidence (0-100)
+            are left empty
+        reparse_from_raw: If True, rebuild the table files of the selected
+            pages from the raw blocks stored by earlier runs, without calling
+            Textract; pages without raw blocks keep their recorded outputs
+        render_workers: Processes rendering pages for sync requests (default:
+            CPU count - 1); 0 renders in one background thread instead
 
     Returns:
         Number of tables extracted
     """
     # Import boto3 only when needed to avoid dependency issues
-    try:
-        import boto3
-    except ImportError:
-        raise ImportError(
-            "boto3 is required for Textract support. Install with: pip install boto3"
-        )
+    if not reparse_from_raw:
+        try:
+            import boto3
+        except ImportError:
+            raise ImportError(
+                "boto3 is required for Textract support. Install with: pip install boto3"
+            )
+
+    if use_async and not s3_bucket and not reparse_from_raw:
+        raise ValueError("Async Textract mode requires an S3 bucket (--s3-bucket)")
 
     pdf_path = Path(pdf_path)
     output_dir = Path(output_dir)
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
 
     # Delete merged file if exists
     if merge_output:
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
         if merged_file.exists():
             merged_file.unlink()
             logger.info(f"Deleted previous merged file: {merged_file.name}")
 
-    # Always delete the most recently created page CSV
-    existing_csvs = list(output_dir.glob(f"{pdf_path.stem}_page*.csv"))
-    if existing_csvs:
-        most_recent = max(existing_csvs, key=lambda p: p.stat().st_mtime)
-        most_recent.unlink()
-        logger.info(f"Deleted last created file: {most_recent.name}")
+    # Raw response blocks of every analysed page, keyed by page hash
+    raw_store = RawBlockStore(raw_store_dir(output_dir, pdf_path.stem))
+    # Raw blocks depend on what was sent: async chunks, or PNG/PDF sync payloads
+    payload = "async" if use_async else textract_input
+    raw_dpi = None if use_async else dpi
+
+    textract_client = None
+    cache = None
+    if not reparse_from_raw:
+        # Get cached Textract client (reuses connection across calls)
+        textract_client = _get_textract_client(
+            aws_access_key_id, aws_secret_access_key, aws_region
+        )
 
-    # Get cached Textract client (reuses connection across calls)
-    textract_client = _get_textract_client(
-        aws_access_key_id, aws_secret_access_key, aws_region
-    )
+        cache = ResponseCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        if cache is not None:
+            logger.info(f"Response cache: {cache.cache_dir}")
 
     # Open PDF
     doc = fitz.open(pdf_path)
     total_pages = len(doc)
+    doc.close()
 
     # Parse page range
     if pages == "all":
@@ -393,51 +635,266 @@ def extract_tables_with_textract(
     logger.info(f"Processing {len(page_list)} pages from: {pdf_path}")
     logger.info(f"DPI: {dpi}")
 
-    # Check if async recommended (implementation planned for future release)
-    if len(page_list) > 120:
-        logger.warning(
-            f"PDF has {len(page_list)} pages (>120). "
-            f"For large PDFs, async Textract API provides better performance (single batch job vs {len(page_list)} requests). "
-            f"Current version uses sync API with parallel processing (max_workers=5)."
-        )
+    # Per-page resume state; partial pages of an interrupted run are discarded.
+    # Re-parsing rewrites only the pages it rebuilds, so it never forgets pages.
+    manifest = ResumeManifest(
+        output_dir,
+        pdf_path.stem,
+        resume=resume or reparse_from_raw,
+        pages=[page_num + 1 for page_num in page_list],
+    )
 
-    logger.info(f"Using sync Textract API with parallel processing")
-    logger.info(f"Parallel execution: max_workers=5")
+    if reparse_from_raw:
+        logger.info(f"Re-parsing stored raw blocks from {raw_store.directory} (no Textract calls)")
+    elif use_async:
+        logger.info(f"Using async Textract API: s3://{s3_bucket}/{s3_prefix}, {async_chunk_pages} pages per job")
+        if cache is not None:
+            logger.info("Response cache is not used in async mode")
+    else:
+        if len(page_list) > 120:
+            logger.warning(
+                f"PDF has {len(page_list)} pages (>120). "
+                f"For large PDFs, async Textract API provides better performance (batch jobs vs {len(page_list)} requests): "
+                f"use --textract-async --s3-bucket BUCKET."
+            )
+        logger.info(f"Using sync Textract API with parallel processing, {textract_input.upper()} input")
+        if render_workers is None:
+            render_workers = default_render_workers()
+        logger.info(
+            f"Parallel execution: adaptive, up to max_workers={max_workers}"
+            f"{f', target {target_rps} req/s' if target_rps else ''}, "
+            f"render processes: {render_workers or 'none (thread)'}, render-ahead: {prefetch} pages"
+        )
 
-    all_dataframes = []
     table_count = 0
     failed_pages = []
 
-    # Process pages in parallel (max 5 workers to respect Textract ~10 req/sec limit)
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        # Submit all page processing tasks
-        future_to_page = {}
-        for idx, page_num in enumerate(page_list, start=1):
+    # Merged output is streamed in page order while pages complete
+    merger = None
+    if merge_output:
+        merger = MergeWriter(
+            output_dir / f"{pdf_path.stem}_merged{ext}",
+            sorted({page_num + 1 for page_num in page_list if page_num < total_pages}),
+            output_format=output_format,
+        )
+
+    # Resolve resume state up front so finished pages are never rendered
+    pending = []
+    for idx, page_num in enumerate(page_list, start=1):
+        # Re-parsing revisits finished pages too
+        existing = None if reparse_from_raw else _existing_page_files(manifest, page_num, idx, len(page_list))
+        if existing is not None:
+            table_count += len(existing)
+            # Existing CSVs are read only when the merge reaches this page
+            if merger is not None:
+                merger.add_page(page_num + 1, existing)
+            continue
+
+        if page_num >= total_pages:
+            logger.warning(f"Page {page_num + 1} out of range, skipping")
+            failed_pages.append(page_num + 1)
+            continue
+
+        pending.append((idx, page_num))
+
+    # Skip or defer pages that almost certainly hold no table before paying for OCR
+    if prefilter and pending and not reparse_from_raw:
+        kept = apply_prefilter(pdf_path, pending, mode=prefilter, threshold=prefilter_threshold)
+        if merger is not None:
+            for page_num in {p for _, p in pending} - {p for _, p in kept}:
+                merger.add_page(page_num + 1, [])
+        pending = kept
+
+    page_index = {page_num: idx for idx, page_num in pending}
+
+    if reparse_from_raw:
+        started = time.monotonic()
+        doc = fitz.open(pdf_path)
+        try:
+            for page_num in [page_num for _, page_num in pending]:
+                logger.info(f"Processing page {page_num + 1} ({page_index[page_num]}/{len(page_list)})")
+                blocks = raw_store.get(_raw_key(_page_hash(doc, page_num), payload, raw_dpi))
+                if blocks is None and manifest.is_done(page_num + 1):
+                    logger.warning(
+                        f"  No raw blocks stored for page {page_num + 1} with these settings; "
+                        f"keeping its existing outputs"
+                    )
+                    table_count += manifest.table_count(page_num + 1)
+                    dataframes = manifest.page_files(page_num + 1)
+                elif blocks is None:
+                    logger.warning(
+                        f"  No raw blocks stored for page {page_num + 1} with these settings; "
+                        f"run without --reparse-from-raw first"
+                    )
+                    failed_pages.append(page_num + 1)
+                    dataframes = []
+                else:
+                    tables = parse_textract_tables(blocks, min_confidence=min_confidence)
+                    tables_saved, dataframes = _save_page_tables(
+                        pdf_path, page_num, tables, output_dir, manifest, output_format
+                    )
+                    table_count += tables_saved
+                if merger is not None:
+                    merger.add_page(page_num + 1, dataframes)
+        finally:
+            doc.close()
+        logger.info(f"Re-parsed {len(pending)} pages in {time.monotonic() - started:.2f}s")
+    elif use_async:
+        jobs = TextractJobs(
+            textract_client,
+            _get_s3_client(aws_access_key_id, aws_secret_access_key, aws_region),
+            s3_bucket,
+            prefix=s3_prefix,
+            poll_interval=poll_interval,
+        )
+        # Jobs run concurrently; each page is saved as soon as its chunk finishes
+        doc = fitz.open(pdf_path)
+        try:
+            for page_num, blocks, error in run_document_analysis(
+                jobs,
+                pdf_path,
+                [page_num for _, page_num in pending],
+                chunk_pages=async_chunk_pages,
+                max_jobs=max_workers,
+            ):
+                logger.info(f"Processing page {page_num + 1} ({page_index[page_num]}/{len(page_list)})")
+                if error is not None:
+                    logger.error(f"  Failed to extract tables from page {page_num + 1}: {error}")
+                    failed_pages.append(page_num + 1)
+                    dataframes = []
+                else:
+                    raw_store.put(_raw_key(_page_hash(doc, page_num), payload, raw_dpi), blocks)
+                    tables = parse_textract_tables(blocks, min_confidence=min_confidence)
+                    logger.info(f"  Found {len(tables)} tables on page {page_num + 1}")
+                    tables_saved, dataframes = _save_page_tables(
+                        pdf_path, page_num, tables, output_dir, manifest, output_format
+                    )
+                    table_count += tables_saved
+                if merger is not None:
+                    merger.add_page(page_num + 1, dataframes)
+        finally:
+            doc.close()
+    else:
+        # In-flight requests follow an AIMD limit: one more after each window of
+        # healthy replies, halved when Textract throttles (throttled pages are
+        # resubmitted). `target_rps` optionally caps the request rate on top.
+        controller = AdaptiveConcurrency(max_workers)
+        limiter = TokenBucket(target_rps) if target_rps else None
+        retry_queue = deque()
+        in_flight = {}
+
+        stats = _InputStats()
+
+        def submit(page_num, document, raw_key, attempts):
+            if limiter is not None:
+                limiter.acquire()
             future = executor.submit(
+                _timed,
                 _process_single_page,
                 pdf_path,
                 page_num,
-                total_pages,
-                idx,
-                len(page_list),
+                document,
                 output_dir,
-                dpi,
                 textract_client,
+                dpi,
+                cache,
+                manifest,
+                output_format,
+                stats,
+                min_confidence,
+                raw_store,
+                raw_key,
             )
-            future_to_page[future] = page_num
-
-        # Collect results as they complete
-        for future in as_completed(future_to_page):
-            page_num, tables_saved, failed, dataframes = future.result()
+            in_flight[future] = (page_num, document, raw_key, attempts, controller.start())
+
+        def collect(future):
+            nonlocal table_count
+
+            page_num, document, raw_key, attempts, epoch = in_flight.pop(future)
+            try:
+                seconds, (page_num, tables_saved, failed, dataframes) = future.result()
+            except Exception as e:
+                # Textract throttling propagates out of _process_single_page, but
+                # so do local failures (writing outputs); only the former is retried
+                if not _is_throttling_error(e):
+                    controller.finish(epoch, error=True)
+                    logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
+                    failed_pages.append(page_num + 1)
+                    if merger is not None:
+                        merger.add_page(page_num + 1, [])
+                    return
+                controller.finish(epoch, throttled=True)
+                if attempts < MAX_THROTTLE_RETRIES:
+                    logger.warning(
+                        f"  Page {page_num + 1} throttled by Textract, retrying "
+                        f"(concurrency now {controller.limit})"
+                    )
+                    retry_queue.append((page_num, document, raw_key, attempts + 1))
+                    return
+                logger.error(f"  Failed to extract tables from page {page_num + 1}: {e}")
+                tables_saved, failed, dataframes = 0, True, []
+            else:
+                controller.finish(epoch, latency=seconds, error=failed)
 
             if failed:
                 failed_pages.append(page_num + 1)
             else:
                 table_count += tables_saved
-                if merge_output:
-                    all_dataframes.extend(dataframes)
+            if merger is not None:
+                merger.add_page(page_num + 1, dataframes)
+
+        def wait_for_slot(drain=False):
+            """Resubmit throttled pages, then block until the limit allows a new request."""
+            while True:
+                while retry_queue and len(in_flight) < controller.limit:
+                    submit(*retry_queue.popleft())
+                if not retry_queue and (not in_flight if drain else len(in_flight) < controller.limit):
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+
+        # Render processes (or one background thread with render_workers=0), each
+        # with its own open document, prepare upcoming pages while the thread
+        # pool only does network I/O. At most max_workers requests plus
+        # render_workers + `prefetch` rendered pages are in memory.
+        open_document = partial(fitz.open, str(pdf_path))
+        prepare_page = partial(_prepare_page, dpi=dpi, textract_input=textract_input)
+        pending_pages = [page_num for _, page_num in pending]
+        if render_workers:
+            renderer = RenderPool(
+                open_document, pending_pages, prepare_page, workers=render_workers, prefetch=prefetch
+            )
+        else:
+            renderer = RenderAhead(open_document, pending_pages, prepare_page, prefetch=prefetch)
 
-    doc.close()
+        with renderer, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page_num, prepared, error in renderer:
+                logger.info(f"Processing page {page_num + 1} ({page_index[page_num]}/{len(page_list)})")
+
+                if error is not None:
+                    logger.error(f"  Failed to render page {page_num + 1}: {error}")
+                    failed_pages.append(page_num + 1)
+                    if merger is not None:
+                        merger.add_page(page_num + 1, [])
+                    continue
+
+                document, page_hash = prepared
+                submit(page_num, document, _raw_key(page_hash, payload, raw_dpi), 0)
+
+                # Backpressure: block rendering until the concurrency limit frees a slot
+                wait_for_slot()
+
+            wait_for_slot(drain=True)
+
+        if pending:
+            logger.info(
+                f"Adaptive concurrency: settled at {controller.limit} requests in flight "
+                f"(peak {controller.peak}, max {max_workers}, {controller.backoffs} throttling backoffs)"
+            )
+            stats.log()
+
+    manifest.close()
 
     # Log statistics
     successful_pages = len(page_list) - len(failed_pages)
@@ -446,28 +903,11 @@ def extract_tables_with_textract(
     )
     if failed_pages:
         logger.warning(f"Failed pages: {', '.join(map(str, failed_pages))}")
+    if cache is not None:
+        logger.info(f"Response cache: {cache.hits} hits, {cache.misses} misses")
 
-    # Merge all tables if requested
-    if merge_output and all_dataframes:
-        # Standardize column names before merge
-        for df in all_dataframes:
-            df.columns = df.columns.str.replace(" ", "_")
-
-        # Sort dataframes by page number using natural sort
-        all_csv_files = sorted(
-            list(output_dir.glob(f"{pdf_path.stem}_page*.csv")), key=natural_sort_key
-        )
-
-        sorted_dataframes = []
-        for csv_file in all_csv_files:
-            df = pd.read_csv(csv_file, encoding="utf-8-sig")
-            df.columns = df.columns.str.replace(" ", "_")
-            sorted_dataframes.append(df)
-
-        merged_df = pd.concat(sorted_dataframes, ignore_index=True)
-
-        merged_file = output_dir / f"{pdf_path.stem}_merged.csv"
-        merged_df.to_csv(merged_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Merged all tables into: {merged_file} ({merged_df.shape})")
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
 
     return table_count
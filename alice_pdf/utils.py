@@ -0,0 +1,41 @@
+"""
+Helpers shared by the local table engines.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def selected_pages(pages, page_count):
+    """Return the 1-based page numbers selected by a page string ('all', '1-3,5')."""
+    if pages == "all":
+        return list(range(1, page_count + 1))
+
+    # Same syntax as Camelot: "1,3,5" or "1-3"
+    page_numbers = []
+    for part in pages.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, end = part.split("-")
+            page_numbers.extend(range(int(start), int(end) + 1))
+        else:
+            page_numbers.append(int(part))
+    return page_numbers
+
+
+def non_empty_mask(values, nan_is_empty=True):
+    """
+    Boolean mask of cells that hold text once stripped.
+
+    Args:
+        values: 2-D object array of cells
+        nan_is_empty: If True, None and NaN are empty (``pd.notna(v) and
+            str(v).strip()``). If False, only None is, while NaN (how pandas
+            stores missing strings) counts as text (``v and str(v).strip()``)
+
+    Returns:
+        Boolean array shaped like `values`
+    """
+    present = pd.notna(values) if nan_is_empty else np.not_equal(values, None)
+    text = np.where(present, values, "").astype(str)
+    return present & (np.strings.str_len(np.strings.strip(text)) > 0)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Extract borderless tables by clustering word coordinates.
+Word boxes are read once per page with PyMuPDF ``page.get_text("words")`` and
+grouped into rows (shared baselines) and columns (vertical whitespace gaps)
+with NumPy, without any table finder.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import numpy as np
+import pandas as pd
+
+from .manifest import ResumeManifest
+from .merge import MergeWriter, positional_columns
+from .output import OUTPUT_EXTENSIONS, write_table
+from .utils import selected_pages
+
+logger = logging.getLogger(__name__)
+
+# Words whose baselines differ by less than this share of the median word
+# height sit on the same row
+ROW_TOLERANCE = 0.3
+
+# Whitespace between two records (last line of one, first line of the next)
+# wider than this many times its median on the page, and than one record
+# pitch, starts a new block
+BLOCK_GAP = 3.0
+
+# Lines between two table rows join the nearest one when closer than this
+# many record pitches (median distance between table rows)
+WRAP_REACH = 2.0
+
+# A line holding at most this many cells, and at least this many fewer than
+# the widest line of the page, is wrapped text of a taller table row
+WRAP_CELLS = 2
+
+
+def _page_words(page):
+    """Return word boxes as a (n, 4) float array (x0, y0, x1, y1) and their texts."""
+    words = page.get_text("words")
+    boxes = np.array([w[:4] for w in words], dtype=float).reshape(-1, 4)
+    texts = np.array([w[4] for w in words], dtype=object)
+    return boxes, texts
+
+
+def _starts(new_group):
+    """Indices where a group starts in a sorted array, given its "starts here" mask."""
+    new_group[0] = True
+    return np.flatnonzero(new_group)
+
+
+def _join(texts, starts):
+    """Join the words of each group (consecutive runs beginning at `starts`) with spaces."""
+    return np.strings.strip(np.add.reduceat(texts + " ", starts).astype(str))
+
+
+def _page_cells(boxes, texts, col_gap):
+    """
+    Cluster one page's words into rows and, within each row, into cells.
+
+    Words sharing a baseline form a row; inside a row a horizontal gap wider
+    than ``col_gap`` times the median word height separates two cells.
+
+    Returns:
+        (row_y, cell_row, cell_x0, cell_x1, cell_text): baseline of each row
+        (top to bottom) and, for each cell in reading order, its row index,
+        horizontal extent and text
+    """
+    x0, y1, x1 = boxes[:, 0], boxes[:, 3], boxes[:, 2]
+    height = float(np.median(boxes[:, 3] - boxes[:, 1]))
+
+    order = np.argsort(y1, kind="stable")
+    row_starts = _starts(np.diff(y1[order], prepend=y1[order[0]]) > ROW_TOLERANCE * height)
+    row = np.empty(len(order), dtype=np.intp)
+    row[order] = np.repeat(np.arange(len(row_starts)), np.diff(row_starts, append=len(order)))
+    row_y = y1[order][row_starts]
+
+    # Reading order: rows top to bottom, words left to right
+    order = np.lexsort((x0, row))
+    row, x0, x1, texts = row[order], x0[order], x1[order], texts[order]
+    gap = x0 - np.roll(x1, 1)
+    cell_starts = _starts((np.diff(row, prepend=row[0]) != 0) | (gap > col_gap * height))
+
+    return (
+        row_y,
+        row[cell_starts],
+        np.minimum.reduceat(x0, cell_starts),
+        np.maximum.reduceat(x1, cell_starts),
+        _join(texts, cell_starts),
+    )
+
+
+def _records(row_y, counts, min_cols):
+    """
+    Group the lines of a page into table records and records into blocks.
+
+    Lines with ``min_cols`` or more cells that are not wrapped text (see
+    ``WRAP_CELLS``) are record rows. Every other line joins the nearest
+    record row, the one above on ties, so a cell wrapped over several lines
+    (above, below or around the row it belongs to) becomes one cell. Lines
+    between two record rows join within ``WRAP_REACH`` record pitches;
+    lines before the first or after the last (titles, notes) only within
+    half a pitch.
+
+    Blocks split where the whitespace between two records, from the last
+    line of one to the first line of the next, is wider than both one record
+    pitch and ``BLOCK_GAP`` times its median on the page, so tall records of
+    wrapped cells stay in one table. Lines between two blocks also join only
+    within half a pitch.
+
+    Returns:
+        (record, block): record index of each line (-1 for lines outside any
+        table) and block index of each record
+    """
+    wrapped = counts <= min(WRAP_CELLS, counts.max() - WRAP_CELLS)
+    anchors = np.flatnonzero(~wrapped & (counts >= min_cols))
+    if not len(anchors):
+        return np.full(len(row_y), -1), anchors
+
+    # One record row: fall back to the line pitch
+    anchor_y = row_y[anchors]
+    steps = np.diff(anchor_y if len(anchors) > 1 else row_y)
+    pitch = np.median(steps) if len(steps) else 0.0
+
+    below = np.searchsorted(anchor_y, row_y)
+    above = below - 1
+    up = np.where(above >= 0, row_y - anchor_y[np.maximum(above, 0)], np.inf)
+    down = np.where(below < len(anchors), anchor_y[np.minimum(below, len(anchors) - 1)] - row_y, np.inf)
+    nearest = np.where(up <= down, above, below)
+    distance = np.minimum(up, down)
+    between = (above >= 0) & (below < len(anchors))
+    record = np.where(distance < np.where(between, WRAP_REACH * pitch, pitch / 2), nearest, -1)
+
+    # Lines are sorted top to bottom and so are their records
+    attached = record >= 0
+    first = np.unique(record[attached], return_index=True)[1]
+    last = np.unique(record[attached][::-1], return_index=True)[1]
+    top, bottom = row_y[attached][first], row_y[attached][::-1][last]
+    spacing = top[1:] - bottom[:-1]
+    block = np.zeros(len(anchors), dtype=np.intp)
+    if len(spacing):
+        block[1:] = np.cumsum(spacing > max(BLOCK_GAP * np.median(spacing), pitch))
+
+    split = between & (block[np.maximum(above, 0)] != block[np.minimum(below, len(anchors) - 1)])
+    record[split & (distance > pitch / 2)] = -1
+    return record, block
+
+
+def _extents(rows, left, right):
+    """
+    Join the overlapping cells of each record (a cell wrapped over several
+    lines) into one horizontal extent.
+
+    Returns:
+        (row, left, right) of each extent, sorted by record and left edge
+    """
+    # Shifting each record into its own band lets one sweep cover all records
+    shift = rows * (right.max() - left.min() + 1)
+    order = np.lexsort((left, rows))
+    reach = np.maximum.accumulate((right + shift)[order])
+    starts = _starts(np.concatenate(([False], (left + shift)[order][1:] > reach[:-1])))
+    return rows[order][starts], left[order][starts], np.maximum.reduceat(right[order], starts)
+
+
+def _grid(rows, left, right, text, n_rows):
+    """
+    Lay the cells of ``n_rows`` table records out on a column grid.
+
+    Columns are the union of the horizontal extents of the records (see
+    `_extents`): sorted by left edge, an extent that starts right of every
+    extent seen so far opens a new column. Extents overlapping two or more
+    extents in more records than they overlap a single one (titles, spanning
+    notes) are left out, so they do not join columns. Every cell then goes
+    to the column holding its centre; cells landing in the same slot are
+    joined in reading order.
+
+    Args:
+        rows: Record index (0..n_rows-1) of each cell, in reading order
+        left, right, text: Horizontal extent and text of each cell
+
+    Returns:
+        2-D object array of cell texts ("" where empty)
+    """
+    ext_row, ext_left, ext_right = _extents(rows, left, right)
+    overlap = (ext_left[:, None] < ext_right) & (ext_right[:, None] > ext_left) & (ext_row[:, None] != ext_row)
+    per_record = np.add.reduceat(overlap, _starts(np.diff(ext_row, prepend=ext_row[0]) != 0), axis=1)
+    ruling = (per_record >= 2).sum(axis=1) <= (per_record == 1).sum(axis=1)
+    if not ruling.any():
+        ruling[:] = True
+
+    order = np.argsort(ext_left[ruling], kind="stable")
+    col_left, col_right = ext_left[ruling][order], ext_right[ruling][order]
+    reach = np.maximum.accumulate(col_right)
+    col_edges = col_left[_starts(np.concatenate(([False], col_left[1:] > reach[:-1])))]
+
+    col = np.clip(np.searchsorted(col_edges, (left + right) / 2, side="right") - 1, 0, None)
+    slot = rows * len(col_edges) + col
+    order = np.argsort(slot, kind="stable")
+    slot_starts = _starts(np.diff(slot[order], prepend=slot[order][0]) != 0)
+
+    grid = np.full((n_rows, len(col_edges)), "", dtype=object)
+    grid.ravel()[slot[order][slot_starts]] = _join(text[order].astype(object), slot_starts)
+    return grid
+
+
+def _grid_to_dataframe(grid, page_num):
+    """
+    Turn a cell grid into a headless DataFrame (col_0, col_1, ...) with a page column.
+
+    No row is taken as header: on most pages of a long table the first row
+    is data.
+    """
+    df = pd.DataFrame(grid, columns=[f"col_{i}" for i in range(grid.shape[1])])
+    df.insert(0, "page", page_num)
+    return df
+
+
+def _page_tables(page, page_num, col_gap=0.5, min_rows=2, min_cols=2):
+    """
+    Find the borderless tables of one page.
+
+    Lines are grouped into records, one per table row with its wrapped
+    lines, and records into blocks (see `_records`). A block holding at
+    least ``min_rows`` records yields one table with a row per record.
+
+    Returns:
+        List of DataFrames with a leading "page" column
+    """
+    boxes, texts = _page_words(page)
+    if not len(texts):
+        return []
+
+    row_y, cell_row, cell_x0, cell_x1, cell_text = _page_cells(boxes, texts, col_gap)
+    record, block = _records(row_y, np.bincount(cell_row, minlength=len(row_y)), min_cols)
+    cell_record = record[cell_row]
+
+    frames = []
+    block_starts = _starts(np.diff(block, prepend=-1) != 0) if len(block) else block
+    for start, end in zip(block_starts, np.append(block_starts[1:], len(block))):
+        if end - start < min_rows:
+            continue
+        in_block = (cell_record >= start) & (cell_record < end)
+        grid = _grid(
+            cell_record[in_block] - start, cell_x0[in_block], cell_x1[in_block], cell_text[in_block], end - start
+        )
+        frames.append(_grid_to_dataframe(grid, page_num))
+    return frames
+
+
+def extract_tables_with_words(
+    pdf_path,
+    output_dir,
+    pages="all",
+    merge_output=False,
+    resume=True,
+    col_gap=0.5,
+    min_rows=2,
+    min_cols=2,
+    output_format="csv",
+):
+    """
+    Extract borderless tables from PDF by clustering word coordinates.
+
+    Args:
+        pdf_path: Path to PDF file
+        output_dir: Output directory for CSV files
+        pages: Pages to process ('all', '1', '1-3', '1,3,5')
+        merge_output: If True, merge all tables into single CSV
+        resume: If True, skip pages recorded as done in the resume manifest
+        col_gap: Smallest horizontal gap between two cells, as a fraction of
+            the median word height (word spaces are narrower)
+        min_rows: Minimum rows with at least ``min_cols`` cells for a table
+        min_cols: Minimum cells for a row to count as a table row
+        output_format: Table file format ('csv', 'parquet' or 'arrow') for
+            per-page and merged outputs
+
+    Returns:
+        Number of tables extracted
+    """
+    if col_gap <= 0:
+        raise ValueError(f"col_gap must be positive, got {col_gap!r}")
+    if min_rows < 1 or min_cols < 1:
+        raise ValueError(f"min_rows and min_cols must be >= 1, got {min_rows} and {min_cols}")
+
+    pdf_path = Path(pdf_path)
+    output_dir = Path(output_dir)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ext = OUTPUT_EXTENSIONS[output_format]
+
+    # Delete merged file if exists
+    if merge_output:
+        merged_file = output_dir / f"{pdf_path.stem}_merged{ext}"
+        if merged_file.exists():
+            merged_file.unlink()
+            logger.info(f"Deleted previous merged file: {merged_file.name}")
+
+    logger.info(f"Processing PDF: {pdf_path}")
+    logger.info(f"Column gap: {col_gap}, Pages: {pages}")
+
+    table_count = 0
+    doc = None
+    manifest = None
+    merger = None
+
+    try:
+        doc = fitz.open(pdf_path)
+
+        page_list = []
+        for page_num in selected_pages(pages, doc.page_count):
+            if not 1 <= page_num <= doc.page_count:
+                logger.warning(f"Page {page_num} out of range, skipping")
+            elif page_num not in page_list:
+                page_list.append(page_num)
+
+        # Per-page resume state; partial pages of an interrupted run are discarded
+        manifest = ResumeManifest(output_dir, pdf_path.stem, resume=resume, pages=page_list)
+
+        # Headless merge using positional columns (col_0, col_1, ...), as for
+        # Camelot: only the first page of a long table usually has a header
+        if merge_output:
+            merger = MergeWriter(
+                output_dir / f"{pdf_path.stem}_merged{ext}",
+                sorted(page_list),
+                column_names=positional_columns,
+                output_format=output_format,
+            )
+
+        for idx, page_num in enumerate(page_list, start=1):
+            # Check if page already processed (resume mode)
+            if manifest.is_done(page_num):
+                logger.info(f"Page {page_num} ({idx}/{len(page_list)}) - already processed, skipping")
+                if merger is not None:
+                    merger.add_page(page_num, manifest.page_files(page_num))
+                table_count += manifest.table_count(page_num)
+                continue
+
+            logger.info(f"Processing page {page_num} ({idx}/{len(page_list)})")
+            started = time.monotonic()
+
+            frames = _page_tables(doc[page_num - 1], page_num, col_gap, min_rows, min_cols)
+            if frames:
+                logger.info(f"  Found {len(frames)} table(s) on page {page_num}")
+            else:
+                logger.info(f"  No tables found on page {page_num}")
+
+            # Tables are numbered per page in order of appearance
+            output_files = [
+                output_dir / f"{pdf_path.stem}_page{page_num}_table{k}{ext}" for k in range(len(frames))
+            ]
+            manifest.begin_page(page_num, output_files)
+
+            for df, output_file in zip(frames, output_files):
+                # Save individual table file
+                write_table(df, output_file, output_format)
+                logger.info(f"  Saved: {output_file}")
+
+                table_count += 1
+
+            manifest.finish_page(page_num, output_files, seconds=time.monotonic() - started)
+            if merger is not None:
+                merger.add_page(page_num, frames)
+
+    except Exception as e:
+        logger.error(f"Word clustering extraction failed: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        if merger is not None:
+            merger.abort()
+        raise
+    finally:
+        if manifest is not None:
+            manifest.close()
+        if doc is not None:
+            doc.close()
+
+    if table_count == 0:
+        logger.warning("No tables found in PDF")
+
+    # Flush pages still buffered and finalise the merged header
+    if merger is not None:
+        merger.close()
+
+    return table_count
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local engines side by side (Camelot, pdfplumber, PyMuPDF, word clustering).
+
+Runs each engine on each PDF with default settings into a temporary
+directory and reports wall time, pages/second, tables found and data rows
+written. Engines that are not installed, or fail on a file, are reported
+and skipped.
+
+Usage:
+    python benchmarks/bench_engines.py                      # every PDF in sample/
+    python benchmarks/bench_engines.py input.pdf --pages 1-20 --engines words pymupdf
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+from alice_pdf.output import read_table
+from alice_pdf.utils import selected_pages
+
+
+def _camelot(pdf_path, output_dir, pages):
+    from alice_pdf.camelot_extractor import extract_tables_with_camelot
+
+    return extract_tables_with_camelot(pdf_path, output_dir, pages=pages, resume=False)
+
+
+def _pdfplumber(pdf_path, output_dir, pages):
+    from alice_pdf.pdfplumber_extractor import extract_tables_with_pdfplumber
+
+    return extract_tables_with_pdfplumber(pdf_path, output_dir, pages=pages, resume=False)
+
+
+def _pymupdf(pdf_path, output_dir, pages):
+    from alice_pdf.pymupdf_extractor import extract_tables_with_pymupdf
+
+    return extract_tables_with_pymupdf(pdf_path, output_dir, pages=pages, resume=False)
+
+
+def _words(pdf_path, output_dir, pages):
+    from alice_pdf.words_extractor import extract_tables_with_words
+
+    return extract_tables_with_words(pdf_path, output_dir, pages=pages, resume=False)
+
+
+ENGINES = {"camelot": _camelot, "pdfplumber": _pdfplumber, "pymupdf": _pymupdf, "words": _words}
+
+
+def run(engine, pdf_path, pages):
+    """Run one engine; return (seconds, tables, rows) or the error message."""
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        try:
+            tables = ENGINES[engine](pdf_path, tmp, pages)
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        seconds = time.perf_counter() - started
+        rows = sum(len(read_table(path)) for path in Path(tmp).glob("*_page*_table*.csv"))
+    return seconds, tables, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_paths", nargs="*", help="PDFs to process (default: sample/*.pdf)")
+    parser.add_argument("--pages", default="all", help="Pages to process (default: all)")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    args = parser.parse_args()
+
+    # Per-page engine logs would drown the table
+    logging.disable(logging.WARNING)
+
+    pdf_paths = args.pdf_paths or sorted(str(p) for p in Path("sample").glob("*.pdf"))
+    totals = {engine: [0.0, 0, 0, 0] for engine in args.engines}
+
+    print(f"{'file':45s} {'engine':11s} {'seconds':>8s} {'pages/s':>8s} {'tables':>7s} {'rows':>7s}")
+    for pdf_path in pdf_paths:
+        with fitz.open(pdf_path) as doc:
+            page_count = len(selected_pages(args.pages, doc.page_count))
+        name = Path(pdf_path).name[:45]
+        for engine in args.engines:
+            result = run(engine, pdf_path, args.pages)
+            if isinstance(result, str):
+                print(f"{name:45s} {engine:11s} skipped ({result[:60]})")
+                continue
+            seconds, tables, rows = result
+            print(f"{name:45s} {engine:11s} {seconds:8.2f} {page_count / seconds:8.2f} {tables:7d} {rows:7d}")
+            for i, value in enumerate((seconds, page_count, tables, rows)):
+                totals[engine][i] += value
+
+    print()
+    for engine, (seconds, pages, tables, rows) in totals.items():
+        if seconds:
+            print(f"{'TOTAL':45s} {engine:11s} {seconds:8.2f} {pages / seconds:8.2f} {tables:7d} {rows:7d}")
+
+
+if __name__ == "__main__":
+    main()
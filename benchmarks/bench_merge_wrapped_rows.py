@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Camelot ``merge_wrapped_rows``, previous row-by-row loop vs NumPy mask version.
+
+Builds a Camelot-like string table where a share of the rows are wrapped
+address lines (only one column filled), checks both versions return the
+same frame and times them.
+
+Usage:
+    python benchmarks/bench_merge_wrapped_rows.py [--rows 20000 --cols 8 --wrapped 0.2]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from alice_pdf.camelot_extractor import merge_wrapped_rows
+
+
+def legacy_merge_wrapped_rows(df, max_non_null=2):
+    """Implementation used before the vectorised version (kept here for comparison)."""
+    if df.empty or len(df) < 2:
+        return df
+
+    merged_rows = []
+    skip_next = False
+    for i in range(len(df)):
+        if skip_next:
+            skip_next = False
+            continue
+        row = df.iloc[i]
+        non_empty_count = sum(1 for val in row if pd.notna(val) and str(val).strip())
+        if non_empty_count <= max_non_null and i < len(df) - 1:
+            next_row = df.iloc[i + 1].copy()
+            for col_idx in range(len(row)):
+                if pd.notna(row.iloc[col_idx]) and str(row.iloc[col_idx]).strip():
+                    if pd.notna(next_row.iloc[col_idx]):
+                        next_row.iloc[col_idx] = f"{row.iloc[col_idx]} {next_row.iloc[col_idx]}"
+                    else:
+                        next_row.iloc[col_idx] = row.iloc[col_idx]
+            merged_rows.append(next_row)
+            skip_next = True
+            continue
+        merged_rows.append(row)
+
+    if merged_rows:
+        return pd.DataFrame([row.values for row in merged_rows], columns=df.columns).reset_index(drop=True)
+    return df.iloc[:0].copy()
+
+
+def camelot_like_table(rows, cols, wrapped, seed=0):
+    """String table with `wrapped` share of rows holding only a continuation in column 1."""
+    rng = np.random.default_rng(seed)
+    data = []
+    for i in range(rows):
+        if rng.random() < wrapped:
+            data.append([""] + [f"scala {i}"] + [""] * (cols - 2))
+        else:
+            data.append([str(i), f"Via Roma {i}", "PALERMO"] + [f"{rng.integers(0, 10_000)}" for _ in range(cols - 3)])
+    return pd.DataFrame(data, columns=[f"col{j}" for j in range(cols)])
+
+
+def timed(func, df):
+    started = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cols", type=int, default=8)
+    parser.add_argument("--wrapped", type=float, default=0.2, help="Share of wrapped rows (default: 0.2)")
+    args = parser.parse_args()
+
+    df = camelot_like_table(args.rows, args.cols, args.wrapped)
+    print(f"Table: {args.rows} rows x {args.cols} columns, ~{args.wrapped:.0%} wrapped rows")
+
+    legacy, legacy_seconds = timed(legacy_merge_wrapped_rows, df)
+    vectorised, vectorised_seconds = timed(merge_wrapped_rows, df)
+    pd.testing.assert_frame_equal(vectorised, legacy)
+
+    print(f"  row-by-row   {legacy_seconds * 1000:10.1f} ms")
+    print(f"  vectorised   {vectorised_seconds * 1000:10.1f} ms  ({legacy_seconds / vectorised_seconds:.0f}x faster)")
+    print(f"  {len(df)} -> {len(vectorised)} rows, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
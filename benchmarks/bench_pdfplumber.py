@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pdfplumber engine peak memory and throughput on a large PDF.
+
+Builds a long document by repeating the pages of a sample PDF, then runs
+``extract_tables_with_pdfplumber`` on it in a fresh child process and
+reports peak RSS (``ru_maxrss``) and pages/second for each ``--workers``
+value. Each run gets its own process, so peak RSS is not inflated by
+earlier runs; with workers, the largest worker peak is reported too.
+
+Usage:
+    python benchmarks/bench_pdfplumber.py sample/edilizia-residenziale_comune_2024_PATRIMONIO.pdf
+    python benchmarks/bench_pdfplumber.py input.pdf --pages 100 --workers 1 2 4
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+
+def build_pdf(source, pages, target):
+    """Write `target` with `pages` pages, cycling through the pages of `source`."""
+    src = fitz.open(source)
+    doc = fitz.open()
+    while doc.page_count < pages:
+        last = min(src.page_count, pages - doc.page_count) - 1
+        doc.insert_pdf(src, from_page=0, to_page=last)
+    doc.save(target, garbage=3, deflate=True)
+    doc.close()
+    src.close()
+
+
+def child(pdf_path, output_dir, kwargs):
+    """Run one extraction and print its stats as JSON (child process)."""
+    from alice_pdf.pdfplumber_extractor import extract_tables_with_pdfplumber
+
+    started = time.perf_counter()
+    tables = extract_tables_with_pdfplumber(pdf_path, output_dir, resume=False, **kwargs)
+    seconds = time.perf_counter() - started
+    # ru_maxrss is in KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    worker_peak_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({"tables": tables, "seconds": seconds, "peak_mb": peak_mb, "worker_peak_mb": worker_peak_mb}))
+
+
+def run(pdf_path, output_dir, kwargs):
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", str(pdf_path), str(output_dir), json.dumps(kwargs)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3], json.loads(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_path")
+    parser.add_argument("--pages", type=int, default=100, help="Pages of the generated PDF (default: 100)")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1], help="Worker counts to compare (default: 1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big_pdf = Path(tmp) / "big.pdf"
+        build_pdf(args.pdf_path, args.pages, big_pdf)
+        print(f"{args.pages} pages built from {args.pdf_path}")
+
+        for workers in args.workers:
+            stats = run(big_pdf, Path(tmp) / f"out{workers}", {"workers": workers})
+            print(
+                f"  {workers:2d} worker{'s' if workers != 1 else ' '}  {stats['seconds']:7.1f}s  "
+                f"{args.pages / stats['seconds']:6.2f} pages/s  "
+                f"peak RSS {stats['peak_mb']:7.1f} MB (worker {stats['worker_peak_mb']:6.1f} MB)  "
+                f"({stats['tables']} tables)"
+            )
+
+if __name__ == "__main__":
+    main()
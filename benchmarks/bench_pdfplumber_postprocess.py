@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pdfplumber table post-processing, previous row-wise code vs vectorised.
+
+Builds a pdfplumber-like table (lists of strings and None, header row with an
+"Id. Cespite" column, padded cells and some multi-line Id. Cespite cells),
+runs header detection, text stripping and Id. Cespite redistribution with
+both versions, checks they give the same values and times them.
+
+Usage:
+    python benchmarks/bench_pdfplumber_postprocess.py [--rows 50000 --cols 8 --multiline 0.01]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from alice_pdf.pdfplumber_extractor import _table_to_dataframe
+
+
+def legacy_distribute_id_cespite_values(df, id_cespite_col="Id. Cespite"):
+    """Row-by-row redistribution used before the vectorised version."""
+    if df.empty or id_cespite_col not in df.columns:
+        return df.copy()
+    df_fixed = df.copy()
+    rows_to_process = []
+    for idx, row in df.iterrows():
+        id_cell = row[id_cespite_col]
+        if pd.notna(id_cell) and '\n' in str(id_cell):
+            rows_to_process.append(idx)
+    if not rows_to_process:
+        return df
+    all_id_values = []
+    for idx in rows_to_process:
+        id_cell = df.iloc[idx][id_cespite_col]
+        all_id_values.extend(line.strip() for line in str(id_cell).split('\n') if line.strip().isdigit())
+    for i, row_idx in enumerate(rows_to_process):
+        df_fixed.loc[row_idx, id_cespite_col] = all_id_values[i] if i < len(all_id_values) else all_id_values[-1]
+    return df_fixed
+
+
+def legacy_table_to_dataframe(table_data, page_num, strip_text):
+    """Row-wise post-processing used before the vectorised version."""
+    df = pd.DataFrame(table_data)
+    first_row_non_empty = sum(1 for cell in df.iloc[0] if cell and str(cell).strip())
+    avg_non_empty = df.apply(lambda row: sum(1 for cell in row if cell and str(cell).strip()), axis=1).mean()
+    if first_row_non_empty >= avg_non_empty * 0.8 and first_row_non_empty > 0:
+        headers = df.iloc[0].fillna('').astype(str)
+        if strip_text:
+            headers = headers.str.strip()
+        df = df[1:].reset_index(drop=True)
+        df.columns = headers
+    else:
+        df.columns = [f"col_{i}" for i in range(len(df.columns))]
+    if strip_text:
+        df = df.map(lambda x: x.strip() if isinstance(x, str) and x else x)
+    df.insert(0, "page", page_num)
+    df_fixed = legacy_distribute_id_cespite_values(df)
+    df_fixed.equals(df)  # the caller compared the frames to log the fix
+    return df_fixed
+
+
+def pdfplumber_like_table(rows, cols, multiline, seed=0):
+    """Header row plus `rows` data rows; `multiline` share of multi-line Id. Cespite cells."""
+    rng = np.random.default_rng(seed)
+    data = [["Id. Cespite", "Indirizzo", "Comune"] + [f"Colonna {j}" for j in range(3, cols)]]
+    for i in range(rows):
+        if rng.random() < multiline:
+            id_cell = "\n".join(str(v) for v in rng.integers(1, 500, size=3))
+        else:
+            id_cell = f" {i} "
+        row = [id_cell, f"Via Roma {i} ", " PALERMO"]
+        row += [None if rng.random() < 0.2 else f" {rng.integers(0, 10_000)} " for _ in range(cols - 3)]
+        data.append(row)
+    return data
+
+
+def timed(func, table_data):
+    started = time.perf_counter()
+    result = func(table_data, 1, True)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--cols", type=int, default=8)
+    parser.add_argument("--multiline", type=float, default=0.01, help="Share of multi-line Id. Cespite cells")
+    args = parser.parse_args()
+
+    table_data = pdfplumber_like_table(args.rows, args.cols, args.multiline)
+    print(f"Table: {args.rows} rows x {args.cols} columns, ~{args.multiline:.0%} multi-line Id. Cespite cells")
+
+    legacy, legacy_seconds = timed(legacy_table_to_dataframe, table_data)
+    vectorised, vectorised_seconds = timed(_table_to_dataframe, table_data)
+    pd.testing.assert_frame_equal(vectorised, legacy, check_dtype=False)
+
+    print(f"  row-wise     {legacy_seconds * 1000:10.1f} ms")
+    print(f"  vectorised   {vectorised_seconds * 1000:10.1f} ms  ({legacy_seconds / vectorised_seconds:.0f}x faster)")
+    print("  outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Textract page preparation in one render thread vs a process pool.
+
+Renders the selected pages exactly as the Textract sync path does (payload
+plus page hash) while a pool of I/O threads simulates request latency with
+``time.sleep``, which releases the GIL like a real socket wait. Reports
+pages/second for ``RenderAhead`` (render_workers=0) and ``RenderPool`` with
+1..N processes, N defaulting to ``default_render_workers()`` (CPU count - 1).
+
+Usage:
+    python benchmarks/bench_render_pool.py sample/edilizia-residenziale_comune_2024.pdf
+    python benchmarks/bench_render_pool.py input.pdf --pages 40 --latency 0.3 --io-threads 5
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import fitz
+
+from alice_pdf.rendering import RenderAhead, RenderPool, default_render_workers
+from alice_pdf.textract_extractor import _prepare_page
+
+
+def run(renderer, io_threads, latency):
+    """Consume the renderer, handing each page to an I/O thread; return seconds."""
+    started = time.perf_counter()
+    with renderer, ThreadPoolExecutor(max_workers=io_threads) as executor:
+        futures = [executor.submit(time.sleep, latency) for _ in renderer]
+        for future in futures:
+            future.result()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf_path")
+    parser.add_argument("--pages", type=int, default=40, help="Pages to render (default: 40)")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--textract-input", choices=["png", "pdf"], default="png")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per request (default: 0)")
+    parser.add_argument("--io-threads", type=int, default=5, help="Request threads (default: 5)")
+    parser.add_argument("--max-processes", type=int, default=default_render_workers())
+    args = parser.parse_args()
+
+    doc = fitz.open(args.pdf_path)
+    page_nums = list(range(min(args.pages, len(doc))))
+    doc.close()
+
+    open_document = partial(fitz.open, args.pdf_path)
+    prepare = partial(_prepare_page, dpi=args.dpi, textract_input=args.textract_input)
+
+    print(
+        f"{len(page_nums)} pages, {args.textract_input} at {args.dpi} DPI, "
+        f"{args.io_threads} I/O threads, {args.latency}s simulated latency"
+    )
+    seconds = run(RenderAhead(open_document, page_nums, prepare), args.io_threads, args.latency)
+    print(f"  render thread       {seconds:7.2f}s  {len(page_nums) / seconds:6.1f} pages/s")
+    for workers in range(1, args.max_processes + 1):
+        renderer = RenderPool(open_document, page_nums, prepare, workers=workers)
+        seconds = run(renderer, args.io_threads, args.latency)
+        print(f"  {workers:2d} render processes {seconds:7.2f}s  {len(page_nums) / seconds:6.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: Textract block parsing, previous scan-based parser vs indexed parser.
+
+Builds a synthetic ``analyze_document`` response shaped like a real one
+(PAGE, LINE, WORD, TABLE and CELL blocks with CHILD relationships) and times
+both parsers on it. Optionally a recorded response can be passed as a JSON
+file instead.
+
+Usage:
+    python benchmarks/bench_textract_parser.py [--tables 4 --rows 80 --cols 10]
+    python benchmarks/bench_textract_parser.py --response recorded_response.json
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from alice_pdf.textract_extractor import parse_textract_tables
+
+
+def legacy_parse(blocks):
+    """Parser used before the Id index (kept here for comparison)."""
+    table_blocks = [block for block in blocks if block["BlockType"] == "TABLE"]
+    tables = []
+    for _ in table_blocks:
+        cells = [
+            block
+            for block in blocks
+            if block["BlockType"] == "CELL" and block.get("Confidence", 0) > 30
+        ]
+        if not cells:
+            continue
+        table_data = {}
+        max_row = 0
+        max_col = 0
+        for cell in cells:
+            row_index = cell["RowIndex"]
+            col_index = cell["ColumnIndex"]
+            max_row = max(max_row, row_index)
+            max_col = max(max_col, col_index)
+            cell_text = ""
+            for relationship in cell.get("Relationships", []):
+                if relationship.get("Type") == "CHILD":
+                    child_ids = relationship.get("Ids", [])
+                    for block in blocks:
+                        if block.get("Id") in child_ids:
+                            if block["BlockType"] == "WORD":
+                                cell_text += block.get("Text", "") + " "
+            table_data[(row_index, col_index)] = cell_text.strip()
+        headers = [table_data.get((1, col), "") for col in range(1, max_col + 1)]
+        rows = [
+            [table_data.get((row, col), "") for col in range(1, max_col + 1)]
+            for row in range(2, max_row + 1)
+        ]
+        tables.append({"headers": headers, "rows": rows})
+    return tables
+
+
+def synthetic_response(n_tables, n_rows, n_cols, words_per_cell=2):
+    """Build a Textract-like response with `n_tables` tables on one page."""
+
+    def new_id():
+        return str(uuid.uuid4())
+
+    blocks = []
+    page = {"BlockType": "PAGE", "Id": new_id(), "Relationships": [{"Type": "CHILD", "Ids": []}]}
+    blocks.append(page)
+
+    for t in range(n_tables):
+        table = {
+            "BlockType": "TABLE",
+            "Id": new_id(),
+            "Confidence": 99.0,
+            "Relationships": [{"Type": "CHILD", "Ids": []}],
+        }
+        blocks.append(table)
+        for r in range(1, n_rows + 1):
+            line = {"BlockType": "LINE", "Id": new_id(), "Relationships": [{"Type": "CHILD", "Ids": []}]}
+            blocks.append(line)
+            page["Relationships"][0]["Ids"].append(line["Id"])
+            for c in range(1, n_cols + 1):
+                word_ids = []
+                for w in range(words_per_cell):
+                    word = {"BlockType": "WORD", "Id": new_id(), "Text": f"t{t}r{r}c{c}w{w}", "Confidence": 99.0}
+                    blocks.append(word)
+                    word_ids.append(word["Id"])
+                    line["Relationships"][0]["Ids"].append(word["Id"])
+                cell = {
+                    "BlockType": "CELL",
+                    "Id": new_id(),
+                    "RowIndex": r,
+                    "ColumnIndex": c,
+                    "Confidence": 90.0,
+                    "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+                }
+                blocks.append(cell)
+                table["Relationships"][0]["Ids"].append(cell["Id"])
+
+    return {"Blocks": blocks}
+
+
+def best_of(func, blocks, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(blocks)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--response", help="Recorded analyze_document response (JSON)")
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=80)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.response:
+        with open(args.response, "r", encoding="utf-8") as f:
+            response = json.load(f)
+    else:
+        response = synthetic_response(args.tables, args.rows, args.cols)
+    blocks = response["Blocks"]
+
+    counts = {}
+    for block in blocks:
+        counts[block["BlockType"]] = counts.get(block["BlockType"], 0) + 1
+    print(f"Blocks: {len(blocks)} ({', '.join(f'{k} {v}' for k, v in sorted(counts.items()))})")
+
+    indexed = best_of(parse_textract_tables, blocks, args.repeat)
+    print(f"indexed parser: {indexed * 1000:10.2f} ms, {len(parse_textract_tables(blocks))} tables")
+
+    # Single run: the legacy parser is quadratic
+    start = time.perf_counter()
+    legacy_tables = legacy_parse(blocks)
+    legacy = time.perf_counter() - start
+    print(f"legacy parser:  {legacy * 1000:10.2f} ms, {len(legacy_tables)} tables (each with the cells of all tables)")
+    print(f"speedup: {legacy / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Tests for cache module."""
+
+import json
+import os
+import time
+from alice_pdf.cache import ResponseCache, cache_key
+
+
+def test_cache_key_depends_on_every_part():
+    """Changing any input, or how inputs are split, changes the key."""
+    base = cache_key("mistral", "model", "prompt", 150, b"page")
+    assert base == cache_key("mistral", "model", "prompt", 150, b"page")
+    assert base != cache_key("mistral", "model", "prompt", 200, b"page")
+    assert base != cache_key("mistral", "model", "other prompt", 150, b"page")
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_cache_roundtrip_and_persistence(tmp_path):
+    """Stored results survive a new cache instance on the same directory."""
+    cache = ResponseCache(tmp_path)
+    key = cache_key("x")
+    assert cache.get(key) is None
+
+    cache.put(key, {"tables": [{"headers": ["A"], "rows": [["1"]]}]})
+
+    reopened = ResponseCache(tmp_path)
+    assert reopened.get(key) == {"tables": [{"headers": ["A"], "rows": [["1"]]}]}
+    assert reopened.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """When over budget, the least recently used entries go first."""
+    value = {"tables": [{"headers": ["A"], "rows": [["x" * 100]]}]}
+    entry_size = len(json.dumps(value))
+    cache = ResponseCache(tmp_path, max_bytes=entry_size * 2 + entry_size // 2)
+
+    cache.put("aa1", value)
+    cache.put("bb2", value)
+    # Age both entries, then touch the first so the second is the LRU one
+    past = time.time() - 100
+    for path in tmp_path.glob("*/*.json"):
+        os.utime(path, (past, past))
+    assert cache.get("aa1") is not None
+
+    cache.put("cc3", value)
+
+    assert cache.get("aa1") is not None
+    assert cache.get("bb2") is None
+    assert cache.get("cc3") is not None
+
+
+def test_cache_eviction_trims_below_budget(tmp_path, monkeypatch):
+    """Eviction goes down to the low-water mark, so puts do not rescan every time."""
+    value = {"tables": [{"headers": ["A"], "rows": [["x" * 100]]}]}
+    entry_size = len(json.dumps(value))
+    cache = ResponseCache(tmp_path, max_bytes=entry_size * 50)
+
+    scans = []
+    evict = ResponseCache._evict
+    monkeypatch.setattr(ResponseCache, "_evict", lambda self: (scans.append(1), evict(self)))
+    for i in range(100):
+        cache.put(f"{i:03d}", value)
+
+    assert len(scans) <= 11
+    assert cache._total_bytes <= cache.max_bytes
@@ -0,0 +1,168 @@
+"""Tests for the Camelot extractor."""
+
+import logging
+import multiprocessing
+from types import SimpleNamespace
+
+import fitz
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("camelot")
+
+from alice_pdf.camelot_extractor import extract_tables_with_camelot, merge_wrapped_rows
+
+
+def _text_pdf(path, pages):
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        doc.new_page().insert_text((72, 72), f"pagina {number}")
+    doc.save(path)
+    doc.close()
+
+
+class FakeReadPdf:
+    """Stand-in for camelot.read_pdf: one table on odd pages, optional crash."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def __call__(self, path, pages, flavor, split_text):
+        page_nums = [int(p) for p in pages.split(",")]
+        self.calls.append(page_nums)
+        if self.fail_on in page_nums:
+            raise RuntimeError("camelot crashed")
+        return [
+            SimpleNamespace(page=str(p), df=pd.DataFrame([["Comune", "Importo"], [f"C{p}", str(p)]]))
+            for p in page_nums
+            if p % 2
+        ]
+
+
+def test_camelot_parses_in_chunks(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, 5)
+    read_pdf = FakeReadPdf()
+    monkeypatch.setattr("camelot.read_pdf", read_pdf)
+
+    count = extract_tables_with_camelot(pdf_path, tmp_path / "out", merge_output=True, chunk_pages=2)
+
+    assert count == 3
+    assert read_pdf.calls == [[1, 2], [3, 4], [5]]
+    merged = pd.read_csv(tmp_path / "out" / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["col_0"].tolist() == ["C1", "C3", "C5"]
+
+
+def test_camelot_resume_skips_finished_chunks(tmp_path, monkeypatch, caplog):
+    pdf_path = tmp_path / "doc.pdf"
+    out = tmp_path / "out"
+    _text_pdf(pdf_path, 5)
+    monkeypatch.setattr("camelot.read_pdf", FakeReadPdf(fail_on=4))
+
+    with pytest.raises(RuntimeError):
+        extract_tables_with_camelot(pdf_path, out, chunk_pages=2)
+    # The first chunk was written and checkpointed before the crash
+    assert sorted(p.name for p in out.glob("*.csv")) == ["doc_page1_table0.csv"]
+
+    read_pdf = FakeReadPdf()
+    monkeypatch.setattr("camelot.read_pdf", read_pdf)
+    with caplog.at_level(logging.INFO, logger="alice_pdf.camelot_extractor"):
+        count = extract_tables_with_camelot(pdf_path, out, chunk_pages=2)
+
+    assert count == 3
+    assert read_pdf.calls == [[3, 4], [5]]
+    assert "Pages: 2 skipped (already done), 3 parsed" in caplog.text
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="worker processes inherit the patched camelot.read_pdf only when forked",
+)
+def test_camelot_workers_match_serial_output(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, 7)
+    monkeypatch.setattr("camelot.read_pdf", FakeReadPdf())
+
+    serial = extract_tables_with_camelot(pdf_path, tmp_path / "serial", merge_output=True)
+    parallel = extract_tables_with_camelot(
+        pdf_path, tmp_path / "parallel", merge_output=True, workers=3
+    )
+
+    assert parallel == serial == 4
+    names = sorted(p.name for p in (tmp_path / "serial").glob("*.csv"))
+    assert names == sorted(p.name for p in (tmp_path / "parallel").glob("*.csv"))
+    for name in names:
+        assert (tmp_path / "serial" / name).read_bytes() == (tmp_path / "parallel" / name).read_bytes()
+
+
+def legacy_merge_wrapped_rows(df, max_non_null=2):
+    """Row-by-row implementation replaced by the vectorised one (reference)."""
+    if df.empty or len(df) < 2:
+        return df
+
+    merged_rows = []
+    skip_next = False
+    for i in range(len(df)):
+        if skip_next:
+            skip_next = False
+            continue
+        row = df.iloc[i]
+        non_empty_count = sum(1 for val in row if pd.notna(val) and str(val).strip())
+        if non_empty_count <= max_non_null and i < len(df) - 1:
+            next_row = df.iloc[i + 1].copy()
+            for col_idx in range(len(row)):
+                if pd.notna(row.iloc[col_idx]) and str(row.iloc[col_idx]).strip():
+                    if pd.notna(next_row.iloc[col_idx]):
+                        next_row.iloc[col_idx] = f"{row.iloc[col_idx]} {next_row.iloc[col_idx]}"
+                    else:
+                        next_row.iloc[col_idx] = row.iloc[col_idx]
+            merged_rows.append(next_row)
+            skip_next = True
+            continue
+        merged_rows.append(row)
+
+    if merged_rows:
+        return pd.DataFrame([row.values for row in merged_rows], columns=df.columns).reset_index(drop=True)
+    return df.iloc[:0].copy()
+
+
+def _random_table(rng):
+    cells = ["", " ", "\t", "Via Roma", "10", "Palermo", "0", "A B", None, np.nan]
+    # Mostly sparse rows, so runs of consecutive wrapped rows are common
+    weights = np.array([6, 1, 1, 2, 2, 2, 1, 1, 3, 3], dtype=float)
+    rows = rng.integers(0, 12)
+    cols = rng.integers(1, 7)
+    data = [
+        [cells[k] for k in rng.choice(len(cells), size=cols, p=weights / weights.sum())]
+        for _ in range(rows)
+    ]
+    columns = [f"c{j}" for j in range(cols)]
+    if rng.random() < 0.5:
+        return pd.DataFrame(data, columns=columns, dtype=object)
+    return pd.DataFrame(data, columns=columns).astype("str")
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_merge_wrapped_rows_matches_row_by_row_version(seed):
+    rng = np.random.default_rng(seed)
+    df = _random_table(rng)
+    max_non_null = int(rng.integers(0, 4))
+
+    expected = legacy_merge_wrapped_rows(df.copy(), max_non_null=max_non_null)
+    result = merge_wrapped_rows(df.copy(), max_non_null=max_non_null)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge_wrapped_rows_chain_of_wrapped_rows():
+    df = pd.DataFrame(
+        [["Via", "", ""], ["Roma", "", ""], ["1", "x", "y"], ["2", "z", "w"]],
+        columns=["a", "b", "c"],
+    )
+
+    result = merge_wrapped_rows(df)
+
+    # Row 0 absorbs row 1; row 1 is not merged again, so row 2 stays on its own
+    assert result.values.tolist() == [["Via Roma", "", ""], ["1", "x", "y"], ["2", "z", "w"]]
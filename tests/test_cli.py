@@ -80,6 +80,57 @@ def test_cli_default_engine_mistral_routes(mock_extract_tables):
         mock_extract_tables.assert_called_once()
 
 
+def test_cli_mistral_workers_and_rps(mock_extract_tables):
+    """--workers and --rps should be passed to the Mistral extractor."""
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--api-key', 'k',
+        '--workers', '4', '--rps', '2.5'
+    ]):
+        result = main()
+        assert result == 0
+        kwargs = mock_extract_tables.call_args[1]
+        assert kwargs['workers'] == 4
+        assert kwargs['rps'] == 2.5
+
+
+def test_cli_cache_dir_and_no_cache(mock_extract_tables):
+    """--cache-dir is passed through and --no-cache disables the cache."""
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--api-key', 'k', '--cache-dir', 'my-cache'
+    ]):
+        assert main() == 0
+        assert mock_extract_tables.call_args[1]['cache_dir'] == 'my-cache'
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--api-key', 'k', '--no-cache'
+    ]):
+        assert main() == 0
+        assert mock_extract_tables.call_args[1]['cache_dir'] is None
+
+
+def test_cli_output_format(mock_extract_tables):
+    """--format is passed through and defaults to csv."""
+    with patch.object(sys, 'argv', ['alice-pdf', 'test.pdf', 'output/', '--api-key', 'k']):
+        assert main() == 0
+        assert mock_extract_tables.call_args[1]['output_format'] == 'csv'
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--api-key', 'k', '--format', 'parquet'
+    ]):
+        assert main() == 0
+        assert mock_extract_tables.call_args[1]['output_format'] == 'parquet'
+
+
+def test_cli_columnar_format_without_pyarrow_fails_before_extraction(mock_extract_tables, caplog):
+    """Missing pyarrow is reported before any page is sent to an engine."""
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--api-key', 'k', '--format', 'parquet'
+    ]), patch.dict('sys.modules', {'pyarrow': None}):
+        assert main() == 1
+    mock_extract_tables.assert_not_called()
+    assert "alice-pdf[parquet]" in caplog.text
+
+
 def test_cli_textract_routes_and_env_creds():
     """Textract engine should route to extract_tables_with_textract and pick env creds."""
     import types
@@ -102,6 +153,24 @@ def test_cli_textract_routes_and_env_creds():
         assert kwargs['aws_region'] == 'eu-west-1'
 
 
+def test_cli_textract_concurrency_options():
+    """--max-workers/--target-rps are passed to the Textract engine."""
+    import types
+
+    mock_module = types.ModuleType('alice_pdf.textract_extractor')
+    mock_module.extract_tables_with_textract = Mock(return_value=1)
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'output/', '--engine', 'textract',
+        '--max-workers', '12', '--target-rps', '8'
+    ]), patch.dict('os.environ', {}, clear=True), \
+            patch.dict('sys.modules', {'alice_pdf.textract_extractor': mock_module}):
+        assert main() == 0
+        kwargs = mock_module.extract_tables_with_textract.call_args[1]
+        assert kwargs['max_workers'] == 12
+        assert kwargs['target_rps'] == 8.0
+
+
 def test_cli_textract_import_error():
     """If textract_extractor import fails, CLI should exit with error."""
     real_import = __import__
@@ -174,6 +243,53 @@ def test_cli_camelot_stream_routes():
         assert kwargs['flavor'] == 'stream'
 
 
+def test_cli_camelot_workers():
+    """--workers is a common option and reaches the Camelot extractor."""
+    import types
+
+    mock_module = types.ModuleType('alice_pdf.camelot_extractor')
+    mock_module.extract_tables_with_camelot = Mock(return_value=1)
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'camelot', '--workers', '8'
+    ]), patch.dict('sys.modules', {'alice_pdf.camelot_extractor': mock_module}), \
+         patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 0
+        kwargs = mock_module.extract_tables_with_camelot.call_args[1]
+        assert kwargs['workers'] == 8
+
+
+def test_cli_pdfplumber_workers():
+    """--workers reaches the pdfplumber extractor."""
+    import types
+
+    mock_module = types.ModuleType('alice_pdf.pdfplumber_extractor')
+    mock_module.extract_tables_with_pdfplumber = Mock(return_value=1)
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'pdfplumber', '--workers', '4'
+    ]), patch.dict('sys.modules', {'alice_pdf.pdfplumber_extractor': mock_module}), \
+         patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 0
+        kwargs = mock_module.extract_tables_with_pdfplumber.call_args[1]
+        assert kwargs['workers'] == 4
+
+
+@pytest.mark.parametrize("engine, flags", [
+    ("pymupdf", ["--workers", "8"]),
+    ("textract", ["--workers", "8"]),
+    ("camelot", ["--prefilter", "skip"]),
+    ("words", ["--no-cache"]),
+    ("pdfplumber", ["--prefetch", "4"]),
+])
+def test_cli_rejects_common_options_an_engine_ignores(engine, flags, caplog):
+    """Common flags are rejected for engines that do not honour them."""
+    with patch.object(sys, 'argv', ['alice-pdf', 'test.pdf', 'out/', '--engine', engine, *flags]), \
+         patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 1
+    assert f"Options {flags[0]} are only compatible with --engine" in caplog.text
+
+
 def test_cli_camelot_lattice_default():
     """Camelot default flavor should be lattice."""
     import types
@@ -228,6 +344,55 @@ def test_cli_pdfplumber_strip_text_toggle():
         assert kwargs['strip_text'] is False
 
 
+def test_cli_pymupdf_strategy():
+    """pymupdf engine receives --pymupdf-strategy; the flag is rejected for other engines."""
+    import types
+
+    mock_module = types.ModuleType('alice_pdf.pymupdf_extractor')
+    mock_module.extract_tables_with_pymupdf = Mock(return_value=1)
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'pymupdf', '--pymupdf-strategy', 'text'
+    ]), patch.dict('sys.modules', {'alice_pdf.pymupdf_extractor': mock_module}), \
+         patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 0
+        kwargs = mock_module.extract_tables_with_pymupdf.call_args[1]
+        assert kwargs['strategy'] == 'text'
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'camelot', '--pymupdf-strategy', 'text'
+    ]), patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 1
+
+
+def test_cli_words_options():
+    """words engine receives --words-* options; they are rejected for other engines."""
+    import types
+
+    mock_module = types.ModuleType('alice_pdf.words_extractor')
+    mock_module.extract_tables_with_words = Mock(return_value=1)
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'words', '--words-col-gap', '0.8', '--words-min-cols', '3'
+    ]), patch.dict('sys.modules', {'alice_pdf.words_extractor': mock_module}), \
+         patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 0
+        kwargs = mock_module.extract_tables_with_words.call_args[1]
+        assert kwargs['col_gap'] == 0.8
+        assert kwargs['min_rows'] == 2
+        assert kwargs['min_cols'] == 3
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'pymupdf', '--words-col-gap', '0.8'
+    ]), patch.dict('os.environ', {'MISTRAL_API_KEY': ''}, clear=False):
+        assert main() == 1
+
+    with patch.object(sys, 'argv', [
+        'alice-pdf', 'test.pdf', 'out/', '--engine', 'words', '--words-min-rows', '0'
+    ]), pytest.raises(SystemExit):
+        main()
+
+
 def test_cli_with_pages_option(mock_extract_tables):
     """Test CLI with --pages option."""
     with patch.object(sys, 'argv', [
@@ -119,8 +119,8 @@ def test_extract_tables_with_mistral_invalid_json():
         page_num=0
     )
 
-    # Should return empty tables on error
-    assert result == {"tables": []}
+    # No result: the page is reported as failed
+    assert result is None
 
 
 def test_extract_tables_with_mistral_model_parameter():
@@ -172,8 +172,7 @@ def test_pdf_page_to_base64(mock_fitz):
 
 @patch('alice_pdf.extractor.Mistral')
 @patch('alice_pdf.extractor.fitz')
-@patch('alice_pdf.extractor.shutil')
-def test_extract_tables_page_range(mock_shutil, mock_fitz, mock_mistral_class):
+def test_extract_tables_page_range(mock_fitz, mock_mistral_class):
     """Test extraction with page range specification."""
     # Mock PDF document
     mock_doc = MagicMock()
@@ -216,8 +215,7 @@ def test_extract_tables_page_range(mock_shutil, mock_fitz, mock_mistral_class):
 
 @patch('alice_pdf.extractor.Mistral')
 @patch('alice_pdf.extractor.fitz')
-@patch('alice_pdf.extractor.shutil')
-def test_extract_tables_merge_output(mock_shutil, mock_fitz, mock_mistral_class, tmp_path):
+def test_extract_tables_merge_output(mock_fitz, mock_mistral_class, tmp_path):
     """Test table merging functionality."""
     # Mock PDF document
     mock_doc = MagicMock()
@@ -271,8 +269,7 @@ def test_extract_tables_merge_output(mock_shutil, mock_fitz, mock_mistral_class,
 def test_extract_tables_empty_response():
     """Test handling of empty table response."""
     with patch('alice_pdf.extractor.Mistral') as mock_mistral_class, \
-         patch('alice_pdf.extractor.fitz') as mock_fitz, \
-         patch('alice_pdf.extractor.shutil'):
+         patch('alice_pdf.extractor.fitz') as mock_fitz:
 
         # Mock PDF
         mock_doc = MagicMock()
@@ -304,3 +301,311 @@ def test_extract_tables_empty_response():
             )
 
             assert num_tables == 0
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_concurrent_workers_keep_page_order(mock_fitz, mock_mistral_class, tmp_path):
+    """Concurrent workers still produce per-page files and a page-ordered merge."""
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 6
+    mock_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    mock_page.get_pixmap.return_value = mock_pix
+    mock_doc.__getitem__.return_value = mock_page
+    mock_fitz.open.return_value = mock_doc
+
+    mock_client = Mock()
+    mock_client.chat.complete.side_effect = lambda **kwargs: Mock(
+        choices=[Mock(message=Mock(content=json.dumps(
+            {"tables": [{"headers": ["A"], "rows": [["x"]]}]}
+        )))]
+    )
+    mock_mistral_class.return_value = mock_client
+
+    output_dir = tmp_path / "output"
+    num_tables = extract_tables(
+        "test.pdf",
+        str(output_dir),
+        "fake_api_key",
+        merge_output=True,
+        workers=3,
+        rps=1000,
+    )
+
+    assert num_tables == 6
+    for page in range(1, 7):
+        assert (output_dir / f"test_page{page}_table0.csv").exists()
+    df = pd.read_csv(output_dir / "test_merged.csv")
+    assert list(df["page"]) == [1, 2, 3, 4, 5, 6]
+
+
+def test_extract_tables_with_mistral_mime_type():
+    """The data URL carries the MIME type of the encoded image."""
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.choices = [Mock()]
+    mock_response.choices[0].message.content = '{"tables": []}'
+    mock_client.chat.complete.return_value = mock_response
+
+    extract_tables_with_mistral(
+        mock_client,
+        "fake_base64_image",
+        page_num=0,
+        mime_type="image/jpeg"
+    )
+
+    messages = mock_client.chat.complete.call_args[1]["messages"]
+    assert messages[0]["content"][1]["image_url"].startswith("data:image/jpeg;base64,")
+
+
+def test_extract_tables_with_mistral_uses_response_cache(tmp_path):
+    """A cached request is answered without calling the API."""
+    from alice_pdf.cache import ResponseCache
+
+    cache = ResponseCache(tmp_path)
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.choices = [Mock()]
+    mock_response.choices[0].message.content = '{"tables": [{"headers": ["A"], "rows": [["1"]]}]}'
+    mock_client.chat.complete.return_value = mock_response
+
+    first = extract_tables_with_mistral(mock_client, "img", 0, cache=cache, cache_key="k1")
+    second = extract_tables_with_mistral(mock_client, "img", 0, cache=cache, cache_key="k1")
+
+    assert first == second
+    assert mock_client.chat.complete.call_count == 1
+
+
+def test_extract_tables_with_mistral_does_not_cache_invalid_json(tmp_path):
+    """Unparseable replies are not cached, so the next run retries them."""
+    from alice_pdf.cache import ResponseCache
+
+    cache = ResponseCache(tmp_path)
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.choices = [Mock()]
+    mock_response.choices[0].message.content = "not json"
+    mock_client.chat.complete.return_value = mock_response
+
+    extract_tables_with_mistral(mock_client, "img", 0, cache=cache, cache_key="k1")
+
+    assert cache.get("k1") is None
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_reuses_single_client_across_retries(mock_fitz, mock_mistral_class, tmp_path):
+    """One client serves all pages and retries; timeouts are passed per call."""
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 2
+    mock_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    mock_page.get_pixmap.return_value = mock_pix
+    mock_doc.__getitem__.return_value = mock_page
+    mock_fitz.open.return_value = mock_doc
+
+    ok = Mock(choices=[Mock(message=Mock(content='{"tables": []}'))])
+    mock_client = Mock()
+    mock_client.chat.complete.side_effect = [Exception("Request timed out"), ok, ok]
+    mock_mistral_class.return_value = mock_client
+
+    extract_tables("test.pdf", str(tmp_path), "fake_api_key", timeout_ms=1000, rps=1000)
+
+    assert mock_mistral_class.call_count == 1
+    timeouts = [c[1]["timeout_ms"] for c in mock_client.chat.complete.call_args_list]
+    assert timeouts == [1000, 2000, 1000]
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_invalid_json_page_is_not_done(mock_fitz, mock_mistral_class, tmp_path):
+    """A page whose reply is not JSON is not recorded as done, so it is retried."""
+    from alice_pdf.manifest import ResumeManifest
+
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 1
+    mock_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    mock_page.get_pixmap.return_value = mock_pix
+    mock_doc.__getitem__.return_value = mock_page
+    mock_fitz.open.return_value = mock_doc
+
+    mock_client = Mock()
+    mock_client.chat.complete.return_value = Mock(choices=[Mock(message=Mock(content="not json"))])
+    mock_mistral_class.return_value = mock_client
+
+    extract_tables("test.pdf", str(tmp_path), "fake_api_key", rps=1000)
+
+    with ResumeManifest(tmp_path, "test") as manifest:
+        assert not manifest.is_done(1)
+
+
+def test_extract_tables_with_mistral_packed_fans_out_pages():
+    """A packed reply is split per page; missing pages are left out."""
+    from alice_pdf.extractor import extract_tables_with_mistral_packed
+
+    mock_client = Mock()
+    mock_response = Mock()
+    mock_response.choices = [Mock()]
+    mock_response.choices[0].message.content = json.dumps({
+        "pages": [{"page": 3, "tables": [{"headers": ["A"], "rows": [["1"]]}]}]
+    })
+    mock_client.chat.complete.return_value = mock_response
+
+    result = extract_tables_with_mistral_packed(
+        mock_client,
+        [("img3", "image/png"), ("img4", "image/jpeg")],
+        [2, 3],
+    )
+
+    assert result[2]["tables"][0]["headers"] == ["A"]
+    assert 3 not in result
+    content = mock_client.chat.complete.call_args[1]["messages"][0]["content"]
+    assert [part["type"] for part in content] == ["text", "text", "image_url", "text", "image_url"]
+    assert content[1]["text"] == "Page 3:"
+    assert content[4]["image_url"].startswith("data:image/jpeg;base64,img4")
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_pages_per_request(mock_fitz, mock_mistral_class, tmp_path):
+    """Packing sends fewer requests but keeps per-page CSV files."""
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 3
+    mock_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    mock_page.get_pixmap.return_value = mock_pix
+    mock_doc.__getitem__.return_value = mock_page
+    mock_fitz.open.return_value = mock_doc
+
+    def reply(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        labels = [p["text"] for p in content if p["type"] == "text" and p["text"].startswith("Page ")]
+        if labels:
+            pages = [int(label.split()[1].rstrip(":")) for label in labels]
+            payload = {"pages": [
+                {"page": n, "tables": [{"headers": ["A"], "rows": [[str(n)]]}]} for n in pages
+            ]}
+        else:
+            payload = {"tables": [{"headers": ["A"], "rows": [["single"]]}]}
+        return Mock(choices=[Mock(message=Mock(content=json.dumps(payload)))])
+
+    mock_client = Mock()
+    mock_client.chat.complete.side_effect = reply
+    mock_mistral_class.return_value = mock_client
+
+    num_tables = extract_tables(
+        "test.pdf", str(tmp_path), "fake_api_key", pages_per_request=2, rps=1000
+    )
+
+    assert num_tables == 3
+    assert mock_client.chat.complete.call_count == 2
+    assert pd.read_csv(tmp_path / "test_page2_table0.csv")["A"].tolist() == [2]
+    assert pd.read_csv(tmp_path / "test_page3_table0.csv")["A"].tolist() == ["single"]
+
+
+def test_process_page_batch_resends_missing_pages(tmp_path):
+    """Pages absent from a packed reply are sent alone; the partial reply is not cached."""
+    from alice_pdf.cache import ResponseCache
+    from alice_pdf.extractor import _process_page_batch
+
+    def reply(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        if any(p["type"] == "text" and p["text"].startswith("Page ") for p in content):
+            payload = {"pages": [{"page": 1, "tables": []}]}
+        else:
+            payload = {"tables": [{"headers": ["A"], "rows": [["single"]]}]}
+        return Mock(choices=[Mock(message=Mock(content=json.dumps(payload)))])
+
+    mock_client = Mock()
+    mock_client.chat.complete.side_effect = reply
+    cache = ResponseCache(tmp_path)
+
+    batch = [(0, ("img1", "image/png")), (1, ("img2", "image/png"))]
+    results = _process_page_batch(batch, mock_client, "model", None, 1000, None, cache=cache)
+
+    assert results[0] == (0, {"tables": []}, False)
+    assert results[1][1]["tables"][0]["rows"] == [["single"]]
+    assert results[1][2] is False
+    assert mock_client.chat.complete.call_count == 2
+
+    # Only the single-page answer was cached: the pack is asked again
+    _process_page_batch(batch, mock_client, "model", None, 1000, None, cache=cache)
+    assert mock_client.chat.complete.call_count == 3
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_resume_skips_manifest_pages(mock_fitz, mock_mistral_class, tmp_path):
+    """Pages recorded in the manifest, even without tables, are not sent again."""
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 3
+    mock_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    mock_page.get_pixmap.return_value = mock_pix
+    mock_doc.__getitem__.return_value = mock_page
+    mock_fitz.open.return_value = mock_doc
+
+    mock_client = Mock()
+    mock_client.chat.complete.return_value = Mock(
+        choices=[Mock(message=Mock(content=json.dumps({"tables": []})))]
+    )
+    mock_mistral_class.return_value = mock_client
+
+    assert extract_tables("test.pdf", str(tmp_path), "fake_api_key", rps=1000) == 0
+    assert mock_client.chat.complete.call_count == 3
+
+    # Second run: nothing left to do
+    assert extract_tables("test.pdf", str(tmp_path), "fake_api_key", rps=1000) == 0
+    assert mock_client.chat.complete.call_count == 3
+
+    # --no-resume reprocesses every page
+    extract_tables("test.pdf", str(tmp_path), "fake_api_key", rps=1000, resume=False)
+    assert mock_client.chat.complete.call_count == 6
+
+
+@patch('alice_pdf.extractor.Mistral')
+@patch('alice_pdf.extractor.fitz')
+def test_extract_tables_counts_unrenderable_pages_as_failed(mock_fitz, mock_mistral_class, tmp_path, caplog):
+    """A page that fails to render is reported as failed, not as processed."""
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 2
+    good_page = MagicMock()
+    mock_pix = MagicMock()
+    mock_pix.width = 10
+    mock_pix.height = 10
+    mock_pix.samples = b'\x00' * (10 * 10 * 3)
+    good_page.get_pixmap.return_value = mock_pix
+    bad_page = MagicMock()
+    bad_page.get_pixmap.side_effect = RuntimeError("broken page")
+    mock_doc.__getitem__.side_effect = lambda index: bad_page if index == 1 else good_page
+    mock_fitz.open.return_value = mock_doc
+
+    mock_client = Mock()
+    mock_client.chat.complete.return_value = Mock(
+        choices=[Mock(message=Mock(content=json.dumps({"tables": []})))]
+    )
+    mock_mistral_class.return_value = mock_client
+
+    with caplog.at_level("INFO", logger="alice_pdf.extractor"):
+        extract_tables("test.pdf", str(tmp_path), "fake_api_key", rps=1000)
+
+    assert mock_client.chat.complete.call_count == 1
+    assert "Statistics: 1/2 pages processed successfully" in caplog.text
+    assert "Failed pages: 2" in caplog.text
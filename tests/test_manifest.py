@@ -0,0 +1,70 @@
+"""Tests for the resume manifest."""
+
+from alice_pdf.manifest import ResumeManifest, manifest_path
+
+
+def _write(path, text="a\n1\n"):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_manifest_records_done_pages_across_runs(tmp_path):
+    """Finished pages (including table-free ones) survive a reopen."""
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        files = [_write(tmp_path / "doc_page1_table0.csv"), _write(tmp_path / "doc_page1_table1.csv")]
+        manifest.begin_page(1, files)
+        manifest.finish_page(1, files, seconds=0.5)
+        manifest.finish_page(2, [])
+
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        assert manifest.done_pages() == {1, 2}
+        assert manifest.table_count(1) == 2
+        assert manifest.table_count(2) == 0
+        assert manifest.page_files(1) == [tmp_path / "doc_page1_table0.csv", tmp_path / "doc_page1_table1.csv"]
+        assert not manifest.is_done(3)
+
+
+def test_manifest_discards_interrupted_page(tmp_path):
+    """A page left in 'writing' loses its partial files and is not done."""
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        partial = _write(tmp_path / "doc_page3_table0.csv")
+        manifest.begin_page(3, [partial, tmp_path / "doc_page3_table1.csv"])
+
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        assert not manifest.is_done(3)
+    assert not partial.exists()
+
+
+def test_manifest_imports_legacy_outputs_once(tmp_path):
+    """An output directory without manifest is imported, minus the newest page."""
+    import os
+
+    for page, mtime in [(1, 100), (2, 200), (10, 300)]:
+        path = _write(tmp_path / f"doc_page{page}_table0.csv")
+        os.utime(path, (mtime, mtime))
+    _write(tmp_path / "other_page5_table0.csv")
+
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        assert manifest.done_pages() == {1, 2}
+    assert not (tmp_path / "doc_page10_table0.csv").exists()
+    assert manifest_path(tmp_path, "doc").exists()
+
+
+def test_manifest_without_resume_forgets_pages(tmp_path):
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        manifest.finish_page(1, [])
+
+    with ResumeManifest(tmp_path, "doc", resume=False) as manifest:
+        assert manifest.done_pages() == set()
+
+
+def test_manifest_without_resume_forgets_only_selected_pages(tmp_path):
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        manifest.finish_page(1, [])
+        manifest.finish_page(2, [])
+
+    with ResumeManifest(tmp_path, "doc", resume=False, pages=[1]) as manifest:
+        assert manifest.done_pages() == {2}
+
+    with ResumeManifest(tmp_path, "doc") as manifest:
+        assert manifest.done_pages() == {2}
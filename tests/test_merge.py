@@ -0,0 +1,81 @@
+"""Tests for the streaming merge writer."""
+
+import pandas as pd
+
+from alice_pdf.merge import MergeWriter, positional_columns
+
+
+def test_merge_writer_orders_pages_and_buffers_only_out_of_order(tmp_path):
+    path = tmp_path / "doc_merged.csv"
+    writer = MergeWriter(path, [1, 2, 3])
+
+    writer.add_page(2, [pd.DataFrame({"page": [2], "A": ["b"]})])
+    assert set(writer._pending) == {2}  # Waiting for page 1
+
+    writer.add_page(1, [pd.DataFrame({"page": [1], "A": ["a"]})])
+    assert writer._pending == {}
+    assert writer.rows == 2
+
+    writer.add_page(3, [])
+    assert writer.close() == (2, 2)
+    assert pd.read_csv(path)["A"].tolist() == ["a", "b"]
+
+
+def test_merge_writer_header_union_matches_concat(tmp_path):
+    """Columns appearing later are added to the header and earlier rows padded."""
+    frames = [
+        pd.DataFrame({"page": [1, 1], "TOTALE PERCEPITO": ["1", "2"]}),
+        pd.DataFrame({"page": [2], "TOTALE_PERCEPITO": ["3"], "Note": ["x, y"]}),
+    ]
+    path = tmp_path / "doc_merged.csv"
+    with MergeWriter(path, [1, 2]) as writer:
+        writer.add_page(2, [frames[1]])
+        writer.add_page(1, [frames[0]])
+
+    expected = pd.concat(
+        [df.set_axis([c.replace(" ", "_") for c in df.columns], axis=1) for df in frames],
+        ignore_index=True,
+    )
+    expected_path = tmp_path / "expected.csv"
+    expected.to_csv(expected_path, index=False, encoding="utf-8-sig")
+
+    assert list(pd.read_csv(path).columns) == ["page", "TOTALE_PERCEPITO", "Note"]
+    assert path.read_bytes() == expected_path.read_bytes()
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_merge_writer_positional_columns_and_lazy_files(tmp_path):
+    existing = tmp_path / "doc_page1_table0.csv"
+    pd.DataFrame({"page": [1], "x": ["a"]}).to_csv(existing, index=False, encoding="utf-8-sig")
+
+    path = tmp_path / "doc_merged.csv"
+    writer = MergeWriter(path, [1, 2], column_names=positional_columns)
+    writer.add_page(1, [existing])
+    writer.add_page(2, [pd.DataFrame({"page": [2], "y": ["b"], "z": ["c"]})])
+    writer.close()
+
+    merged = pd.read_csv(path)
+    assert list(merged.columns) == ["page", "col_0", "col_1"]
+    assert merged["col_0"].tolist() == ["a", "b"]
+
+
+def test_merge_writer_resumed_csv_pages_round_trip(tmp_path):
+    """A page read back from its CSV is merged exactly as when it was fresh."""
+    df = pd.DataFrame({"page": [1, 1], "Codice": ["007", "1"], "Note": [None, "NA"]})
+    existing = tmp_path / "doc_page1_table0.csv"
+    df.to_csv(existing, index=False, encoding="utf-8-sig")
+
+    fresh, resumed = tmp_path / "fresh.csv", tmp_path / "resumed.csv"
+    for path, table in [(fresh, df), (resumed, existing)]:
+        with MergeWriter(path, [1]) as writer:
+            writer.add_page(1, [table])
+
+    assert resumed.read_bytes() == fresh.read_bytes()
+
+
+def test_merge_writer_without_tables_writes_nothing(tmp_path):
+    path = tmp_path / "doc_merged.csv"
+    writer = MergeWriter(path, [1])
+    writer.add_page(1, [])
+    assert writer.close() is None
+    assert not path.exists()
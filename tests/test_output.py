@@ -0,0 +1,59 @@
+"""Tests for table output formats."""
+
+import pandas as pd
+import pytest
+
+from alice_pdf.merge import MergeWriter
+from alice_pdf.output import read_table, write_table
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet", "arrow"])
+def test_write_table_round_trip(tmp_path, output_format):
+    df = pd.DataFrame({"page": [3, 3], "Comune": ["Palermo", "Roma"], "Importo": [1, "2,5"]})
+    path = tmp_path / f"doc_page3_table0.{output_format}"
+
+    write_table(df, path, output_format)
+    result = read_table(path)
+
+    assert list(result.columns) == ["page", "Comune", "Importo"]
+    assert result["page"].astype(int).tolist() == [3, 3]
+    assert result["Comune"].tolist() == ["Palermo", "Roma"]
+
+
+def test_columnar_tables_get_unique_string_columns(tmp_path):
+    """Headerless and duplicate columns are named as a CSV round trip would."""
+    df = pd.DataFrame([[1, "a", "b", "c"]], columns=["page", "", "X", "X"])
+    path = tmp_path / "doc.parquet"
+
+    write_table(df, path, "parquet")
+
+    assert list(read_table(path).columns) == ["page", "Unnamed: 1", "X", "X.1"]
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "arrow"])
+def test_merged_columnar_file_has_one_group_per_page(tmp_path, output_format):
+    path = tmp_path / f"doc_merged.{output_format}"
+    with MergeWriter(path, [1, 2, 3], output_format=output_format) as writer:
+        writer.add_page(1, [pd.DataFrame({"page": [1, 1], "A": ["a", "b"]})])
+        writer.add_page(3, [pd.DataFrame({"page": [3], "B": ["z"]})])
+        writer.add_page(2, [
+            pd.DataFrame({"page": [2], "A": ["c"]}),
+            pd.DataFrame({"page": [2], "A": ["d"]}),
+        ])
+
+    merged = read_table(path)
+    assert list(merged.columns) == ["page", "A", "B"]
+    assert merged["page"].tolist() == [1, 1, 2, 2, 3]
+
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.num_row_groups == 3
+        assert parquet_file.read_row_group(1).column("page").to_pylist() == [2, 2]
+    else:
+        with pa.ipc.open_file(str(path)) as reader:
+            assert reader.num_record_batches == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == [path.name]
@@ -0,0 +1,228 @@
+"""Tests for the pdfplumber extractor."""
+
+import fitz
+import numpy as np
+import pandas as pd
+import pytest
+
+pdfplumber = pytest.importorskip("pdfplumber")
+
+from alice_pdf.pdfplumber_extractor import (
+    TABLE_STRATEGIES,
+    _table_to_dataframe,
+    _usable_strategies,
+    distribute_id_cespite_values,
+    extract_tables_with_pdfplumber,
+)
+
+
+def _table_pdf(path, pages, rows=4):
+    """PDF whose pages hold one ruled table: header row plus `rows` - 1 data rows."""
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        x = [72, 200, 328]
+        y = [72 + 20 * i for i in range(rows + 1)]
+        for xi in x:
+            page.draw_line((xi, y[0]), (xi, y[-1]))
+        for yi in y:
+            page.draw_line((x[0], yi), (x[-1], yi))
+        for i in range(rows):
+            left, right = ("Comune", "Importo") if i == 0 else (f"C{number}-{i}", str(number * 10 + i))
+            page.insert_text((x[0] + 4, y[i] + 14), left)
+            page.insert_text((x[1] + 4, y[i] + 14), right)
+    doc.save(path)
+    doc.close()
+
+
+def test_pdfplumber_extracts_ruled_tables(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _table_pdf(pdf_path, 3)
+
+    count = extract_tables_with_pdfplumber(pdf_path, tmp_path / "out", merge_output=True)
+
+    assert count == 3
+    merged = pd.read_csv(tmp_path / "out" / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged.columns.tolist() == ["page", "Comune", "Importo"]
+    assert merged["page"].tolist() == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+    assert merged["Comune"].tolist()[:3] == ["C1-1", "C1-2", "C1-3"]
+
+
+def test_pdfplumber_releases_each_page(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _table_pdf(pdf_path, 4)
+    closed = []
+    original_close = pdfplumber.page.Page.close
+
+    def close(page):
+        closed.append(page.page_number)
+        original_close(page)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "close", close)
+
+    extract_tables_with_pdfplumber(pdf_path, tmp_path / "out", pages="2-4")
+
+    # Each page is released right after it is processed (PDF.close() then closes all)
+    assert closed[:3] == [2, 3, 4]
+
+
+def test_pdfplumber_workers_match_serial_output(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _table_pdf(pdf_path, 5)
+
+    serial = extract_tables_with_pdfplumber(pdf_path, tmp_path / "serial", merge_output=True)
+    parallel = extract_tables_with_pdfplumber(
+        pdf_path, tmp_path / "parallel", merge_output=True, workers=3
+    )
+
+    assert parallel == serial == 5
+    names = sorted(p.name for p in (tmp_path / "serial").glob("*.csv"))
+    assert names == sorted(p.name for p in (tmp_path / "parallel").glob("*.csv"))
+    for name in names:
+        assert (tmp_path / "serial" / name).read_bytes() == (tmp_path / "parallel" / name).read_bytes()
+
+
+def test_pdfplumber_workers_resume(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    out = tmp_path / "out"
+    _table_pdf(pdf_path, 4)
+    extract_tables_with_pdfplumber(pdf_path, out, pages="1-2")
+
+    count = extract_tables_with_pdfplumber(pdf_path, out, merge_output=True, workers=2)
+
+    assert count == 4
+    merged = pd.read_csv(out / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["page"].tolist() == [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4]
+
+
+def test_pdfplumber_discards_partial_merge_on_failure(tmp_path, monkeypatch):
+    from alice_pdf import pdfplumber_extractor
+
+    pdf_path = tmp_path / "doc.pdf"
+    out = tmp_path / "out"
+    _table_pdf(pdf_path, 3)
+    iter_pages = pdfplumber_extractor._iter_pages
+
+    def failing_pages(*args, **kwargs):
+        for result in iter_pages(*args, **kwargs):
+            if result[0] == 2:
+                raise RuntimeError("worker died")
+            yield result
+
+    monkeypatch.setattr(pdfplumber_extractor, "_iter_pages", failing_pages)
+
+    with pytest.raises(RuntimeError, match="worker died"):
+        extract_tables_with_pdfplumber(pdf_path, out, merge_output=True)
+
+    assert (out / "doc_page1_table0.csv").exists()
+    assert not list(out.glob("doc_merged*"))
+
+
+def test_usable_strategies_drops_rejected_settings(monkeypatch):
+    from pdfplumber.table import TableSettings
+
+    original_resolve = TableSettings.resolve.__func__
+
+    def resolve(cls, settings):
+        if settings and settings.get("vertical_strategy") == "text":
+            raise TypeError("unexpected keyword argument")
+        return original_resolve(cls, settings)
+
+    monkeypatch.setattr(TableSettings, "resolve", classmethod(resolve))
+
+    assert "text" not in _usable_strategies()
+    assert "default" in _usable_strategies()
+    assert set(_usable_strategies()) <= set(TABLE_STRATEGIES)
+
+
+def legacy_table_to_dataframe(table_data, page_num, strip_text):
+    """Row-wise post-processing replaced by the vectorised one (reference)."""
+    df = pd.DataFrame(table_data)
+    if df.empty:
+        return None
+    first_row_non_empty = sum(1 for cell in df.iloc[0] if cell and str(cell).strip())
+    avg_non_empty = df.apply(lambda row: sum(1 for cell in row if cell and str(cell).strip()), axis=1).mean()
+    if first_row_non_empty >= avg_non_empty * 0.8 and first_row_non_empty > 0:
+        headers = df.iloc[0].fillna('').astype(str)
+        if strip_text:
+            headers = headers.str.strip()
+        df = df[1:].reset_index(drop=True)
+        df.columns = headers
+    else:
+        df.columns = [f"col_{i}" for i in range(len(df.columns))]
+    if strip_text:
+        df = df.map(lambda x: x.strip() if isinstance(x, str) and x else x)
+    df.insert(0, "page", page_num)
+    return legacy_distribute_id_cespite_values(df)
+
+
+def legacy_distribute_id_cespite_values(df, id_cespite_col="Id. Cespite"):
+    if df.empty or id_cespite_col not in df.columns:
+        return df.copy()
+    df_fixed = df.copy()
+    rows_to_process = []
+    for idx, row in df.iterrows():
+        id_cell = row[id_cespite_col]
+        if pd.notna(id_cell) and '\n' in str(id_cell):
+            rows_to_process.append(idx)
+    if not rows_to_process:
+        return df
+    all_id_values = []
+    for idx in rows_to_process:
+        id_cell = df.iloc[idx][id_cespite_col]
+        all_id_values.extend(line.strip() for line in str(id_cell).split('\n') if line.strip().isdigit())
+    for i, row_idx in enumerate(rows_to_process):
+        df_fixed.loc[row_idx, id_cespite_col] = all_id_values[i] if i < len(all_id_values) else all_id_values[-1]
+    return df_fixed
+
+
+def _random_table_data(rng):
+    cells = [None, "", " ", "Via Roma", " 10 ", "Palermo\n", "24\n26", "7\n x\n8 ", "a\nb", "33", "Id. Cespite"]
+    weights = np.array([4, 3, 1, 2, 2, 1, 2, 1, 1, 1, 1], dtype=float)
+    rows = int(rng.integers(1, 10))
+    cols = int(rng.integers(1, 6))
+    data = [
+        [cells[k] for k in rng.choice(len(cells), size=cols, p=weights / weights.sum())]
+        for _ in range(rows)
+    ]
+    if rng.random() < 0.5:
+        # Header row naming the Id. Cespite column
+        data.insert(0, ["Id. Cespite"] + [f"H{j}" for j in range(1, cols)])
+    return data
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, type(e)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_table_to_dataframe_matches_row_wise_version(seed):
+    rng = np.random.default_rng(seed)
+    table_data = _random_table_data(rng)
+    strip_text = bool(rng.random() < 0.7)
+
+    expected, expected_error = _outcome(legacy_table_to_dataframe, table_data, 3, strip_text)
+    result, error = _outcome(_table_to_dataframe, table_data, 3, strip_text)
+
+    assert error == expected_error
+    if expected is None:
+        assert result is None
+    else:
+        # df.map() turns all-missing string columns into float64; both are
+        # written as empty cells / string nulls, so only values are compared
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_distribute_id_cespite_values_spreads_lines():
+    df = pd.DataFrame(
+        {"Id. Cespite": ["24\n26\n27", "x", "\n", "7"], "Comune": ["A", "B", "C", "D"]}
+    )
+
+    fixed = distribute_id_cespite_values(df)
+
+    # Multi-line rows 0 and 2 take the first two values; row 2 is not left blank
+    assert fixed["Id. Cespite"].tolist() == ["24", "x", "26", "7"]
+    assert distribute_id_cespite_values(fixed) is fixed
@@ -0,0 +1,67 @@
+"""Tests for prefilter module."""
+
+import fitz
+import pytest
+from alice_pdf.prefilter import apply_prefilter, prefilter_pages, score_page
+
+
+PROSE = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, "
+    "quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo. "
+) * 12
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """PDF with prose, blank, borderless table and ruled table pages."""
+    doc = fitz.open()
+
+    prose = doc.new_page()
+    prose.insert_textbox(fitz.Rect(72, 72, 520, 770), PROSE, fontsize=11)
+
+    doc.new_page()  # blank separator
+
+    borderless = doc.new_page()
+    for r in range(12):
+        for x in [72, 200, 330, 450]:
+            borderless.insert_text((x, 100 + r * 16), f"r{r} x{x}", fontsize=10)
+
+    ruled = doc.new_page()
+    for r in range(6):
+        ruled.draw_line((72, 100 + r * 20), (520, 100 + r * 20))
+    for x in [72, 220, 370, 520]:
+        ruled.draw_line((x, 100), (x, 200))
+    ruled.insert_text((80, 115), "Header", fontsize=10)
+
+    path = tmp_path / "mixed.pdf"
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_score_page_separates_tables_from_prose(mixed_pdf):
+    """Prose and blank pages score low; ruled and aligned tables score high."""
+    doc = fitz.open(mixed_pdf)
+    scores = [score_page(page)[0] for page in doc]
+    doc.close()
+
+    assert scores[0] < 0.3
+    assert scores[1] == 0.0
+    assert scores[2] >= 0.3
+    assert scores[3] >= 0.3
+
+
+def test_prefilter_pages_splits_in_order(mixed_pdf):
+    """Low-scoring pages are returned separately, preserving order."""
+    kept, low = prefilter_pages(mixed_pdf, [3, 2, 1, 0])
+    assert kept == [3, 2]
+    assert low == [1, 0]
+
+
+def test_apply_prefilter_skip_and_defer(mixed_pdf):
+    """Skip drops low pages; defer moves them to the end."""
+    pending = [(1, 0), (2, 1), (3, 2), (4, 3)]
+
+    assert apply_prefilter(mixed_pdf, pending, mode="skip") == [(3, 2), (4, 3)]
+    assert apply_prefilter(mixed_pdf, pending, mode="defer") == [(3, 2), (4, 3), (1, 0), (2, 1)]
@@ -0,0 +1,80 @@
+"""Tests for the PyMuPDF table-finder extractor."""
+
+import fitz
+import pandas as pd
+import pytest
+
+from alice_pdf.pymupdf_extractor import extract_tables_with_pymupdf
+
+
+def _table_pdf(path, pages, rows=4):
+    """PDF whose pages hold one ruled table: header row plus `rows` - 1 data rows."""
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        x = [72, 200, 328]
+        y = [72 + 20 * i for i in range(rows + 1)]
+        for xi in x:
+            page.draw_line((xi, y[0]), (xi, y[-1]))
+        for yi in y:
+            page.draw_line((x[0], yi), (x[-1], yi))
+        for i in range(rows):
+            left, right = ("Comune", "Importo") if i == 0 else (f"C{number}-{i}", str(number * 10 + i))
+            page.insert_text((x[0] + 4, y[i] + 14), left)
+            page.insert_text((x[1] + 4, y[i] + 14), right)
+    doc.save(path)
+    doc.close()
+
+
+def test_pymupdf_extracts_ruled_tables(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _table_pdf(pdf_path, 3)
+
+    count = extract_tables_with_pymupdf(pdf_path, tmp_path / "out", merge_output=True)
+
+    assert count == 3
+    page2 = pd.read_csv(tmp_path / "out" / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert page2.columns.tolist() == ["page", "Comune", "Importo"]
+    assert page2["Comune"].tolist() == ["C2-1", "C2-2", "C2-3"]
+    merged = pd.read_csv(tmp_path / "out" / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["page"].tolist() == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+
+def test_pymupdf_resume_skips_done_pages(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    out = tmp_path / "out"
+    _table_pdf(pdf_path, 3)
+    extract_tables_with_pymupdf(pdf_path, out, pages="1-2")
+
+    searched = []
+    find_tables = fitz.Page.find_tables
+
+    def spy(page, *args, **kwargs):
+        searched.append(page.number + 1)
+        return find_tables(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "find_tables", spy)
+    count = extract_tables_with_pymupdf(pdf_path, out, merge_output=True)
+
+    assert count == 3
+    assert searched == [3]
+    merged = pd.read_csv(out / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["page"].tolist() == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+
+def test_pymupdf_rejects_unknown_strategy(tmp_path):
+    with pytest.raises(ValueError):
+        extract_tables_with_pymupdf(tmp_path / "doc.pdf", tmp_path / "out", strategy="lattice")
+
+
+def test_pymupdf_closes_pdf_when_page_selection_fails(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _table_pdf(pdf_path, 1)
+    closed = []
+    close = fitz.Document.close
+    monkeypatch.setattr(fitz.Document, "close", lambda doc: (closed.append(True), close(doc)))
+
+    with pytest.raises(ValueError):
+        extract_tables_with_pymupdf(pdf_path, tmp_path / "out", pages="first")
+
+    assert closed
@@ -0,0 +1,84 @@
+"""Tests for rate_limit module."""
+
+import pytest
+from alice_pdf.rate_limit import AdaptiveConcurrency, TokenBucket
+
+
+class FakeClock:
+    """Deterministic clock whose sleep advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_spaces_requests():
+    """With capacity 1, requests are spaced 1/rate seconds apart."""
+    clock = FakeClock()
+    bucket = TokenBucket(2.0, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    bucket.acquire()
+    bucket.acquire()
+
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    """A full bucket serves `capacity` requests without waiting."""
+    clock = FakeClock()
+    bucket = TokenBucket(1.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_token_bucket_invalid_rate():
+    """Non-positive rates are rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_adaptive_concurrency_grows_while_healthy():
+    """One extra slot after each window of `limit` healthy completions, capped at max."""
+    controller = AdaptiveConcurrency(4, initial=1)
+
+    for _ in range(10):
+        controller.finish(controller.start(), latency=1.0)
+
+    assert controller.limit == 4
+    assert controller.peak == 4
+
+
+def test_adaptive_concurrency_halves_once_per_throttling_burst():
+    """Throttling errors from the same window back off only once."""
+    controller = AdaptiveConcurrency(8, initial=8)
+    epochs = [controller.start() for _ in range(8)]
+
+    for epoch in epochs:
+        controller.finish(epoch, throttled=True)
+
+    assert controller.limit == 4
+    assert controller.backoffs == 1
+
+    controller.finish(controller.start(), throttled=True)
+    assert controller.limit == 2
+
+
+def test_adaptive_concurrency_holds_on_slow_or_failed_requests():
+    """Latency above the tolerance or plain errors do not increase the limit."""
+    controller = AdaptiveConcurrency(4, initial=1)
+    controller.finish(controller.start(), latency=1.0)
+    assert controller.limit == 2
+
+    for _ in range(5):
+        controller.finish(controller.start(), latency=5.0)
+        controller.finish(controller.start(), error=True)
+
+    assert controller.limit == 2
@@ -0,0 +1,150 @@
+"""Tests for rendering module."""
+
+import io
+import threading
+from unittest.mock import MagicMock
+import pytest
+from functools import partial
+
+import fitz
+from alice_pdf.rendering import RenderAhead, RenderPool, convert_image_color, encode_image
+
+
+def test_render_ahead_yields_pages_in_order():
+    """Pages are yielded in request order from a single open document."""
+    doc = MagicMock()
+    open_document = MagicMock(return_value=doc)
+
+    with RenderAhead(open_document, [4, 1, 7], lambda d, n: f"img{n}") as renderer:
+        items = list(renderer)
+
+    assert items == [(4, "img4", None), (1, "img1", None), (7, "img7", None)]
+    open_document.assert_called_once()
+    doc.close.assert_called_once()
+
+
+def test_render_ahead_reports_render_errors_per_page():
+    """A failing page is reported and the following pages still render."""
+    def render(doc, page_num):
+        if page_num == 1:
+            raise RuntimeError("broken page")
+        return page_num
+
+    with RenderAhead(MagicMock, [0, 1, 2], render) as renderer:
+        items = list(renderer)
+
+    assert [item[0] for item in items] == [0, 1, 2]
+    assert items[1][1] is None
+    assert isinstance(items[1][2], RuntimeError)
+    assert items[2] == (2, 2, None)
+
+
+def test_render_ahead_applies_backpressure():
+    """The producer never renders more than `prefetch` pages ahead of the consumer."""
+    rendered = []
+    lock = threading.Lock()
+
+    def render(doc, page_num):
+        with lock:
+            rendered.append(page_num)
+        return page_num
+
+    with RenderAhead(MagicMock, range(20), render, prefetch=2) as renderer:
+        for page_num, _, _ in renderer:
+            with lock:
+                # consumed page + queued pages + one blocked in put()
+                assert len(rendered) <= page_num + 1 + 2 + 1
+
+
+def test_render_ahead_close_stops_producer_early():
+    """Closing before the document is exhausted releases the handle."""
+    doc = MagicMock()
+    renderer = RenderAhead(lambda: doc, range(1000), lambda d, n: n, prefetch=1)
+    first = next(iter(renderer))
+    renderer.close()
+
+    assert first == (0, 0, None)
+    doc.close.assert_called_once()
+
+
+def test_render_ahead_invalid_prefetch():
+    """Prefetch must be at least one page."""
+    with pytest.raises(ValueError):
+        RenderAhead(MagicMock, [0], lambda d, n: n, prefetch=0)
+
+
+def _noisy_image(size=(1200, 1600)):
+    """Image with enough entropy that compression settings matter."""
+    import os
+    from PIL import Image
+
+    return Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+
+
+def _page_text(doc, page_num):
+    if page_num == 2:
+        raise RuntimeError("broken page")
+    return doc[page_num].get_text().strip()
+
+
+def test_render_pool_renders_in_worker_processes(tmp_path):
+    """Worker processes open the document themselves; order and per-page errors are kept."""
+    pdf_path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    for text in ["zero", "one", "two", "three"]:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(pdf_path)
+    doc.close()
+
+    with RenderPool(partial(fitz.open, str(pdf_path)), [3, 0, 2, 1], _page_text, workers=2) as renderer:
+        items = list(renderer)
+
+    assert [(n, payload) for n, payload, _ in items] == [(3, "three"), (0, "zero"), (2, None), (1, "one")]
+    assert isinstance(items[2][2], RuntimeError)
+
+
+def test_render_pool_reports_unopenable_document(tmp_path):
+    """If workers cannot open the document, every page carries the error."""
+    missing = partial(fitz.open, str(tmp_path / "missing.pdf"))
+
+    with RenderPool(missing, [0, 1], _page_text, workers=1) as renderer:
+        items = list(renderer)
+
+    assert [n for n, _, _ in items] == [0, 1]
+    assert all(payload is None and error is not None for _, payload, error in items)
+
+
+def test_encode_image_formats_and_mime_types():
+    """Each format reports the matching MIME type."""
+    from PIL import Image
+
+    img = Image.new("RGB", (50, 40), "white")
+    for image_format, mime in [("png", "image/png"), ("jpeg", "image/jpeg"), ("webp", "image/webp")]:
+        data, mime_type, size = encode_image(img, image_format=image_format)
+        assert mime_type == mime
+        assert size == (50, 40)
+        assert Image.open(io.BytesIO(data)).size == (50, 40)
+
+
+def test_encode_image_respects_byte_budget():
+    """Images over budget are recompressed/downscaled until they fit."""
+    img = _noisy_image()
+    unconstrained, _, _ = encode_image(img, image_format="jpeg", quality=90)
+    budget = len(unconstrained) // 4
+
+    data, _, size = encode_image(img, image_format="jpeg", quality=90, max_bytes=budget)
+
+    assert len(data) <= budget
+    assert size[0] <= img.size[0]
+
+
+def test_convert_image_color_modes():
+    """Colour conversion produces the expected PIL modes."""
+    from PIL import Image
+
+    img = Image.new("RGB", (10, 10), "white")
+    assert convert_image_color(img, "rgb").mode == "RGB"
+    assert convert_image_color(img, "gray").mode == "L"
+    assert convert_image_color(img, "bilevel").mode == "1"
+    with pytest.raises(ValueError):
+        convert_image_color(img, "cmyk")
@@ -0,0 +1,468 @@
+"""Tests for the Textract extractor."""
+
+from unittest.mock import Mock
+
+import fitz
+import pandas as pd
+import pytest
+
+from alice_pdf import textract_extractor
+from alice_pdf.textract_extractor import extract_tables_with_textract_api, parse_textract_tables
+
+
+def _word(block_id, text):
+    return {"BlockType": "WORD", "Id": block_id, "Text": text}
+
+
+def _cell(block_id, row, col, word_ids, confidence=95.0):
+    return {
+        "BlockType": "CELL",
+        "Id": block_id,
+        "RowIndex": row,
+        "ColumnIndex": col,
+        "Confidence": confidence,
+        "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+    }
+
+
+def _table(block_id, cell_ids):
+    return {"BlockType": "TABLE", "Id": block_id, "Relationships": [{"Type": "CHILD", "Ids": cell_ids}]}
+
+
+def two_table_blocks():
+    return [
+        {"BlockType": "PAGE", "Id": "page"},
+        _table("t1", ["c1", "c2", "c3", "c4"]),
+        _cell("c1", 1, 1, ["w1"]),
+        _cell("c2", 1, 2, ["w2"]),
+        _cell("c3", 2, 1, ["w3", "w4"]),
+        _cell("c4", 2, 2, ["w5"], confidence=10.0),
+        _table("t2", ["c5", "c6"]),
+        _cell("c5", 1, 1, ["w6"]),
+        _cell("c6", 2, 1, ["w7"]),
+        _word("w1", "Comune"),
+        _word("w2", "Importo"),
+        _word("w3", "Palermo"),
+        _word("w4", "centro"),
+        _word("w5", "10"),
+        _word("w6", "Anno"),
+        _word("w7", "2024"),
+    ]
+
+
+def test_parse_textract_tables_keeps_cells_per_table():
+    tables = parse_textract_tables(two_table_blocks())
+
+    assert tables == [
+        # Low-confidence cell is left empty
+        {"headers": ["Comune", "Importo"], "rows": [["Palermo centro", ""]]},
+        {"headers": ["Anno"], "rows": [["2024"]]},
+    ]
+
+
+def test_parse_textract_tables_confidence_threshold():
+    tables = parse_textract_tables(two_table_blocks(), min_confidence=5)
+    assert tables[0]["rows"] == [["Palermo centro", "10"]]
+
+
+def test_extract_tables_with_textract_api_parses_response():
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+
+    result = extract_tables_with_textract_api(client, b"png", 0)
+
+    assert [t["headers"] for t in result["tables"]] == [["Comune", "Importo"], ["Anno"]]
+    client.analyze_document.assert_called_once_with(Document={"Bytes": b"png"}, FeatureTypes=["TABLES"])
+
+
+class FakeS3:
+    """In-process S3 holding staged objects in a dict."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = Body
+
+    def delete_object(self, Bucket, Key):
+        del self.objects[(Bucket, Key)]
+
+
+class FakeTextract:
+    """
+    In-process async Textract: each page of the staged PDF becomes one
+    single-cell table holding the page text. Jobs report IN_PROGRESS on the
+    first poll and results are split into pages of `page_size` blocks.
+    Pages of the staged PDF listed in `failed_pages` get no blocks and their
+    job reports PARTIAL_SUCCESS.
+    """
+
+    def __init__(self, s3, page_size=3, failed_pages=()):
+        self.s3 = s3
+        self.page_size = page_size
+        self.failed_pages = failed_pages
+        self.jobs = {}
+
+    def start_document_analysis(self, DocumentLocation, FeatureTypes):
+        location = DocumentLocation["S3Object"]
+        doc = fitz.open(stream=self.s3.objects[(location["Bucket"], location["Name"])], filetype="pdf")
+        blocks = []
+        partial = False
+        for number, page in enumerate(doc, start=1):
+            if number in self.failed_pages:
+                partial = True
+                continue
+            text = page.get_text().split()[0]
+            prefix = f"p{number}"
+            blocks += [
+                {"BlockType": "PAGE", "Id": prefix, "Page": number},
+                dict(_table(f"{prefix}t", [f"{prefix}h", f"{prefix}c"]), Page=number),
+                dict(_cell(f"{prefix}h", 1, 1, [f"{prefix}wh"]), Page=number),
+                dict(_cell(f"{prefix}c", 2, 1, [f"{prefix}w"]), Page=number),
+                dict(_word(f"{prefix}wh", "Testo"), Page=number),
+                dict(_word(f"{prefix}w", text), Page=number),
+            ]
+        doc.close()
+        job_id = f"job{len(self.jobs)}"
+        status = "PARTIAL_SUCCESS" if partial else "SUCCEEDED"
+        self.jobs[job_id] = {"blocks": blocks, "polls": 0, "status": status}
+        return {"JobId": job_id}
+
+    def get_document_analysis(self, JobId, MaxResults, NextToken=None):
+        job = self.jobs[JobId]
+        job["polls"] += 1
+        if job["polls"] == 1:
+            return {"JobStatus": "IN_PROGRESS"}
+        start = int(NextToken or 0)
+        end = start + self.page_size
+        response = {"JobStatus": job["status"], "Blocks": job["blocks"][start:end]}
+        if end < len(job["blocks"]):
+            response["NextToken"] = str(end)
+        return response
+
+
+def _text_pdf(path, texts):
+    doc = fitz.open()
+    for text in texts:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_async_mode_maps_blocks_back_to_pages(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due", "tre", "quattro", "cinque"])
+    s3 = FakeS3()
+    textract = FakeTextract(s3)
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: textract)
+    monkeypatch.setattr(textract_extractor, "_get_s3_client", lambda *args: s3)
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path,
+        tmp_path / "out",
+        pages="2-5",
+        merge_output=True,
+        use_async=True,
+        s3_bucket="bucket",
+        async_chunk_pages=3,
+        poll_interval=0,
+    )
+
+    assert count == 4
+    assert len(textract.jobs) == 2
+    assert s3.objects == {}  # Staged chunks are removed
+    for page, text in [(2, "due"), (3, "tre"), (4, "quattro"), (5, "cinque")]:
+        df = pd.read_csv(tmp_path / "out" / f"doc_page{page}_table0.csv", encoding="utf-8-sig")
+        assert df.to_dict("records") == [{"page": page, "Testo": text}]
+    merged = pd.read_csv(tmp_path / "out" / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["Testo"].tolist() == ["due", "tre", "quattro", "cinque"]
+
+
+def test_async_mode_retries_pages_missing_from_partial_results(tmp_path, monkeypatch):
+    from alice_pdf.manifest import ResumeManifest
+
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due", "tre"])
+    s3 = FakeS3()
+    monkeypatch.setattr(textract_extractor, "_get_s3_client", lambda *args: s3)
+    options = dict(use_async=True, s3_bucket="bucket", poll_interval=0)
+
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: FakeTextract(s3, failed_pages=(2,)))
+    count = textract_extractor.extract_tables_with_textract(pdf_path, tmp_path / "out", **options)
+
+    assert count == 2
+    with ResumeManifest(tmp_path / "out", "doc") as manifest:
+        assert manifest.done_pages() == {1, 3}
+
+    textract = FakeTextract(s3)
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: textract)
+    count = textract_extractor.extract_tables_with_textract(pdf_path, tmp_path / "out", **options)
+
+    assert count == 3
+    assert len(textract.jobs) == 1
+    df = pd.read_csv(tmp_path / "out" / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert df["Testo"].tolist() == ["due"]
+
+
+def test_async_mode_closes_pdf_when_a_job_fails(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    s3 = FakeS3()
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: FakeTextract(s3))
+    monkeypatch.setattr(textract_extractor, "_get_s3_client", lambda *args: s3)
+
+    def run_document_analysis(*args, **kwargs):
+        raise RuntimeError("S3 upload failed")
+        yield
+
+    monkeypatch.setattr(textract_extractor, "run_document_analysis", run_document_analysis)
+    opened = []
+    fitz_open = fitz.open
+    monkeypatch.setattr(fitz, "open", lambda *args, **kwargs: opened.append(fitz_open(*args, **kwargs)) or opened[-1])
+
+    with pytest.raises(RuntimeError, match="S3 upload failed"):
+        textract_extractor.extract_tables_with_textract(
+            pdf_path, tmp_path / "out", use_async=True, s3_bucket="bucket", poll_interval=0
+        )
+
+    assert opened
+    assert all(doc.is_closed for doc in opened)
+
+
+def test_async_mode_requires_bucket(tmp_path):
+    with pytest.raises(ValueError, match="S3 bucket"):
+        textract_extractor.extract_tables_with_textract(tmp_path / "doc.pdf", tmp_path, use_async=True)
+
+
+def test_sync_mode_retries_throttled_pages(tmp_path, monkeypatch):
+    from botocore.exceptions import ClientError
+
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due", "tre", "quattro"])
+    calls = []
+
+    def analyze_document(**kwargs):
+        calls.append(kwargs)
+        if len(calls) <= 2:
+            raise ClientError(
+                {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}},
+                "AnalyzeDocument",
+            )
+        return {"Blocks": two_table_blocks()}
+
+    client = Mock()
+    client.analyze_document.side_effect = analyze_document
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "out", dpi=36, max_workers=4
+    )
+
+    assert count == 8
+    assert len(calls) == 6
+    assert sorted(p.name for p in (tmp_path / "out").glob("*_table0.csv")) == [
+        f"doc_page{page}_table0.csv" for page in range(1, 5)
+    ]
+
+
+def test_sync_mode_does_not_retry_local_errors(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+    write_table = textract_extractor.write_table
+
+    def failing_write_table(df, path, output_format):
+        if "_page1_" in str(path):
+            raise OSError("disk full")
+        return write_table(df, path, output_format)
+
+    monkeypatch.setattr(textract_extractor, "write_table", failing_write_table)
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "out", dpi=36, max_workers=4
+    )
+
+    assert count == 2
+    assert client.analyze_document.call_count == 2
+    assert [p.name for p in (tmp_path / "out").glob("*_table0.csv")] == ["doc_page2_table0.csv"]
+
+
+def test_pdf_input_sends_single_page_pdf(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due", "tre"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "out", pages="2", textract_input="pdf"
+    )
+
+    assert count == 2
+    sent = client.analyze_document.call_args[1]["Document"]["Bytes"]
+    page_doc = fitz.open(stream=sent, filetype="pdf")
+    assert page_doc.page_count == 1
+    assert page_doc[0].get_text().strip() == "due"
+
+
+def test_prepare_page_copies_each_page_once(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    copies = []
+    page_chunk_pdf = textract_extractor.page_chunk_pdf
+
+    def spy(doc, pages):
+        copies.append(pages)
+        return page_chunk_pdf(doc, pages)
+
+    monkeypatch.setattr(textract_extractor, "page_chunk_pdf", spy)
+    with fitz.open(pdf_path) as doc:
+        (payload, kind), page_hash = textract_extractor._prepare_page(doc, 1, textract_input="pdf")
+        assert copies == [[1]]
+        assert page_hash == textract_extractor._page_hash(doc, 1)
+
+    assert kind == "pdf"
+    assert fitz.open(stream=payload, filetype="pdf")[0].get_text().strip() == "due"
+
+
+def test_pdf_input_falls_back_to_png(tmp_path, monkeypatch):
+    from botocore.exceptions import ClientError
+
+    pdf_path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    doc.new_page(width=3000, height=200)  # Beyond the sync API page size
+    doc.new_page()
+    doc.save(pdf_path)
+    doc.close()
+    sent = []
+
+    def analyze_document(Document, FeatureTypes):
+        sent.append(Document["Bytes"][:4])
+        if Document["Bytes"].startswith(b"%PDF"):
+            raise ClientError({"Error": {"Code": "UnsupportedDocumentException"}}, "AnalyzeDocument")
+        return {"Blocks": two_table_blocks()}
+
+    client = Mock()
+    client.analyze_document.side_effect = analyze_document
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "out", dpi=36, textract_input="pdf", max_workers=1
+    )
+
+    assert count == 4
+    # Oversized page rendered up front; page 2 rejected as PDF, then sent as PNG
+    assert sent == [b"\x89PNG", b"%PDF", b"\x89PNG"]
+
+
+def test_reparse_from_raw_without_api_calls(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+    out = tmp_path / "out"
+
+    textract_extractor.extract_tables_with_textract(pdf_path, out, dpi=36)
+    assert len(list((out / "doc_textract_raw").glob("*.json.gz"))) == 2
+    first = pd.read_csv(out / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert first["Importo"].isna().all()
+
+    client.analyze_document.reset_mock()
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, out, dpi=36, merge_output=True, min_confidence=5, reparse_from_raw=True
+    )
+
+    assert count == 4
+    client.analyze_document.assert_not_called()
+    reparsed = pd.read_csv(out / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert reparsed["Importo"].tolist() == [10]
+    assert len(pd.read_csv(out / "doc_merged.csv", encoding="utf-8-sig")) == 4
+
+
+def test_reparse_from_raw_after_cached_run(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+    cache_dir = tmp_path / "cache"
+
+    for out in (tmp_path / "first", tmp_path / "second"):
+        textract_extractor.extract_tables_with_textract(
+            pdf_path, out, dpi=36, textract_input="pdf", cache_dir=cache_dir
+        )
+    assert client.analyze_document.call_count == 2
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "second", dpi=36, textract_input="pdf", min_confidence=5, reparse_from_raw=True
+    )
+
+    assert count == 4
+    assert client.analyze_document.call_count == 2
+    reparsed = pd.read_csv(tmp_path / "second" / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert reparsed["Importo"].tolist() == [10]
+
+
+def test_reparse_from_raw_deletes_tables_no_longer_found(tmp_path, monkeypatch):
+    from alice_pdf.manifest import ResumeManifest
+
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+    out = tmp_path / "out"
+    textract_extractor.extract_tables_with_textract(pdf_path, out, dpi=36)
+    assert (out / "doc_page1_table1.csv").exists()
+
+    parse = textract_extractor.parse_textract_tables
+    monkeypatch.setattr(
+        textract_extractor, "parse_textract_tables", lambda blocks, **kwargs: parse(blocks, **kwargs)[:1]
+    )
+    count = textract_extractor.extract_tables_with_textract(pdf_path, out, dpi=36, reparse_from_raw=True)
+
+    assert count == 1
+    assert sorted(p.name for p in out.glob("doc_page*")) == ["doc_page1_table0.csv"]
+    with ResumeManifest(out, "doc") as manifest:
+        assert manifest.page_files(1) == [out / "doc_page1_table0.csv"]
+
+
+def test_reparse_from_raw_keeps_pages_without_raw_blocks(tmp_path, monkeypatch):
+    import shutil
+
+    from alice_pdf.manifest import ResumeManifest
+
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno", "due"])
+    client = Mock()
+    client.analyze_document.return_value = {"Blocks": two_table_blocks()}
+    monkeypatch.setattr(textract_extractor, "_get_textract_client", lambda *args: client)
+    out = tmp_path / "out"
+
+    textract_extractor.extract_tables_with_textract(pdf_path, out, dpi=36, pages="1")
+    shutil.rmtree(out / "doc_textract_raw")  # e.g. written before raw blocks were stored
+    textract_extractor.extract_tables_with_textract(pdf_path, out, dpi=36, pages="2")
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, out, dpi=36, merge_output=True, min_confidence=5, reparse_from_raw=True
+    )
+
+    assert count == 4
+    with ResumeManifest(out, "doc") as manifest:
+        assert manifest.done_pages() == {1, 2}
+    assert pd.read_csv(out / "doc_merged.csv", encoding="utf-8-sig")["page"].tolist() == [1, 1, 2, 2]
+
+
+def test_reparse_from_raw_reports_missing_pages(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _text_pdf(pdf_path, ["uno"])
+
+    count = textract_extractor.extract_tables_with_textract(
+        pdf_path, tmp_path / "out", reparse_from_raw=True
+    )
+
+    assert count == 0
+    assert not list((tmp_path / "out").glob("*_table*.csv"))
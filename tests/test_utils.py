@@ -0,0 +1,17 @@
+"""Tests for helpers shared by the local engines."""
+
+import numpy as np
+
+from alice_pdf.utils import non_empty_mask, selected_pages
+
+
+def test_selected_pages():
+    assert selected_pages("all", 3) == [1, 2, 3]
+    assert selected_pages("1-3, 5", 9) == [1, 2, 3, 5]
+
+
+def test_non_empty_mask_nan_handling():
+    values = np.array([["a", " ", None, np.nan, "  b "]], dtype=object)
+
+    assert non_empty_mask(values).tolist() == [[True, False, False, False, True]]
+    assert non_empty_mask(values, nan_is_empty=False).tolist() == [[True, False, False, True, True]]
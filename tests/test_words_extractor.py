@@ -0,0 +1,149 @@
+"""Tests for the word-coordinate clustering extractor."""
+
+import fitz
+import pandas as pd
+import pytest
+
+from alice_pdf.words_extractor import _page_tables, extract_tables_with_words
+
+
+def _borderless_pdf(path, pages, rows=4):
+    """PDF whose pages hold a title and one borderless table (no ruling lines)."""
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"Elenco alloggi pagina {number}")
+        for i in range(rows):
+            y = 100 + 14 * i
+            page.insert_text((72, y), "COMUNE")
+            page.insert_text((160, y), f"VIA ROMA, {number * 10 + i} VENEZIA")
+            # Right-aligned amounts of different widths
+            amount = f"{number * 1000 + i * 7},50"
+            page.insert_text((400 - fitz.get_text_length(amount, fontsize=11), y), amount)
+    doc.save(path)
+    doc.close()
+
+
+def test_words_extracts_borderless_tables(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _borderless_pdf(pdf_path, 3)
+
+    count = extract_tables_with_words(pdf_path, tmp_path / "out", merge_output=True)
+
+    assert count == 3
+    page2 = pd.read_csv(tmp_path / "out" / "doc_page2_table0.csv", encoding="utf-8-sig")
+    assert page2.columns.tolist() == ["page", "col_0", "col_1", "col_2"]
+    assert page2["col_1"].tolist() == [f"VIA ROMA, {20 + i} VENEZIA" for i in range(4)]
+    assert page2["col_2"].tolist() == ["2000,50", "2007,50", "2014,50", "2021,50"]
+    merged = pd.read_csv(tmp_path / "out" / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["page"].tolist() == [1] * 4 + [2] * 4 + [3] * 4
+
+
+def _lines_pdf(path, lines, columns=(72, 160, 360, 440)):
+    """PDF with one page holding (y, cells) lines; cells start at the `columns` offsets."""
+    doc = fitz.open()
+    page = doc.new_page()
+    for y, cells in lines:
+        for x, text in zip(columns, cells):
+            if text:
+                page.insert_text((x, y), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_words_merges_wrapped_lines(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _lines_pdf(pdf_path, [
+        (100, ("PROPRIETA", "INDIRIZZO", "SUPERFICIE", "CANONE")),
+        (121, ("", "VIA CASE NUOVE, 41 MARGHERA -", "", "")),
+        (132, ("COMUNE", "VENEZIA", "43", "871,32")),
+        (153, ("COMUNE", "SAN MARCO, 584", "28", "896,64")),
+    ])
+
+    with fitz.open(pdf_path) as doc:
+        (df,) = _page_tables(doc[0], 1)
+
+    assert df["col_1"].tolist() == ["INDIRIZZO", "VIA CASE NUOVE, 41 MARGHERA - VENEZIA", "SAN MARCO, 584"]
+    assert df["col_3"].tolist() == ["CANONE", "871,32", "896,64"]
+
+
+def test_words_joins_continuation_lines_to_the_row_above(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _lines_pdf(pdf_path, [
+        (100, ("COMUNE", "VIA ROMA, 1", "43", "871,32")),
+        (114, ("COMUNE", "VIA CASE NUOVE, 41", "28", "896,64")),
+        (128, ("", "MARGHERA", "", "")),
+        (142, ("COMUNE", "SAN MARCO, 584", "30", "512,00")),
+    ])
+
+    with fitz.open(pdf_path) as doc:
+        (df,) = _page_tables(doc[0], 1)
+
+    assert df["col_1"].tolist() == ["VIA ROMA, 1", "VIA CASE NUOVE, 41 MARGHERA", "SAN MARCO, 584"]
+
+
+def test_words_keeps_records_of_multi_line_cells_in_one_table(tmp_path):
+    # Like sample/_05112025153637.pdf: wrapped cells are centred on their row,
+    # so each record spans three close lines and records are far apart
+    pdf_path = tmp_path / "doc.pdf"
+    lines = [(60, ("TIPO", "IMPORTO", "DATA", "IMMOBILE", "UFFICIO"))]
+    for i in range(1, 7):
+        y = 60 + 50 * i
+        lines += [
+            (y - 8, ("", "", "", "Magazzino Via", "Area Patrimonio -")),
+            (y, ("percepito", f"{i}.000,00", f"0{i}/01/2024", "", "")),
+            (y + 8, ("", "", "", f"Mongitore n. {i}", "Demanio")),
+        ]
+    _lines_pdf(pdf_path, lines, columns=(40, 110, 190, 280, 420))
+
+    with fitz.open(pdf_path) as doc:
+        (df,) = _page_tables(doc[0], 1)
+
+    assert len(df) == 7
+    assert df["col_1"].tolist() == ["IMPORTO"] + [f"{i}.000,00" for i in range(1, 7)]
+    assert df["col_3"].tolist() == ["IMMOBILE"] + [f"Magazzino Via Mongitore n. {i}" for i in range(1, 7)]
+    assert df["col_4"].tolist() == ["UFFICIO"] + ["Area Patrimonio - Demanio"] * 6
+
+
+def test_words_skips_prose_and_resumes(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    out = tmp_path / "out"
+    _borderless_pdf(pdf_path, 3)
+    with fitz.open(pdf_path) as doc:
+        doc.new_page().insert_text((72, 72), "Una pagina di solo testo, senza tabelle.")
+        doc.saveIncr()
+    extract_tables_with_words(pdf_path, out, pages="1-2")
+
+    read = []
+    get_text = fitz.Page.get_text
+
+    def spy(page, *args, **kwargs):
+        read.append(page.number + 1)
+        return get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", spy)
+    count = extract_tables_with_words(pdf_path, out, merge_output=True)
+
+    assert count == 3
+    assert read == [3, 4]
+    merged = pd.read_csv(out / "doc_merged.csv", encoding="utf-8-sig")
+    assert merged["page"].tolist() == [1] * 4 + [2] * 4 + [3] * 4
+
+
+@pytest.mark.parametrize("option", [{"col_gap": 0}, {"min_rows": 0}, {"min_cols": 0}])
+def test_words_rejects_invalid_options(tmp_path, option):
+    with pytest.raises(ValueError):
+        extract_tables_with_words(tmp_path / "doc.pdf", tmp_path / "out", **option)
+
+
+def test_words_closes_pdf_when_page_selection_fails(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "doc.pdf"
+    _borderless_pdf(pdf_path, 1)
+    closed = []
+    close = fitz.Document.close
+    monkeypatch.setattr(fitz.Document, "close", lambda doc: (closed.append(True), close(doc)))
+
+    with pytest.raises(ValueError):
+        extract_tables_with_words(pdf_path, tmp_path / "out", pages="first")
+
+    assert closed